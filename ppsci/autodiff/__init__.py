@@ -12,6 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ppsci.autodiff.ad import cache_info
 from ppsci.autodiff.ad import clear
+from ppsci.autodiff.ad import concat_batch
+from ppsci.autodiff.ad import directional_derivative
+from ppsci.autodiff.ad import fuse_inputs
 from ppsci.autodiff.ad import hessian
 from ppsci.autodiff.ad import jacobian
+from ppsci.autodiff.ad import laplacian
+from ppsci.autodiff.ad import set_cache_budget
+from ppsci.autodiff.ad import split_batch
+from ppsci.autodiff.planner import DerivativePlanner
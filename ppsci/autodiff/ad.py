@@ -16,9 +16,139 @@
 This module is adapted from [https://github.com/lululxvi/deepxde](https://github.com/lululxvi/deepxde)
 """
 
+import collections
+import functools
+import weakref
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
 
 import paddle
+from paddle import jit
+from typing_extensions import Literal
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo",
+    [
+        "hits",
+        "misses",
+        "backward_calls",
+        "bytes",
+        "peak_bytes",
+        "max_bytes",
+        "evictions",
+    ],
+)
+
+_DTYPE_BYTES = {
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+    "float64": 8,
+}
+
+
+def _nbytes(tensor: "paddle.Tensor") -> int:
+    """Number of bytes of given tensor, 0 if shape is unknown(e.g. in static mode)."""
+    numel = 1
+    for dim in tensor.shape:
+        if dim < 0:
+            return 0
+        numel *= dim
+    return numel * _DTYPE_BYTES.get(str(tensor.dtype).split(".")[-1], 4)
+
+
+class _CacheStats:
+    """Statistics shared by all derivative caches."""
+
+    def __init__(self):
+        # max number of bytes held by cached jacobians, None means unlimited
+        self.max_bytes = None
+        self.bytes = 0
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.backward_calls = 0
+        self.evictions = 0
+        self.peak_bytes = self.bytes
+
+    def add_bytes(self, nbytes: int):
+        self.bytes += nbytes
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.backward_calls,
+            self.bytes,
+            self.peak_bytes,
+            self.max_bytes,
+            self.evictions,
+        )
+
+
+_stats = _CacheStats()
+
+
+def _grad(*args, **kwargs):
+    """Wrapper of `paddle.grad` which counts number of backward calls."""
+    _stats.backward_calls += 1
+    return paddle.grad(*args, **kwargs)
+
+
+class _TensorCache(collections.OrderedDict):
+    """LRU cache keyed by identities of tensors rather than tensors themselves.
+
+    Tensors in key are only weakly referenced, and the entry is evicted as soon as any
+    of them is garbage collected, so the cache never keeps a computation graph alive
+    and a recycled `id` will never hit a stale entry.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._refs = {}
+
+    @staticmethod
+    def make_key(tensors: Sequence["paddle.Tensor"], *extra: Hashable) -> Tuple:
+        return tuple(id(t) for t in tensors) + extra
+
+    def get(self, key: Tuple) -> Any:
+        value = super().get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple, tensors: Sequence["paddle.Tensor"], value: Any):
+        """Put value into cache with weak references to key tensors."""
+        callback = functools.partial(self._on_collected, key)
+        self._refs[key] = [weakref.ref(t, callback) for t in tensors]
+        self[key] = value
+
+    def evict(self, key: Tuple) -> Any:
+        """Remove entry by key and return its value."""
+        self._refs.pop(key, None)
+        return self.pop(key, None)
+
+    def _on_collected(self, key: Tuple, ref: weakref.ref):
+        # check whether the entry is still the one which ref belongs to
+        if any(ref is _ref for _ref in self._refs.get(key, ())):
+            self._evicted(self.evict(key))
+
+    def _evicted(self, value: Any):
+        """Hook called after an entry is evicted due to garbage collected."""
+
+    def clear(self):
+        super().clear()
+        self._refs = {}
 
 
 class _Jacobian:
@@ -34,29 +164,68 @@ class _Jacobian:
     """
 
     def __init__(self, ys: "paddle.Tensor", xs: "paddle.Tensor"):
-        self.ys = ys
-        self.xs = xs
+        # keep weak references only, so as not to keep computation graph alive
+        self._ys = weakref.ref(ys)
+        self._xs = weakref.ref(xs)
 
         self.dim_y = ys.shape[1]
         self.dim_x = xs.shape[1]
 
         self.J = {}
 
+    @property
+    def ys(self) -> "paddle.Tensor":
+        return self._ys()
+
+    @property
+    def xs(self) -> "paddle.Tensor":
+        return self._xs()
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by cached J."""
+        return sum(_nbytes(grad) for grad in self.J.values())
+
     def __call__(self, i: int = 0, j: Optional[int] = None) -> "paddle.Tensor":
         """Returns J[`i`][`j`]. If `j` is ``None``, returns the gradient of y_i, i.e.,
         J[i].
         """
-        if not 0 <= i < self.dim_y:
-            raise ValueError(f"i({i}) should in range [0, {self.dim_y}).")
-        if j is not None and not 0 <= j < self.dim_x:
-            raise ValueError(f"j({j}) should in range [0, {self.dim_x}).")
+        self._check_index(i, j)
         # Compute J[i]
         if i not in self.J:
             y = self.ys[:, i : i + 1] if self.dim_y > 1 else self.ys
-            self.J[i] = paddle.grad(y, self.xs, create_graph=True)[0]
+            self.J[i] = _grad(y, self.xs, create_graph=True)[0]
+            _stats.add_bytes(_nbytes(self.J[i]))
 
         return self.J[i] if (j is None or self.dim_x == 1) else self.J[i][:, j : j + 1]
 
+    def _check_index(self, i: int, j: Optional[int] = None):
+        """Check whether index `i` and `j` are valid."""
+        if not 0 <= i < self.dim_y:
+            raise ValueError(f"i({i}) should in range [0, {self.dim_y}).")
+        if j is not None and not 0 <= j < self.dim_x:
+            raise ValueError(f"j({j}) should in range [0, {self.dim_x}).")
+
+
+class _JacobianCache(_TensorCache):
+    """Cache of _Jacobian with bytes accounting."""
+
+    def _evicted(self, jac: Optional[_Jacobian]):
+        if jac is not None:
+            _stats.bytes -= jac.nbytes
+            _stats.evictions += 1
+
+    def shrink(self):
+        """Evict least recently used entries until bytes held is within budget, the
+        most recently used entry is always kept.
+        """
+        while (
+            _stats.max_bytes is not None
+            and _stats.bytes > _stats.max_bytes
+            and len(self) > 1
+        ):
+            self._evicted(self.evict(next(iter(self))))
+
 
 class Jacobians:
     r"""Compute multiple Jacobians.
@@ -68,28 +237,47 @@ class Jacobians:
     A new instance will be created for a new pair of (output, input). For the (output,
     input) pair that has been computed before, it will reuse the previous instance,
     rather than creating a new one.
+
+    Instances are cached by identities of (output, input) and evicted once output or
+    input is garbage collected, or in least recently used order when bytes held by
+    cache exceeds budget set by `set_cache_budget`.
+
+    If output and input are chunks of the same rows of batched tensors, created by
+    `concat_batch` and `split_batch`, jacobian is sliced from the jacobian of batched
+    tensors, so that one backward pass is shared by all chunks.
     """
 
     def __init__(self):
-        self.Js = {}
-
+        self.Js = _JacobianCache()
+        # id of input tensor -> group of input tensors, e.g. inputs of one model
+        # forward, whose gradients are computed together in one backward pass
+        self.fused_groups: Dict[int, Tuple["paddle.Tensor", ...]] = {}
+        # chunk tensor -> (batched tensor, start row, end row)
+        self.chunks = _TensorCache()
+        # jacobians sliced from jacobian of batched tensors
+        self.sliced = _TensorCache()
+
+    @jit.not_to_static
     def __call__(
         self,
         ys: "paddle.Tensor",
-        xs: "paddle.Tensor",
+        xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
         i: int = 0,
         j: Optional[int] = None,
-    ) -> "paddle.Tensor":
+    ) -> Union["paddle.Tensor", List["paddle.Tensor"]]:
         """Compute jacobians for given ys and xs.
 
         Args:
             ys (paddle.Tensor): Output tensor.
-            xs (paddle.Tensor): Input tensor.
+            xs (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Input tensor, or a
+                sequence of input tensors whose jacobians will be computed within one
+                backward pass.
             i (int, optional): i-th output variable. Defaults to 0.
             j (Optional[int]): j-th input variable. Defaults to None.
 
         Returns:
-            paddle.Tensor: Jacobian matrix of ys[i] to xs[j].
+            Union[paddle.Tensor, List[paddle.Tensor]]: Jacobian matrix of ys[i] to
+                xs[j], or a list of them if xs is a sequence of tensors.
 
         Examples:
             >>> import paddle
@@ -98,15 +286,121 @@ class Jacobians:
             >>> x.stop_gradient = False
             >>> y = x * x
             >>> dy_dx = ppsci.autodiff.jacobian(y, x)
+            >>> t = paddle.randn([4, 1])
+            >>> t.stop_gradient = False
+            >>> y = x * t
+            >>> dy_dx, dy_dt = ppsci.autodiff.jacobian(y, (x, t))
         """
-        key = (ys, xs)
-        if key not in self.Js:
-            self.Js[key] = _Jacobian(ys, xs)
-        return self.Js[key](i, j)
+        result = self._sliced_jacobian(ys, xs, i, j)
+        if result is not None:
+            return result
+
+        if isinstance(xs, (list, tuple)):
+            for _xs in xs:
+                self._count(self._get(ys, _xs), i, j)
+            self._fused_grad(ys, xs, i)
+            result = [self._get(ys, _xs)(i, j) for _xs in xs]
+        else:
+            jac = self._get(ys, xs)
+            self._count(jac, i, j)
+            group = self.fused_groups.get(id(xs))
+            if i not in jac.J and group is not None:
+                self._fused_grad(ys, group, i)
+            result = jac(i, j)
+        self.Js.shrink()
+        return result
+
+    @staticmethod
+    def _count(jac: _Jacobian, i: int, j: Optional[int]):
+        """Check index and count cache hit or miss of J[i]."""
+        jac._check_index(i, j)
+        if i in jac.J:
+            _stats.hits += 1
+        else:
+            _stats.misses += 1
+
+    def _sliced_jacobian(
+        self,
+        ys: "paddle.Tensor",
+        xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+        i: int,
+        j: Optional[int],
+    ) -> Optional[Union["paddle.Tensor", List["paddle.Tensor"]]]:
+        """Slice jacobian from jacobian of batched tensors if ys and all xs are chunks
+        of the same rows, otherwise return None.
+        """
+        is_seq = isinstance(xs, (list, tuple))
+        tensors = (ys, *xs) if is_seq else (ys, xs)
+        chunks = [self.chunks.get(self.chunks.make_key((t,))) for t in tensors]
+        if any(chunk is None for chunk in chunks):
+            return None
+        if len({chunk[1:] for chunk in chunks}) > 1:
+            return None
+
+        key = self.sliced.make_key(tensors, i, j, is_seq)
+        result = self.sliced.get(key)
+        if result is None:
+            batched_ys = chunks[0][0]
+            batched_xs = [chunk[0] for chunk in chunks[1:]]
+            start, end = chunks[0][1:]
+            grads = self(batched_ys, batched_xs if is_seq else batched_xs[0], i, j)
+            result = []
+            for grad in grads if is_seq else (grads,):
+                grad_chunk = grad[start:end]
+                self._register_chunk(grad_chunk, grad, start, end)
+                result.append(grad_chunk)
+            result = result if is_seq else result[0]
+            self.sliced.put(key, tensors, result)
+        return result
+
+    def _register_chunk(
+        self, chunk: "paddle.Tensor", batched: "paddle.Tensor", start: int, end: int
+    ):
+        """Record that chunk is rows [start, end) of batched tensor."""
+        self.chunks.put(self.chunks.make_key((chunk,)), (chunk,), (batched, start, end))
+
+    def _get(self, ys: "paddle.Tensor", xs: "paddle.Tensor") -> _Jacobian:
+        """Get cached _Jacobian of (ys, xs), create a new one if not exist."""
+        key = self.Js.make_key((ys, xs))
+        jac = self.Js.get(key)
+        if jac is None:
+            jac = _Jacobian(ys, xs)
+            self.Js.put(key, (ys, xs), jac)
+        return jac
+
+    def _fused_grad(
+        self, ys: "paddle.Tensor", xs: Sequence["paddle.Tensor"], i: int
+    ) -> None:
+        """Compute gradients of ys[i] w.r.t. all uncached xs with a single backward
+        pass, then cache them by (ys, xs) pair.
+        """
+        xs = [_xs for _xs in xs if i not in self._get(ys, _xs).J]
+        if not xs:
+            return
+        y = ys[:, i : i + 1] if ys.shape[1] > 1 else ys
+        grads = _grad(y, xs, create_graph=True, allow_unused=True)
+        for _xs, grad in zip(xs, grads):
+            # leave unused input uncached, so it will be computed(and reported) alone
+            if grad is not None:
+                self._get(ys, _xs).J[i] = grad
+                _stats.add_bytes(_nbytes(grad))
+
+    def _fuse_inputs(self, xs: Iterable["paddle.Tensor"]):
+        """Add a group of input tensors whose gradients are computed together."""
+        # only 2D tensor of shape [batch_size, dim_x] can be treated as input
+        group = tuple(_xs for _xs in xs if _xs.ndim == 2)
+        # group holds references of tensors, so their ids won't be reused
+        for _xs in group:
+            self.fused_groups[id(_xs)] = group
 
     def _clear(self):
         """Clear cached Jacobians."""
-        self.Js = {}
+        for jac in self.Js.values():
+            _stats.bytes -= jac.nbytes
+        self.Js.clear()
+        self.fused_groups.clear()
+        self.chunks.clear()
+        self.sliced.clear()
 
 
 # Use high-order differentiation with singleton pattern for convenient
@@ -153,13 +447,19 @@ class _Hessian:
                 )
             component = 0
 
-        if grad_y is None:
-            grad_y = jacobian(ys, xs, i=component, j=None)
-        self.H = _Jacobian(grad_y, xs)
+        self.component = component
+        # gradient of ys is fetched from jacobian cache when needed unless given
+        self._grad_y = None if grad_y is None else weakref.ref(grad_y)
 
-    def __call__(self, i: int = 0, j: int = 0):
+    def __call__(
+        self, ys: "paddle.Tensor", xs: "paddle.Tensor", i: int = 0, j: int = 0
+    ) -> "paddle.Tensor":
         """Returns H[`i`][`j`]."""
-        return self.H(i, j)
+        grad_y = None if self._grad_y is None else self._grad_y()
+        if grad_y is None:
+            grad_y = jacobian(ys, xs, i=self.component, j=None)
+        # share cache(and fused inputs) with jacobian
+        return jacobian(grad_y, xs, i, j)
 
 
 class Hessians:
@@ -175,8 +475,9 @@ class Hessians:
     """
 
     def __init__(self):
-        self.Hs = {}
+        self.Hs = _TensorCache()
 
+    @jit.not_to_static
     def __call__(
         self,
         ys: "paddle.Tensor",
@@ -210,21 +511,374 @@ class Hessians:
             >>> y = (x * x).sin()
             >>> dy_dxx = ppsci.autodiff.hessian(y, x, component=0)
         """
-        key = (ys, xs, component)
-        if key not in self.Hs:
-            self.Hs[key] = _Hessian(ys, xs, component=component, grad_y=grad_y)
-        return self.Hs[key](i, j)
+        key = self.Hs.make_key((ys, xs), component)
+        hess = self.Hs.get(key)
+        if hess is None:
+            hess = _Hessian(ys, xs, component=component, grad_y=grad_y)
+            self.Hs.put(key, (ys, xs), hess)
+        return hess(ys, xs, i, j)
 
     def _clear(self):
         """Clear cached Hessians."""
-        self.Hs = {}
+        self.Hs.clear()
 
 
 # Use high-order differentiation with singleton pattern for convenient
 hessian = Hessians()
 
 
+class DirectionalDerivatives:
+    r"""Compute multiple higher-order directional derivatives.
+
+    $$
+    \rm DirectionalDerivative(ys, xs, k, v) = (v \cdot \nabla_{xs})^k ys
+    $$
+
+    The derivative of each order is contracted with direction `v` as soon as it is
+    computed, so every order is a scalar field of shape [batch_size, 1] and costs only
+    one backward pass, instead of nesting jacobian/hessian which builds all $dim_x^k$
+    partial derivatives. Computed orders are cached and reused by higher orders.
+    """
+
+    def __init__(self):
+        self.Ds = _TensorCache()
+
+    @jit.not_to_static
+    def __call__(
+        self,
+        ys: "paddle.Tensor",
+        xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+        order: int = 1,
+        direction: Optional[Union[Sequence[float], "paddle.Tensor"]] = None,
+    ) -> "paddle.Tensor":
+        """Compute `order`-th derivative of ys along given direction.
+
+        Args:
+            ys (paddle.Tensor): Output tensor of shape [batch_size, 1].
+            xs (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Input tensor of shape
+                [batch_size, dim_x], or a sequence of input tensors, each of shape
+                [batch_size, 1].
+            order (int, optional): Order of derivative. Defaults to 1.
+            direction (Optional[Union[Sequence[float], paddle.Tensor]]): Direction of
+                shape [dim_x] or [batch_size, dim_x], which is not normalized. Can be
+                None only when dim_x is 1. Defaults to None.
+
+        Returns:
+            paddle.Tensor: Directional derivative of shape [batch_size, 1].
+
+        Examples:
+            >>> import paddle
+            >>> import ppsci
+            >>> x = paddle.randn([4, 1])
+            >>> y = paddle.randn([4, 1])
+            >>> x.stop_gradient = False
+            >>> y.stop_gradient = False
+            >>> u = paddle.sin(x * y)
+            >>> u_xxxx = ppsci.autodiff.directional_derivative(u, x, 4)
+            >>> u_vvv = ppsci.autodiff.directional_derivative(u, (x, y), 3, (1.0, -1.0))
+        """
+        if order < 1:
+            raise ValueError(f"order({order}) should be a positive integer.")
+        seq_xs = tuple(xs) if isinstance(xs, (list, tuple)) else (xs,)
+        dim_x = sum(_xs.shape[1] for _xs in seq_xs)
+
+        if direction is None:
+            if dim_x != 1:
+                raise ValueError(f"direction can not be None when dim_x({dim_x}) > 1.")
+            direction_key = None
+        elif paddle.is_tensor(direction):
+            direction_key = direction
+        else:
+            direction = tuple(float(v) for v in direction)
+            direction_key = direction
+            direction = paddle.to_tensor([direction], dtype=ys.dtype)
+        if direction is not None and direction.shape[-1] != dim_x:
+            raise ValueError(
+                f"last dim of direction({direction.shape[-1]}) should be equal to "
+                f"dim_x({dim_x})."
+            )
+
+        key_tensors = (ys,) + seq_xs
+        if paddle.is_tensor(direction_key):
+            key_tensors += (direction_key,)
+            direction_key = None
+        key = self.Ds.make_key(key_tensors, direction_key)
+        derivatives = self.Ds.get(key)
+        if derivatives is None:
+            derivatives = []
+            self.Ds.put(key, key_tensors, derivatives)
+        while len(derivatives) < order:
+            derivative = derivatives[-1] if derivatives else ys
+            if direction is None:
+                # plain derivative w.r.t. a single input, cached by jacobian as well
+                derivative = jacobian(derivative, seq_xs[0])
+            else:
+                grads = jacobian(derivative, seq_xs)
+                derivative = (paddle.concat(grads, axis=1) * direction).sum(
+                    axis=1, keepdim=True
+                )
+            derivatives.append(derivative)
+        return derivatives[order - 1]
+
+    def _clear(self):
+        """Clear cached directional derivatives."""
+        self.Ds.clear()
+
+
+# Use high-order differentiation with singleton pattern for convenient
+directional_derivative = DirectionalDerivatives()
+
+
+def _rademacher(shape: Sequence[int], dtype: str) -> "paddle.Tensor":
+    """Generate random tensor with values drawn from {-1, 1} uniformly."""
+    return paddle.randint(0, 2, shape).astype(dtype) * 2 - 1
+
+
+@jit.not_to_static
+def laplacian(
+    ys: "paddle.Tensor",
+    xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+    method: Literal["exact", "hutchinson", "hutch++"] = "exact",
+    num_probes: int = 4,
+) -> "paddle.Tensor":
+    r"""Compute laplacian of ys w.r.t. xs, i.e. trace of hessian matrix.
+
+    $$
+    \rm Laplacian(ys, xs) = \sum_{k} \dfrac{\partial^2 ys}{\partial xs_k^2}
+    $$
+
+    "exact" computes every diagonal term of hessian, which costs one backward pass per
+    input dimension. "hutchinson" and "hutch++" estimate the trace with `num_probes`
+    hessian-vector products of random probe vectors, which costs `num_probes` backward
+    passes regardless of input dimension, so it is suitable for high-dimensional
+    problems. Randomized methods assume that samples in batch are independent of each
+    other, which holds for point-wise models such as MLP.
+
+    Args:
+        ys (paddle.Tensor): Output tensor of shape [batch_size, 1].
+        xs (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Input tensor of shape
+            [batch_size, dim_x], or a sequence of input tensors, each of shape
+            [batch_size, 1].
+        method (Literal["exact", "hutchinson", "hutch++"], optional): Method for
+            computing trace of hessian. Defaults to "exact".
+        num_probes (int, optional): Number of probe vectors(i.e. backward passes) for
+            randomized methods. Defaults to 4.
+
+    Returns:
+        paddle.Tensor: Laplacian of shape [batch_size, 1].
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x = paddle.randn([4, 10])
+        >>> x.stop_gradient = False
+        >>> y = (x * x).sum(axis=1, keepdim=True).sin()
+        >>> lap = ppsci.autodiff.laplacian(y, x)
+        >>> lap_est = ppsci.autodiff.laplacian(y, x, "hutch++", 6)
+    """
+    seq_xs = list(xs) if isinstance(xs, (list, tuple)) else [xs]
+    if method == "exact":
+        if isinstance(xs, (list, tuple)):
+            return sum(hessian(ys, _xs) for _xs in xs)
+        return sum(hessian(ys, xs, i=k, j=k) for k in range(xs.shape[1]))
+    if method not in ("hutchinson", "hutch++"):
+        raise ValueError(
+            f"method({method}) should be one of 'exact', 'hutchinson' or 'hutch++'."
+        )
+    if num_probes < 1:
+        raise ValueError(f"num_probes({num_probes}) should be a positive integer.")
+
+    grad_y = paddle.concat(jacobian(ys, seq_xs), axis=1)
+    batch_size, dim_x = grad_y.shape
+
+    def hvp(v: "paddle.Tensor") -> "paddle.Tensor":
+        """Hessian-vector product for each sample, v is of shape [batch_size, dim_x]."""
+        hv = _grad((grad_y * v).sum(), seq_xs, create_graph=True, allow_unused=True)
+        hv = [paddle.zeros_like(_xs) if h is None else h for _xs, h in zip(seq_xs, hv)]
+        return paddle.concat(hv, axis=1)
+
+    def quad(v: "paddle.Tensor") -> "paddle.Tensor":
+        """Quadratic form v^T H v for each sample."""
+        return (v * hvp(v)).sum(axis=1, keepdim=True)
+
+    # size of low-rank sketch for hutch++, falls back to hutchinson when it is 0
+    num_sketch = min(num_probes // 3, dim_x) if method == "hutch++" else 0
+    num_residual = num_probes - 2 * num_sketch
+    trace = 0
+    if num_sketch > 0:
+        # trace of hessian projected onto the dominant subspace captured by sketch
+        sketch = paddle.stack(
+            [
+                hvp(_rademacher([batch_size, dim_x], grad_y.dtype))
+                for _ in range(num_sketch)
+            ],
+            axis=2,
+        )
+        q = paddle.linalg.qr(sketch.detach())[0]
+        trace += sum(quad(q[:, :, k]) for k in range(num_sketch))
+        if num_sketch == dim_x:
+            return trace
+
+    # hutchinson estimation for (remaining) trace
+    residual_trace = 0
+    for _ in range(num_residual):
+        v = _rademacher([batch_size, dim_x], grad_y.dtype)
+        if num_sketch > 0:
+            v = v - paddle.matmul(q, paddle.matmul(q, v.unsqueeze(2), True)).squeeze(2)
+        residual_trace += quad(v)
+    return trace + residual_trace / num_residual
+
+
+@jit.not_to_static
+def fuse_inputs(xs: Iterable["paddle.Tensor"]):
+    """Set input tensors whose gradients will be computed together within one backward
+    pass, e.g. all inputs of model. Gradients of an output w.r.t. all of these inputs
+    are computed and cached once any of them is requested by `jacobian` or `hessian`,
+    so the following requests w.r.t. other inputs are free. Every call adds a
+    separate group, e.g. inputs of another model forward, and groups are kept until
+    `clear()`.
+
+    Args:
+        xs (Iterable[paddle.Tensor]): Input tensors.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x = paddle.randn([4, 1])
+        >>> y = paddle.randn([4, 1])
+        >>> x.stop_gradient = False
+        >>> y.stop_gradient = False
+        >>> u = x * y
+        >>> ppsci.autodiff.fuse_inputs((x, y))
+        >>> du_dx = ppsci.autodiff.jacobian(u, x)  # du_dy is computed as well
+        >>> du_dy = ppsci.autodiff.jacobian(u, y)  # fetched from cache
+        >>> ppsci.autodiff.clear()
+    """
+    jacobian._fuse_inputs(xs)
+
+
+@jit.not_to_static
+def concat_batch(tensors: Sequence["paddle.Tensor"]) -> "paddle.Tensor":
+    """Concatenate tensors along batch axis, e.g. inputs of several constraints, so
+    that they can be fed into model within one forward pass.
+
+    Every given tensor is recorded as a chunk of the result, jacobian of an output
+    chunk(split by `split_batch`) w.r.t. an input chunk of the same rows is sliced from
+    the jacobian of whole batch, which is computed only once for all chunks. Note that
+    it requires samples being computed independently by model, e.g. MLP without batch
+    normalization. Reset by `clear()`.
+
+    Args:
+        tensors (Sequence[paddle.Tensor]): Tensors of shape [batch_size_k, dim_x].
+
+    Returns:
+        paddle.Tensor: Concatenated tensor.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x1 = paddle.randn([4, 1])
+        >>> x2 = paddle.randn([6, 1])
+        >>> x1.stop_gradient = False
+        >>> x2.stop_gradient = False
+        >>> x = ppsci.autodiff.concat_batch((x1, x2))
+        >>> u1, u2 = ppsci.autodiff.split_batch(x * x, (4, 6))
+        >>> du1_dx1 = ppsci.autodiff.jacobian(u1, x1)
+        >>> du2_dx2 = ppsci.autodiff.jacobian(u2, x2)  # sliced from cache
+        >>> ppsci.autodiff.clear()
+    """
+    batched = paddle.concat(tensors, axis=0)
+    start = 0
+    for tensor in tensors:
+        end = start + tensor.shape[0]
+        jacobian._register_chunk(tensor, batched, start, end)
+        start = end
+    return batched
+
+
+@jit.not_to_static
+def split_batch(
+    tensor: "paddle.Tensor", sections: Sequence[int]
+) -> List["paddle.Tensor"]:
+    """Split tensor along batch axis into chunks of given sizes, inverse of
+    `concat_batch`.
+
+    Args:
+        tensor (paddle.Tensor): Tensor of shape [sum(sections), dim_y].
+        sections (Sequence[int]): Number of rows of every chunk.
+
+    Returns:
+        List[paddle.Tensor]: Chunks of tensor.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> u1, u2 = ppsci.autodiff.split_batch(paddle.randn([10, 1]), (4, 6))
+        >>> ppsci.autodiff.clear()
+    """
+    if sum(sections) != tensor.shape[0]:
+        raise ValueError(
+            f"sum of sections({sum(sections)}) should be equal to "
+            f"batch size({tensor.shape[0]})."
+        )
+    chunks = []
+    start = 0
+    for section in sections:
+        chunk = tensor[start : start + section]
+        jacobian._register_chunk(chunk, tensor, start, start + section)
+        chunks.append(chunk)
+        start += section
+    return chunks
+
+
+@jit.not_to_static
+def set_cache_budget(max_bytes: Optional[int]):
+    """Set max number of bytes held by cached jacobians, least recently used ones will
+    be evicted when exceeded.
+
+    Args:
+        max_bytes (Optional[int]): Max number of bytes, None means unlimited.
+
+    Examples:
+        >>> import ppsci
+        >>> ppsci.autodiff.set_cache_budget(2 * 1024**3)
+    """
+    _stats.max_bytes = max_bytes
+    jacobian.Js.shrink()
+
+
+@jit.not_to_static
+def cache_info(reset: bool = False) -> CacheInfo:
+    """Statistics of derivative cache, including number of hits, misses and backward
+    calls, bytes currently held, peak bytes held, bytes budget and number of evictions.
+
+    Args:
+        reset (bool, optional): Whether reset counters after fetching. Defaults to False.
+
+    Returns:
+        CacheInfo: Named tuple of statistics.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x = paddle.randn([4, 1])
+        >>> x.stop_gradient = False
+        >>> y = x * x
+        >>> dy_dx = ppsci.autodiff.jacobian(y, x)
+        >>> dy_dx = ppsci.autodiff.jacobian(y, x)
+        >>> info = ppsci.autodiff.cache_info(reset=True)
+        >>> print(info.hits, info.misses, info.backward_calls)
+        1 1 1
+    """
+    info = _stats.info()
+    if reset:
+        _stats.reset()
+    return info
+
+
+@jit.not_to_static
 def clear():
-    """Clear cached Jacobians and Hessians."""
+    """Clear cached Jacobians, Hessians and directional derivatives."""
     jacobian._clear()
     hessian._clear()
+    directional_derivative._clear()
@@ -0,0 +1,234 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import paddle
+from paddle import nn
+
+from ppsci.autodiff.ad import clear
+from ppsci.autodiff.ad import jacobian
+
+if TYPE_CHECKING:
+    from ppsci import constraint
+
+# Path of a derivative tensor, starts from a named tensor and followed by
+# (row index, input name) of every differentiation, e.g. ("u", (0, "x"), (0, "y"))
+# denotes d^2u/dxdy.
+DerivativePath = Tuple
+# (path of tensor to be differentiated, row index, names of inputs)
+PlanItem = Tuple[DerivativePath, int, Tuple[str, ...]]
+
+
+class DerivativePlanner:
+    """Derivative planner, which traces derivatives required by constraint(s) once and
+    computes all of them level by level before equation forward, so that derivatives
+    of one tensor w.r.t. different inputs are computed within a single backward pass,
+    and first order derivatives are reused for higher order derivatives.
+
+    Derivatives requested by expressions are recorded by running model and expressions
+    on a small probe batch taken from constraint's dataset. Derivatives which can not be
+    traced, e.g. derivative of an intermediate tensor, are still computed lazily.
+
+    Args:
+        model (nn.Layer): NN model.
+        constraint (Dict[str, constraint.Constraint]): Constraint dict.
+        num_probe (int, optional): Number of samples used for tracing. Defaults to 2.
+
+    Examples:
+        >>> import ppsci
+        >>> model = ppsci.arch.MLP(("x", "y"), ("u", "v", "p"), 3, 16)
+        >>> # constraint = {...}
+        >>> # planner = ppsci.autodiff.DerivativePlanner(model, constraint)
+        >>> # print(planner.summary())
+    """
+
+    def __init__(
+        self,
+        model: nn.Layer,
+        constraint: Dict[str, "constraint.Constraint"],
+        num_probe: int = 2,
+    ):
+        self.num_probe = num_probe
+        # constraint name -> list of levels, each level contains plan items
+        self.plans: Dict[str, List[List[PlanItem]]] = {}
+        # constraint name -> {expression name: (number of backward pass, time cost)}
+        self.profiles: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        # constraint name -> number of derivatives which can not be planned
+        self.num_untracked: Dict[str, int] = {}
+
+        for name, _constraint in constraint.items():
+            input_dict = self._probe_input(_constraint)
+            if input_dict is None:
+                continue
+            output_expr = {
+                key: expr
+                for key, expr in _constraint.output_expr.items()
+                if key in _constraint.label_dict and callable(expr)
+            }
+            if not output_expr:
+                continue
+            (
+                self.plans[name],
+                self.profiles[name],
+                self.num_untracked[name],
+            ) = self._trace(model, output_expr, input_dict)
+
+    def _probe_input(
+        self, _constraint: "constraint.Constraint"
+    ) -> Optional[Dict[str, "paddle.Tensor"]]:
+        """Take first `num_probe` samples from constraint's dataset as probe input."""
+        dataset = _constraint.data_loader.dataset
+        if not isinstance(getattr(dataset, "input", None), dict):
+            return None
+
+        input_dict = {}
+        for key, value in dataset.input.items():
+            value = value[: self.num_probe]
+            value = (
+                value.detach() if paddle.is_tensor(value) else paddle.to_tensor(value)
+            )
+            if paddle.is_floating_point(value):
+                value.stop_gradient = False
+            input_dict[key] = value
+        return input_dict
+
+    def _trace(
+        self,
+        model: nn.Layer,
+        output_expr: Dict[str, Callable],
+        input_dict: Dict[str, "paddle.Tensor"],
+    ) -> Tuple[List[List[PlanItem]], Dict[str, Tuple[int, float]], int]:
+        """Trace derivatives required by given expressions.
+
+        Returns:
+            Tuple[List[List[PlanItem]], Dict[str, Tuple[int, float]], int]: Plan
+                levels, profile of each expression and number of untracked derivatives.
+        """
+        train_state = model.training
+        if train_state:
+            model.eval()
+
+        clear()
+        output_dict = model(input_dict)
+        data_dict = {**output_dict, **input_dict}
+
+        # run expressions lazily and record cost of each one
+        profile = {}
+        for key, expr in output_expr.items():
+            num_backward = self._num_computed()
+            tic = time.perf_counter()
+            expr(data_dict)
+            profile[key] = (
+                self._num_computed() - num_backward,
+                time.perf_counter() - tic,
+            )
+
+        # resolve path of every computed derivative from named tensors
+        names = {id(v): k for k, v in data_dict.items()}
+        paths = {id(v): (k,) for k, v in data_dict.items()}
+        records = [
+            (jac.ys, jac.xs, i, grad)
+            for jac in jacobian.Js.values()
+            for i, grad in jac.J.items()
+        ]
+        resolved = True
+        while resolved:
+            resolved = False
+            for ys, xs, i, grad in records:
+                if id(grad) in paths or id(ys) not in paths or id(xs) not in names:
+                    continue
+                paths[id(grad)] = paths[id(ys)] + ((i, names[id(xs)]),)
+                resolved = True
+
+        # group inputs by differentiated row, then group rows by derivative order
+        rows = {}
+        num_untracked = 0
+        for ys, xs, i, grad in records:
+            if id(grad) not in paths or len(paths[id(grad)]) == 1:
+                num_untracked += 1
+                continue
+            rows.setdefault((paths[id(ys)], i), []).append(names[id(xs)])
+        levels = {}
+        for (path, i), xs_names in rows.items():
+            levels.setdefault(len(path), []).append((path, i, tuple(xs_names)))
+
+        clear()
+        if train_state:
+            model.train()
+
+        return [levels[order] for order in sorted(levels)], profile, num_untracked
+
+    @staticmethod
+    def _num_computed() -> int:
+        """Number of backward passes have been made by jacobian."""
+        return sum(len(jac.J) for jac in jacobian.Js.values())
+
+    def execute(self, name: str, data_dict: Dict[str, "paddle.Tensor"]):
+        """Compute all planned derivatives for given constraint, the results are cached
+        in `jacobian` and `hessian` and will be fetched by expressions.
+
+        Args:
+            name (str): Name of constraint.
+            data_dict (Dict[str, paddle.Tensor]): Model outputs and inputs.
+        """
+        if name not in self.plans:
+            return
+        derivatives = {}
+        for level in self.plans[name]:
+            for path, i, xs_names in level:
+                ys = data_dict[path[0]] if len(path) == 1 else derivatives[path]
+                grads = jacobian(ys, [data_dict[key] for key in xs_names], i)
+                for key, grad in zip(xs_names, grads):
+                    derivatives[path + ((i, key),)] = grad
+
+    def num_backward(self, name: str) -> Tuple[int, int]:
+        """Number of backward passes required for given constraint.
+
+        Args:
+            name (str): Name of constraint.
+
+        Returns:
+            Tuple[int, int]: Number of backward passes with plan and without plan.
+        """
+        planned = sum(len(level) for level in self.plans[name])
+        planned += self.num_untracked[name]
+        lazy = sum(num for num, _ in self.profiles[name].values())
+        return planned, lazy
+
+    def summary(self) -> str:
+        """Summary of plan and profile for every constraint.
+
+        Returns:
+            str: Summary message.
+        """
+        msgs = []
+        for name in self.plans:
+            planned, lazy = self.num_backward(name)
+            profile_msg = ", ".join(
+                f"{key}: {num} backward(s) {cost * 1000:.3f}ms"
+                for key, (num, cost) in self.profiles[name].items()
+            )
+            msgs.append(
+                f"[{name}] {len(self.plans[name])} level(s), backward passes per step: "
+                f"{lazy} -> {planned}, untracked: {self.num_untracked[name]}; "
+                f"{profile_msg}"
+            )
+        return "\n".join(msgs)
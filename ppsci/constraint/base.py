@@ -12,16 +12,172 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import functools
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
+import numpy as np
+import paddle
+import sympy
 from paddle import io
+from sympy.parsing import sympy_parser as sp_parser
 
 from ppsci import data
+from ppsci.utils import cache
+from ppsci.utils import misc
 
 if TYPE_CHECKING:
     from ppsci import loss
+    from ppsci.geometry import sampler
+
+
+def _evaluate(
+    value: Any, input: Dict[str, np.ndarray], dim_keys: Tuple[str, ...]
+) -> np.ndarray:
+    """Evaluate label or weight given by number, sympy expression or function."""
+    if isinstance(value, (int, float)):
+        return np.full_like(next(iter(input.values())), float(value))
+    if isinstance(value, sympy.Basic):
+        func = sympy.lambdify(
+            sympy.symbols(dim_keys),
+            value,
+            [{"amax": lambda xy, _: np.maximum(xy[0], xy[1])}, "numpy"],
+        )
+        return func(**{k: v for k, v in input.items() if k in dim_keys})
+    if callable(value):
+        result = value(input)
+        if isinstance(result, (int, float)):
+            result = np.full_like(next(iter(input.values())), result)
+        return result
+    raise NotImplementedError(f"type of {type(value)} is invalid yet.")
+
+
+class GeometryDataSampler:
+    """Sample input points from geometry and prepare label and weight of them for
+    constraint, shared by constraints whose data is sampled from geometry.
+
+    Args:
+        sample_func (Callable[..., Dict[str, np.ndarray]]): Sampling method of
+            geometry, e.g. `geom.sample_interior`.
+        dim_keys (Tuple[str, ...]): Coordinate keys of geometry.
+        label_dict (Dict[str, Union[float, str, Callable]]): Number, expression or
+            function in dict for computing label.
+        weight_dict (Optional[Dict[str, Union[float, str, Callable]]]): Number,
+            expression or function in dict for computing weight, "sdf" means signed
+            distance of sampled points. Weight is 1 if not given.
+        batch_size (int): Batch size of constraint. "area" of every point is scaled
+            to area of geometry divided by batch size whatever number of sampled
+            points is, so that "area" of points in one batch sums up to area of
+            geometry.
+        random (Literal["pseudo", "LHS"], optional): Random method for sampling.
+            Defaults to "pseudo".
+        criteria (Optional[Callable]): Criteria for refining specified region.
+            Defaults to None.
+        evenly (bool, optional): Whether to sample evenly. Defaults to False.
+
+    Examples:
+        >>> import ppsci
+        >>> from ppsci.constraint import base
+        >>> rect = ppsci.geometry.Rectangle((0, 0), (1, 1))
+        >>> sampler = base.GeometryDataSampler(
+        ...     rect.sample_interior, rect.dim_keys, {"u": "x + y"}, None, 16
+        ... )
+        >>> input, label, weight = sampler(16)
+        >>> label["u"].shape, weight["u"].shape
+        ((16, 1), (16, 1))
+    """
+
+    def __init__(
+        self,
+        sample_func: Callable[..., Dict[str, np.ndarray]],
+        dim_keys: Tuple[str, ...],
+        label_dict: Dict[str, Any],
+        weight_dict: Optional[Dict[str, Any]],
+        batch_size: int,
+        random: str = "pseudo",
+        criteria: Optional[Callable] = None,
+        evenly: bool = False,
+    ):
+        self.sample_func = sample_func
+        self.dim_keys = dim_keys
+        self.label_dict = label_dict
+        self.weight_dict = weight_dict
+        self.batch_size = batch_size
+        self.random = random
+        self.criteria = criteria
+        self.evenly = evenly
+
+    def __call__(
+        self,
+        num_samples: int,
+        cached: bool = False,
+        random: Optional[Union[str, "sampler.QuasiRandomEngine"]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], ...]:
+        """Sample given number of points and prepare label and weight of them.
+
+        Args:
+            num_samples (int): Number of points.
+            cached (bool, optional): Whether load points from point cache, see
+                `cache.cached_sample`. Defaults to False.
+            random (Optional[Union[str, sampler.QuasiRandomEngine]]): Random method
+                used instead of the given one, and points are sampled randomly rather
+                than evenly, e.g. for drawing different points on every call. Defaults
+                to None.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], ...]: Input, label and weight dict.
+        """
+        if random is None:
+            args = (num_samples, self.random, self.criteria, self.evenly)
+        else:
+            args = (num_samples, random, self.criteria, False)
+        if cached:
+            input = cache.cached_sample(self.sample_func, *args)
+        else:
+            input = self.sample_func(*args)
+        return self.prepare(input)
+
+    def prepare(
+        self, input: Dict[str, np.ndarray]
+    ) -> Tuple[Dict[str, np.ndarray], ...]:
+        """Prepare label and weight for sampled input.
+
+        Args:
+            input (Dict[str, np.ndarray]): Sampled input dict, which is modified in
+                place.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], ...]: Input, label and weight dict.
+        """
+        if "area" in input:
+            # area of every point is area of geometry divided by number of points
+            input["area"] *= len(input["area"]) / self.batch_size
+
+        label = {}
+        for key, value in self.label_dict.items():
+            if isinstance(value, str):
+                value = sp_parser.parse_expr(value)
+            label[key] = _evaluate(value, input, self.dim_keys)
+
+        weight = {key: np.ones_like(next(iter(label.values()))) for key in label}
+        for key, value in (self.weight_dict or {}).items():
+            if isinstance(value, str) and value == "sdf":
+                weight[key] = input["sdf"]
+                continue
+            if isinstance(value, str):
+                value = sp_parser.parse_expr(value)
+            weight[key] = _evaluate(value, input, self.dim_keys)
+
+        # signed distance is only used for weight
+        input.pop("sdf", None)
+        return input, label, weight
 
 
 class Constraint:
@@ -32,6 +188,13 @@ class Constraint:
         dataloader_cfg (Dict[str, Any]): Dataloader config.
         loss (loss.Loss): Loss functor.
         name (str): Name of constraint.
+        sample_func (Optional[Callable[[int], Tuple[Dict[str, np.ndarray], ...]]]):
+            Function which samples given number of (input, label, weight) for
+            constraint, e.g. for resampling and adaptive refinement. Defaults to None.
+        resample (bool, optional): Whether to resample data of dataset for every epoch
+            by `sample_func`. Data of next epoch is sampled in background while current
+            epoch is training, and swapped into dataset at the end of epoch. Defaults
+            to False.
     """
 
     def __init__(
@@ -40,12 +203,85 @@ class Constraint:
         dataloader_cfg: Dict[str, Any],
         loss: "loss.Loss",
         name: str,
+        sample_func: Optional[
+            Callable[[int], Tuple[Dict[str, np.ndarray], ...]]
+        ] = None,
+        resample: bool = False,
     ):
         self.data_loader = data.build_dataloader(dataset, dataloader_cfg)
         self.data_loader = data.dataloader.InfiniteDataLoader(self.data_loader)
         self.data_iter = iter(self.data_loader)
         self.loss = loss
         self.name = name
+        self.sample_func = sample_func
+
+        self.resampler = None
+        if resample:
+            if sample_func is None:
+                raise ValueError(
+                    f"{misc.typename(self)} doesn't support resampling for sample_func "
+                    "is not given."
+                )
+            num_samples = (
+                dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"]
+            )
+            self.resampler = data.dataloader.BackgroundSampler(
+                functools.partial(sample_func, num_samples)
+            )
+            self.data_iter = self._resample_iter(
+                self.data_iter, dataloader_cfg["iters_per_epoch"]
+            )
+
+    def _resample_iter(self, data_iter: Iterator, iters_per_epoch: int) -> Iterator:
+        """Yield batches from data iterator, and swap data sampled in background into
+        dataset every `iters_per_epoch` batches.
+        """
+        # start sampling of next epoch when training starts
+        self.resampler.start()
+        while True:
+            for _ in range(iters_per_epoch):
+                yield next(data_iter)
+            self.update_dataset(*self.resampler.get())
+
+    def update_dataset(
+        self,
+        input: Dict[str, np.ndarray],
+        label: Dict[str, np.ndarray],
+        weight: Dict[str, np.ndarray],
+    ):
+        """Replace data of dataset in place. Number of samples may be changed, while
+        batch samplers which fix number of samples in advance(e.g.
+        DistributedBatchSampler) only draw from the leading ones. If batches are
+        prefetched, prefetching is paused during replacement and batches prefetched
+        from old data are dropped. Dataloader stops reading ahead before replacement
+        and restarts its pass over new data.
+
+        Args:
+            input (Dict[str, np.ndarray]): Input dict.
+            label (Dict[str, np.ndarray]): Label dict.
+            weight (Dict[str, np.ndarray]): Weight dict.
+        """
+        dataset = self.data_loader.dataset
+        if isinstance(dataset, io.IterableDataset):
+            input, label, weight = (
+                {key: paddle.to_tensor(value) for key, value in data_dict.items()}
+                for data_dict in (input, label, weight)
+            )
+        paused = (
+            self.data_iter.paused()
+            if isinstance(self.data_iter, data.dataloader.Prefetcher)
+            else contextlib.nullcontext()
+        )
+        with paused:
+            # stop reading ahead from old data, and restart from new data
+            self.data_loader.reset()
+            # replace all at once, so that no batch mixes old and new data
+            dataset.input, dataset.label, dataset.weight, dataset._len = (
+                input,
+                label,
+                weight,
+                len(next(iter(input.values()))),
+            )
 
     def __str__(self):
         return ", ".join(
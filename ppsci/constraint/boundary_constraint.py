@@ -19,8 +19,6 @@ from typing import Dict
 from typing import Optional
 from typing import Union
 
-import numpy as np
-import sympy
 from sympy.parsing import sympy_parser as sp_parser
 from typing_extensions import Literal
 
@@ -53,6 +51,9 @@ class BoundaryConstraint(base.Constraint):
         weight_dict (Optional[Dict[str, Union[float, Callable]]]): Define the weight of each
             constraint variable. Defaults to None.
         name (str, optional): Name of constraint object. Defaults to "BC".
+        resample (bool, optional): Whether to resample points for every epoch, points
+            of next epoch are sampled by a background process while current epoch is
+            training. Defaults to False.
 
     Examples:
         >>> import ppsci
@@ -83,6 +84,7 @@ class BoundaryConstraint(base.Constraint):
         evenly: bool = False,
         weight_dict: Optional[Dict[str, Union[float, Callable]]] = None,
         name: str = "BC",
+        resample: bool = False,
     ):
         self.output_expr = output_expr
         for label_name, expr in self.output_expr.items():
@@ -99,66 +101,23 @@ class BoundaryConstraint(base.Constraint):
         if isinstance(criteria, str):
             criteria = eval(criteria)
 
-        # prepare input
-        input = geom.sample_boundary(
-            dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"],
+        num_samples = dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"]
+        # sample input and prepare label and weight, e.g. for resampling and refinement
+        sample_func = base.GeometryDataSampler(
+            geom.sample_boundary,
+            geom.dim_keys,
+            label_dict,
+            weight_dict,
+            dataloader_cfg["batch_size"],
             random,
             criteria,
             evenly,
         )
-        if "area" in input:
-            input["area"] *= dataloader_cfg["iters_per_epoch"]
-
-        # prepare label
-        label = {}
-        for key, value in label_dict.items():
-            if isinstance(value, (int, float)):
-                label[key] = np.full_like(next(iter(input.values())), value)
-            elif isinstance(value, sympy.Basic):
-                func = sympy.lambdify(
-                    sympy.symbols(geom.dim_keys),
-                    value,
-                    [{"amax": lambda xy, axis: np.maximum(xy[0], xy[1])}, "numpy"],
-                )
-                label[key] = func(
-                    **{k: v for k, v in input.items() if k in geom.dim_keys}
-                )
-            elif callable(value):
-                func = value
-                label[key] = func(input)
-                if isinstance(label[key], (int, float)):
-                    label[key] = np.full_like(next(iter(input.values())), label[key])
-            else:
-                raise NotImplementedError(f"type of {type(value)} is invalid yet.")
-
-        # prepare weight
-        weight = {key: np.ones_like(next(iter(label.values()))) for key in label}
-        if weight_dict is not None:
-            for key, value in weight_dict.items():
-                if isinstance(value, str):
-                    value = sp_parser.parse_expr(value)
-
-                if isinstance(value, (int, float)):
-                    weight[key] = np.full_like(next(iter(label.values())), value)
-                elif isinstance(value, sympy.Basic):
-                    func = sympy.lambdify(
-                        [sympy.Symbol(k) for k in geom.dim_keys],
-                        value,
-                        [{"amax": lambda xy, _: np.maximum(xy[0], xy[1])}, "numpy"],
-                    )
-                    weight[key] = func(**{k: input[k] for k in geom.dim_keys})
-                elif callable(value):
-                    func = value
-                    weight[key] = func(input)
-                    if isinstance(weight[key], (int, float)):
-                        weight[key] = np.full_like(
-                            next(iter(input.values())), weight[key]
-                        )
-                else:
-                    raise NotImplementedError(f"type of {type(value)} is invalid yet.")
 
         # wrap input, label, weight into a dataset
-        _dataset = getattr(dataset, dataloader_cfg["dataset"])(input, label, weight)
+        _dataset = getattr(dataset, dataloader_cfg["dataset"])(
+            *sample_func(num_samples, cached=True)
+        )
 
         # construct dataloader with dataset and dataloader_cfg
-        super().__init__(_dataset, dataloader_cfg, loss, name)
+        super().__init__(_dataset, dataloader_cfg, loss, name, sample_func, resample)
@@ -28,6 +28,7 @@ from typing_extensions import Literal
 from ppsci import geometry
 from ppsci.constraint import base
 from ppsci.data import dataset
+from ppsci.utils import cache
 from ppsci.utils import misc
 
 if TYPE_CHECKING:
@@ -100,15 +101,18 @@ class IntegralConstraint(base.Constraint):
             criteria = eval(criteria)
 
         # prepare input
-        input_list = []
-        for _ in range(
-            dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"]
-        ):
-            input = geom.sample_boundary(
-                dataloader_cfg["integral_batch_size"], random, criteria
-            )
-            input_list.append(input)
-        input = misc.stack_dict_list(input_list)
+        def sample_input():
+            input_list = []
+            for _ in range(
+                dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"]
+            ):
+                input = geom.sample_boundary(
+                    dataloader_cfg["integral_batch_size"], random, criteria
+                )
+                input_list.append(input)
+            return misc.stack_dict_list(input_list)
+
+        input = cache.cached_sample(sample_input)
         # shape of each input is [batch_size, integral_batch_size, ndim]
 
         # prepare label
@@ -12,8 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import gc
+import multiprocessing
+import queue
+import random
+import threading
+import traceback
+import weakref
+from typing import Any
+from typing import Callable
+from typing import Iterator
 from typing import Union
 
+import numpy as np
+import paddle
 from paddle import io
 
 
@@ -34,12 +47,239 @@ class InfiniteDataLoader:
             raise TypeError(
                 f"dataloader should be io.DataLoader or io.IterableDataset, but got {type(dataloader)}"
             )
+        self._dataloader_iter = None
+        self._generation = 0
 
     def __iter__(self):
         while True:
-            dataloader_iter = iter(self.dataloader)
-            for batch in dataloader_iter:
+            generation = self._generation
+            self._dataloader_iter = iter(self.dataloader)
+            for batch in self._dataloader_iter:
                 yield batch
+                if generation != self._generation:
+                    break
+
+    def reset(self):
+        """Stop current pass over dataloader, so that following batches are drawn by a
+        new iterator of dataloader. Iterator of io.DataLoader reads indices and batches
+        ahead in background, so it should be reset before data of dataset is replaced.
+        """
+        self._generation += 1
+        dataloader_iter, self._dataloader_iter = self._dataloader_iter, None
+        # stop reader thread or worker processes of io.DataLoader
+        shutdown = getattr(dataloader_iter, "_try_shutdown_all", None)
+        if shutdown is not None:
+            shutdown()
 
     def __len__(self):
         return len(self.dataloader)
+
+
+class Prefetcher:
+    """Prefetcher which keeps batches from a data iterator ready on a background
+    thread, so that loading data is overlapped with training.
+
+    Every batch is a tuple of (input_dict, label_dict, weight_dict). Values which are
+    not tensors are converted to tensors on current device, and `stop_gradient` of
+    inputs are set to False in advance, so that fetching a batch only costs waiting
+    on the queue.
+
+    Args:
+        data_iter (Iterator): Data iterator to be wrapped, e.g. iterator of
+            InfiniteDataLoader.
+        num_prefetch (int, optional): Max number of batches kept ready. Defaults to 2.
+
+    Examples:
+        >>> import ppsci
+        >>> import numpy as np
+        >>> dataset = ppsci.data.dataset.IterableNamedArrayDataset(
+        ...     {"x": np.random.rand(4, 1).astype("float32")},
+        ...     {"u": np.random.rand(4, 1).astype("float32")},
+        ...     {"u": np.ones((4, 1), "float32")},
+        ... )
+        >>> loader = ppsci.data.dataloader.InfiniteDataLoader(dataset)
+        >>> prefetcher = ppsci.data.dataloader.Prefetcher(iter(loader), 2)
+        >>> input_dict, label_dict, weight_dict = next(prefetcher)
+    """
+
+    def __init__(self, data_iter: Iterator, num_prefetch: int = 2):
+        if num_prefetch < 1:
+            raise ValueError(f"num_prefetch({num_prefetch}) should be positive.")
+        self.data_iter = data_iter
+        self.num_prefetch = num_prefetch
+        self._queue = queue.Queue(maxsize=num_prefetch)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._start()
+
+    def _start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            try:
+                batch = self._prepare(next(self.data_iter))
+            except Exception as e:
+                # StopIteration is raised as well when fetched by main thread
+                self._queue.put(e)
+                return
+            self._queue.put(batch)
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Stop background thread and drop prefetched batches within the context,
+        e.g. while data of dataset is being replaced, then restart prefetching, so
+        that no batch is drawn from data being modified or before modification.
+
+        Examples:
+            >>> import numpy as np
+            >>> import paddle
+            >>> import ppsci
+            >>> dataset = ppsci.data.dataset.IterableNamedArrayDataset(
+            ...     {"x": np.zeros((4, 1), "float32")},
+            ...     {"u": np.zeros((4, 1), "float32")},
+            ...     {"u": np.ones((4, 1), "float32")},
+            ... )
+            >>> loader = ppsci.data.dataloader.InfiniteDataLoader(dataset)
+            >>> prefetcher = ppsci.data.dataloader.Prefetcher(iter(loader), 2)
+            >>> with prefetcher.paused():
+            ...     dataset.input = {"x": paddle.ones((4, 1))}
+            >>> input_dict, _, _ = next(prefetcher)
+            >>> float(input_dict["x"].sum())
+            4.0
+        """
+        if threading.current_thread() is self._thread:
+            # called by data iterator itself, e.g. resampling, batches are in order
+            yield self
+            return
+
+        self._stop_event.set()
+        # drain queue so that thread blocked on putting batch can exit
+        error = None
+        while self._thread.is_alive() or not self._queue.empty():
+            try:
+                batch = self._queue.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            if isinstance(batch, Exception):
+                error = batch
+        self._thread.join()
+        try:
+            yield self
+        finally:
+            if error is not None:
+                # data iterator is broken, keep raising the same error
+                self._queue.put(error)
+            else:
+                self._start()
+
+    @staticmethod
+    def _prepare(batch):
+        input_dict, *others = batch
+        input_dict = {
+            key: value if paddle.is_tensor(value) else paddle.to_tensor(value)
+            for key, value in input_dict.items()
+        }
+        for value in input_dict.values():
+            value.stop_gradient = False
+        return (input_dict, *others)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        batch = self._queue.get()
+        if isinstance(batch, Exception):
+            # keep raising the same error for following calls
+            self._queue.put(batch)
+            raise batch
+        return batch
+
+
+class BackgroundSampler:
+    """Sampler which calls `sample_func` in a background process, so that data of next
+    epoch is generated while current epoch is training.
+
+    Worker process is forked, so `sample_func` can be any callable, e.g. closure over
+    geometry and lambda criteria, but its return value should be picklable and it
+    should not run on GPU. Numpy's and Python's global random generators of worker are
+    seeded by a seed drawn from numpy's global random generator of main process, so
+    data is reproducible given random seed. If fork is not supported by platform,
+    data is sampled in main process when fetched.
+
+    Args:
+        sample_func (Callable[[], Any]): Function which samples data.
+
+    Examples:
+        >>> import numpy as np
+        >>> import ppsci
+        >>> sampler = ppsci.data.dataloader.BackgroundSampler(lambda: np.ones([4, 2]))
+        >>> sampler.start()
+        >>> sampler.get().shape
+        (4, 2)
+    """
+
+    def __init__(self, sample_func: Callable[[], Any]):
+        self.sample_func = sample_func
+        self._ctx = (
+            multiprocessing.get_context("fork")
+            if "fork" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        self._process = None
+        self._queue = None
+        self._finalizer = None
+
+    @staticmethod
+    def _work(sample_func: Callable[[], Any], seed: int, result_queue):
+        np.random.seed(seed)
+        random.seed(seed)
+        try:
+            result_queue.put(sample_func())
+        except Exception:
+            # original error may not be picklable
+            result_queue.put(RuntimeError(traceback.format_exc()))
+
+    def start(self):
+        """Start sampling in background process."""
+        if self._ctx is None or self._process is not None:
+            return
+        seed = np.random.randint(2**31)
+        self._queue = self._ctx.SimpleQueue()
+        self._process = self._ctx.Process(
+            target=self._work, args=(self.sample_func, seed, self._queue), daemon=True
+        )
+        # worker is forked from a multi-threaded process, so garbage collection is
+        # disabled in worker, otherwise destroying objects inherited from main
+        # process(e.g. tensors) may wait on locks held by threads that do not exist
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._process.start()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        # kill rather than terminate worker when sampler is released or at exit, as
+        # SIGTERM handler installed by paddle may hang in worker
+        self._finalizer = weakref.finalize(self, self._process.kill)
+
+    def get(self) -> Any:
+        """Wait for data sampled in background and start sampling next one.
+
+        Returns:
+            Any: Sampled data.
+        """
+        if self._process is None:
+            result = self.sample_func()
+        else:
+            # fetch before join, otherwise worker may be blocked on writing pipe
+            result = self._queue.get()
+            self._process.join()
+            self._finalizer.detach()
+            self._process = None
+        if isinstance(result, Exception):
+            raise result
+        self.start()
+        return result
@@ -16,6 +16,7 @@ import copy
 
 from ppsci.data.dataset.array_dataset import IterableNamedArrayDataset
 from ppsci.data.dataset.array_dataset import NamedArrayDataset
+from ppsci.data.dataset.array_dataset import TimeXProductDataset
 from ppsci.data.dataset.csv_dataset import CSVDataset
 from ppsci.data.dataset.csv_dataset import IterableCSVDataset
 from ppsci.data.dataset.era5_dataset import ERA5Dataset
@@ -32,6 +33,7 @@ from ppsci.utils import logger
 __all__ = [
     "IterableNamedArrayDataset",
     "NamedArrayDataset",
+    "TimeXProductDataset",
     "CSVDataset",
     "IterableCSVDataset",
     "ERA5Dataset",
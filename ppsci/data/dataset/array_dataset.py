@@ -14,6 +14,7 @@
 
 from typing import Dict
 from typing import Optional
+from typing import Union
 
 import numpy as np
 import paddle
@@ -111,3 +112,87 @@ class IterableNamedArrayDataset(io.IterableDataset):
 
     def __len__(self):
         return 1
+
+
+class TimeXProductDataset(io.Dataset):
+    """Dataset of virtual product of time sequence and spatial points, whose i-th
+    sample is spatial sample `i % NX` at timestamp `i // NX`, which is identical to
+    `ppsci.utils.misc.combine_array_with_time`. Samples are generated on demand by
+    index, so that NT x NX rows are never materialized.
+
+    Args:
+        t (np.ndarray): Time sequence with shape of [NT, ] or [NT, 1].
+        input (Dict[str, np.ndarray]): Spatial input dict, each value with shape of
+            [NX, 1].
+        label (Dict[str, np.ndarray]): Label dict, each value with shape of [NX, 1]
+            which is shared over time, or [NT * NX, 1].
+        weight (Optional[Dict[str, np.ndarray]], optional): Weight dict, each value
+            with shape of [NX, 1] or [NT * NX, 1]. Defaults to None.
+        time_key (str, optional): Key of time in input. Defaults to "t".
+        transforms (Optional[vision.Compose], optional): Compose object contains sample
+            wise transform(s). Defaults to None.
+
+    Examples:
+        >>> import numpy as np
+        >>> import ppsci
+        >>> t = np.linspace(0, 1, 1000)
+        >>> input = {"x": np.random.randn(100, 1)}
+        >>> label = {"u": np.zeros([100, 1])}
+        >>> dataset = ppsci.data.dataset.TimeXProductDataset(t, input, label)
+        >>> len(dataset)
+        100000
+        >>> input_item, label_item, weight_item = dataset[150]
+        >>> input_item["t"] == dataset.t[1], input_item["x"] == input["x"][50]
+        (array([ True]), array([ True]))
+    """
+
+    def __init__(
+        self,
+        t: np.ndarray,
+        input: Dict[str, np.ndarray],
+        label: Dict[str, np.ndarray],
+        weight: Optional[Dict[str, np.ndarray]] = None,
+        time_key: str = "t",
+        transforms: Optional[vision.Compose] = None,
+    ):
+        super().__init__()
+        self.t = np.asarray(t, dtype=paddle.get_default_dtype()).reshape([-1, 1])
+        self.input = input
+        self.label = label
+        self.time_key = time_key
+        self.input_keys = (time_key, *input.keys())
+        self.label_keys = tuple(label.keys())
+        self.weight = {} if weight is None else weight
+        self.transforms = transforms
+        self.num_x = len(next(iter(input.values())))
+        self._len = len(self.t) * self.num_x
+
+        for key, value in {**self.label, **self.weight}.items():
+            if len(value) not in (self.num_x, self._len):
+                raise ValueError(
+                    f"Length of {key}({len(value)}) should be equal to number of "
+                    f"spatial points({self.num_x}) or number of samples({self._len})"
+                )
+
+    def _take(self, data: np.ndarray, idx: Union[int, np.ndarray], x_idx):
+        """Take sample of data shared over time or not."""
+        return data[x_idx] if len(data) == self.num_x else data[idx]
+
+    def __getitem__(self, idx):
+        t_idx, x_idx = np.divmod(idx, self.num_x)
+        input_item = {self.time_key: self.t[t_idx]}
+        input_item.update({key: value[x_idx] for key, value in self.input.items()})
+        label_item = {
+            key: self._take(value, idx, x_idx) for key, value in self.label.items()
+        }
+        weight_item = {
+            key: self._take(value, idx, x_idx) for key, value in self.weight.items()
+        }
+
+        if self.transforms is not None:
+            input_item = self.transforms(input_item)
+
+        return (input_item, label_item, weight_item)
+
+    def __len__(self):
+        return self._len
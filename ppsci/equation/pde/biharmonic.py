@@ -43,9 +43,12 @@ class Biharmonic(base.PDE):
             u = out["u"]
             biharmonic = -self.q / self.D
             invars = ("x", "y", "z")[: self.dim]
-            for invar_i in invars:
-                for invar_j in invars:
-                    biharmonic += hessian(hessian(u, out[invar_i]), out[invar_j])
+            for i, invar_i in enumerate(invars):
+                for j, invar_j in enumerate(invars[i:], i):
+                    # mixed derivatives are symmetric, compute them only once
+                    biharmonic += (1 if i == j else 2) * hessian(
+                        hessian(u, out[invar_i]), out[invar_j]
+                    )
             return biharmonic
 
         self.add_equation("biharmonic", biharmonic_compute_func)
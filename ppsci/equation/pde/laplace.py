@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ppsci.autodiff import hessian
+from typing_extensions import Literal
+
+from ppsci.autodiff import laplacian
 from ppsci.equation.pde import base
 
 
@@ -25,23 +27,42 @@ class Laplace(base.PDE):
 
     Args:
         dim (int): Dimension of equation.
+        method (Literal["exact", "hutchinson", "hutch++"], optional): Method for
+            computing laplacian, randomized methods are recommended for high-dimensional
+            problems. Defaults to "exact".
+        num_probes (int, optional): Number of probe vectors for randomized methods.
+            Defaults to 4.
 
     Examples:
         >>> import ppsci
         >>> pde = ppsci.equation.Laplace(2)
+        >>> pde = ppsci.equation.Laplace(20, "hutch++", 9)
     """
 
-    def __init__(self, dim: int):
+    def __init__(
+        self,
+        dim: int,
+        method: Literal["exact", "hutchinson", "hutch++"] = "exact",
+        num_probes: int = 4,
+    ):
         super().__init__()
         self.dim = dim
+        self.method = method
+        self.num_probes = num_probes
 
         def laplace_compute_func(out):
-            x, y = out["x"], out["y"]
+            invars = (
+                ("x", "y", "z")[: self.dim]
+                if self.dim <= 3
+                else tuple(f"x{i}" for i in range(self.dim))
+            )
             u = out["u"]
-            laplace = hessian(u, x) + hessian(u, y)
-            if self.dim == 3:
-                z = out["z"]
-                laplace += hessian(u, z)
+            laplace = laplacian(
+                u,
+                [out[invar] for invar in invars],
+                self.method,
+                self.num_probes,
+            )
             return laplace
 
         self.add_equation("laplace", laplace_compute_func)
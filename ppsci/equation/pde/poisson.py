@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ppsci.autodiff import hessian
+from typing_extensions import Literal
+
+from ppsci.autodiff import laplacian
 from ppsci.equation.pde import base
 
 
@@ -25,21 +27,41 @@ class Poisson(base.PDE):
 
     Args:
         dim (int): Dimension of equation.
+        method (Literal["exact", "hutchinson", "hutch++"], optional): Method for
+            computing laplacian, randomized methods are recommended for high-dimensional
+            problems. Defaults to "exact".
+        num_probes (int, optional): Number of probe vectors for randomized methods.
+            Defaults to 4.
 
     Examples:
         >>> import ppsci
         >>> pde = ppsci.equation.Poisson(2)
+        >>> pde = ppsci.equation.Poisson(20, "hutch++", 9)
     """
 
-    def __init__(self, dim: int):
+    def __init__(
+        self,
+        dim: int,
+        method: Literal["exact", "hutchinson", "hutch++"] = "exact",
+        num_probes: int = 4,
+    ):
         super().__init__()
         self.dim = dim
+        self.method = method
+        self.num_probes = num_probes
 
         def poisson_compute_func(out):
-            invars = ("x", "y", "z")[: self.dim]
-            poisson = 0
-            for invar in invars:
-                poisson += hessian(out["p"], out[invar])
+            invars = (
+                ("x", "y", "z")[: self.dim]
+                if self.dim <= 3
+                else tuple(f"x{i}" for i in range(self.dim))
+            )
+            poisson = laplacian(
+                out["p"],
+                [out[invar] for invar in invars],
+                self.method,
+                self.num_probes,
+            )
             return poisson
 
         self.add_equation("poisson", poisson_compute_func)
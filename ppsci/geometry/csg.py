@@ -16,16 +16,150 @@
 Code below is heavily based on [https://github.com/lululxvi/deepxde](https://github.com/lululxvi/deepxde)
 """
 
+import contextlib
+import threading
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import Tuple
+
 import numpy as np
-import paddle
 
 from ppsci.geometry import geometry
+from ppsci.geometry import sampler
+
+
+class EvaluationContext:
+    """Predicates of geometries on a batch of points, each of which is evaluated once
+    and reused, e.g. `is_inside` of a child geometry used by both `on_boundary` and
+    `boundary_normal` of its parents.
+
+    Args:
+        x (np.ndarray): Points with shape of [N, ndim].
+    """
+
+    def __init__(self, x: np.ndarray):
+        self.x = x
+        self._cache: Dict[Tuple[int, str], np.ndarray] = {}
+
+    def _evaluate(self, geom: geometry.Geometry, name: str) -> np.ndarray:
+        key = (id(geom), name)
+        if key not in self._cache:
+            func: Callable[[np.ndarray], np.ndarray] = getattr(geom, name)
+            self._cache[key] = func(self.x)
+        return self._cache[key]
+
+    def is_inside(self, geom: geometry.Geometry) -> np.ndarray:
+        return self._evaluate(geom, "is_inside")
+
+    def on_boundary(self, geom: geometry.Geometry) -> np.ndarray:
+        return self._evaluate(geom, "on_boundary")
+
+    def boundary_normal(self, geom: geometry.Geometry) -> np.ndarray:
+        return self._evaluate(geom, "boundary_normal")
+
+    def sdf(self, geom: geometry.Geometry) -> np.ndarray:
+        return self._evaluate(geom, "sdf_func")
+
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def evaluation_context(x: np.ndarray) -> Iterator[EvaluationContext]:
+    """Enter evaluation context of given points, which is shared by all predicates of
+    CSG geometries called on the same array within it, so that each child of a CSG
+    tree is evaluated once per point batch instead of once per parent call.
+
+    NOTE: Points should not be modified in place within context.
+
+    Args:
+        x (np.ndarray): Points with shape of [N, ndim].
+
+    Yields:
+        Iterator[EvaluationContext]: Evaluation context of given points.
+
+    Examples:
+        >>> import numpy as np
+        >>> import ppsci
+        >>> from ppsci.geometry import csg
+        >>> rect = ppsci.geometry.Rectangle((0, 0), (2, 1))
+        >>> geom = rect - ppsci.geometry.Disk((1, 0.5), 0.2)
+        >>> x = geom.sample_boundary(10)
+        >>> x = np.hstack((x["x"], x["y"]))
+        >>> with csg.evaluation_context(x):
+        ...     on_boundary = geom.on_boundary(x)
+        ...     normal = geom.boundary_normal(x)
+    """
+    stack = _local.__dict__.setdefault("stack", [])
+    for ctx in stack:
+        if ctx.x is x:
+            yield ctx
+            return
+
+    stack.append(EvaluationContext(x))
+    try:
+        yield stack[-1]
+    finally:
+        stack.pop()
+
+
+def smooth_min(a: np.ndarray, b: np.ndarray, smoothness: float = 0.0) -> np.ndarray:
+    """Polynomial smooth minimum, which equals to `np.minimum(a, b)` where a and b
+    differ by more than smoothness.
+
+    See: https://iquilezles.org/articles/smin/
+
+    Args:
+        a (np.ndarray): First array.
+        b (np.ndarray): Second array.
+        smoothness (float, optional): Blending radius, 0 means sharp minimum.
+            Defaults to 0.0.
+
+    Returns:
+        np.ndarray: Smooth minimum of a and b.
+    """
+    if smoothness <= 0:
+        return np.minimum(a, b)
+    h = np.maximum(smoothness - np.abs(a - b), 0.0) / smoothness
+    return np.minimum(a, b) - 0.25 * smoothness * h * h
+
+
+def smooth_max(a: np.ndarray, b: np.ndarray, smoothness: float = 0.0) -> np.ndarray:
+    """Polynomial smooth maximum, i.e. `-smooth_min(-a, -b, smoothness)`.
+
+    Args:
+        a (np.ndarray): First array.
+        b (np.ndarray): Second array.
+        smoothness (float, optional): Blending radius, 0 means sharp maximum.
+            Defaults to 0.0.
+
+    Returns:
+        np.ndarray: Smooth maximum of a and b.
+    """
+    return -smooth_min(-a, -b, smoothness)
+
+
+def _check_sdf(geom1: geometry.Geometry, geom2: geometry.Geometry):
+    """Raise AttributeError if any operand has no sdf_func, so that `hasattr(csg,
+    "sdf_func")` is False and sdf is skipped when sampling points."""
+    for geom in (geom1, geom2):
+        if not hasattr(geom, "sdf_func"):
+            raise AttributeError(f"{geom} has no attribute 'sdf_func'")
 
 
 class CSGUnion(geometry.Geometry):
-    """Construct an object by CSG Union(except for Mesh)."""
+    """Construct an object by CSG Union(except for Mesh).
+
+    Args:
+        geom1 (geometry.Geometry): First geometry.
+        geom2 (geometry.Geometry): Second geometry.
+        smoothness (float, optional): Blending radius of signed distance field, which
+            only rounds off `sdf_func` at where two geometries meet and doesn't affect
+            points sampled. Defaults to 0.0.
+    """
 
-    def __init__(self, geom1, geom2):
+    def __init__(self, geom1, geom2, smoothness: float = 0.0):
         if geom1.ndim != geom2.ndim:
             raise ValueError(
                 f"{geom1}.ndim({geom1.ndim}) should be equal to "
@@ -41,77 +175,97 @@ class CSGUnion(geometry.Geometry):
         )
         self.geom1 = geom1
         self.geom2 = geom2
+        self.smoothness = smoothness
+
+    @property
+    def sdf_func(self):
+        """Signed distance field, available if both geometries have `sdf_func`."""
+        _check_sdf(self.geom1, self.geom2)
+        return self._sdf_func
+
+    def _sdf_func(self, points: np.ndarray) -> np.ndarray:
+        """Compute signed distance field by minimum of two sdf.
+
+        Args:
+            points (np.ndarray): The coordinate points used to calculate the SDF value,
+                the shape is [N, ndim].
+
+        Returns:
+            np.ndarray: SDF values of input points, the shape is [N, 1].
+        """
+        with evaluation_context(points) as ctx:
+            return smooth_min(ctx.sdf(self.geom1), ctx.sdf(self.geom2), self.smoothness)
 
     def is_inside(self, x):
-        return np.logical_or(self.geom1.is_inside(x), self.geom2.is_inside(x))
+        with evaluation_context(x) as ctx:
+            return np.logical_or(ctx.is_inside(self.geom1), ctx.is_inside(self.geom2))
 
     def on_boundary(self, x):
-        return np.logical_or(
-            np.logical_and(self.geom1.on_boundary(x), ~self.geom2.is_inside(x)),
-            np.logical_and(self.geom2.on_boundary(x), ~self.geom1.is_inside(x)),
-        )
+        with evaluation_context(x) as ctx:
+            return np.logical_or(
+                np.logical_and(ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)),
+                np.logical_and(ctx.on_boundary(self.geom2), ~ctx.is_inside(self.geom1)),
+            )
 
     def boundary_normal(self, x):
-        return np.logical_and(self.geom1.on_boundary(x), ~self.geom2.is_inside(x))[
-            :, np.newaxis
-        ] * self.geom1.boundary_normal(x) + np.logical_and(
-            self.geom2.on_boundary(x), ~self.geom1.is_inside(x)
-        )[
-            :, np.newaxis
-        ] * self.geom2.boundary_normal(
-            x
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)
+            )
+            on_boundary_geom2 = np.logical_and(
+                ctx.on_boundary(self.geom2), ~ctx.is_inside(self.geom1)
+            )
+            return on_boundary_geom1[:, np.newaxis] * ctx.boundary_normal(
+                self.geom1
+            ) + on_boundary_geom2[:, np.newaxis] * ctx.boundary_normal(self.geom2)
 
     def random_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
+        def sample_func(num_draw):
             points = (
-                np.random.rand(n, self.ndim) * (self.bbox[1] - self.bbox[0])
+                np.random.rand(num_draw, self.ndim) * (self.bbox[1] - self.bbox[0])
                 + self.bbox[0]
             )
             points = points[self.is_inside(points)]
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-            _size += len(points)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def random_boundary_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
-            geom1_boundary_points = self.geom1.random_boundary_points(n, random=random)
+        def sample_func(num_draw):
+            geom1_boundary_points = self.geom1.random_boundary_points(
+                num_draw, random=random
+            )
             geom1_boundary_points = geom1_boundary_points[
                 ~self.geom2.is_inside(geom1_boundary_points)
             ]
 
-            geom2_boundary_points = self.geom2.random_boundary_points(n, random=random)
+            geom2_boundary_points = self.geom2.random_boundary_points(
+                num_draw, random=random
+            )
             geom2_boundary_points = geom2_boundary_points[
                 ~self.geom1.is_inside(geom2_boundary_points)
             ]
 
             points = np.concatenate((geom1_boundary_points, geom2_boundary_points))
             points = np.random.permutation(points)
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-            _size += len(points)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def periodic_point(self, x, component):
         x = np.copy(x)
-        on_boundary_geom1 = np.logical_and(
-            self.geom1.on_boundary(x), ~self.geom2.is_inside(x)
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)
+            )
         x[on_boundary_geom1] = self.geom1.periodic_point(x, component)[
             on_boundary_geom1
         ]
-        on_boundary_geom2 = np.logical_and(
-            self.geom2.on_boundary(x), ~self.geom1.is_inside(x)
-        )
+        # predicates are evaluated again as points are moved
+        with evaluation_context(x) as ctx:
+            on_boundary_geom2 = np.logical_and(
+                ctx.on_boundary(self.geom2), ~ctx.is_inside(self.geom1)
+            )
         x[on_boundary_geom2] = self.geom2.periodic_point(x, component)[
             on_boundary_geom2
         ]
@@ -119,9 +273,17 @@ class CSGUnion(geometry.Geometry):
 
 
 class CSGDifference(geometry.Geometry):
-    """Construct an object by CSG Difference."""
+    """Construct an object by CSG Difference.
 
-    def __init__(self, geom1, geom2):
+    Args:
+        geom1 (geometry.Geometry): First geometry.
+        geom2 (geometry.Geometry): Second geometry.
+        smoothness (float, optional): Blending radius of signed distance field, which
+            only rounds off `sdf_func` at where two geometries meet and doesn't affect
+            points sampled. Defaults to 0.0.
+    """
+
+    def __init__(self, geom1, geom2, smoothness: float = 0.0):
         if geom1.ndim != geom2.ndim:
             raise ValueError(
                 f"{geom1}.ndim({geom1.ndim}) should be equal to "
@@ -130,68 +292,88 @@ class CSGDifference(geometry.Geometry):
         super().__init__(geom1.ndim, geom1.bbox, geom1.diam)
         self.geom1 = geom1
         self.geom2 = geom2
+        self.smoothness = smoothness
+
+    @property
+    def sdf_func(self):
+        """Signed distance field, available if both geometries have `sdf_func`."""
+        _check_sdf(self.geom1, self.geom2)
+        return self._sdf_func
+
+    def _sdf_func(self, points: np.ndarray) -> np.ndarray:
+        """Compute signed distance field by maximum of sdf of geom1 and negated sdf of geom2.
+
+        Args:
+            points (np.ndarray): The coordinate points used to calculate the SDF value,
+                the shape is [N, ndim].
+
+        Returns:
+            np.ndarray: SDF values of input points, the shape is [N, 1].
+        """
+        with evaluation_context(points) as ctx:
+            return smooth_max(
+                ctx.sdf(self.geom1), -ctx.sdf(self.geom2), self.smoothness
+            )
 
     def is_inside(self, x):
-        return np.logical_and(self.geom1.is_inside(x), ~self.geom2.is_inside(x))
+        with evaluation_context(x) as ctx:
+            return np.logical_and(ctx.is_inside(self.geom1), ~ctx.is_inside(self.geom2))
 
     def on_boundary(self, x):
-        return np.logical_or(
-            np.logical_and(self.geom1.on_boundary(x), ~self.geom2.is_inside(x)),
-            np.logical_and(self.geom1.is_inside(x), self.geom2.on_boundary(x)),
-        )
+        with evaluation_context(x) as ctx:
+            return np.logical_or(
+                np.logical_and(ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)),
+                np.logical_and(ctx.is_inside(self.geom1), ctx.on_boundary(self.geom2)),
+            )
 
     def boundary_normal(self, x):
-        return np.logical_and(self.geom1.on_boundary(x), ~self.geom2.is_inside(x))[
-            :, np.newaxis
-        ] * self.geom1.boundary_normal(x) + np.logical_and(
-            self.geom1.is_inside(x), self.geom2.on_boundary(x)
-        )[
-            :, np.newaxis
-        ] * -self.geom2.boundary_normal(
-            x
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)
+            )
+            on_boundary_geom2 = np.logical_and(
+                ctx.is_inside(self.geom1), ctx.on_boundary(self.geom2)
+            )
+            return on_boundary_geom1[:, np.newaxis] * ctx.boundary_normal(
+                self.geom1
+            ) + on_boundary_geom2[:, np.newaxis] * -ctx.boundary_normal(self.geom2)
 
     def random_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
-            tmp = self.geom1.random_points(n, random=random)
+        def sample_func(num_draw):
+            tmp = self.geom1.random_points(num_draw, random=random)
             tmp = tmp[~self.geom2.is_inside(tmp)]
+            return tmp
 
-            if len(tmp) > n - _size:
-                tmp = tmp[: n - _size]
-            x[_size : _size + len(tmp)] = tmp
-            _size += len(tmp)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def random_boundary_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
-            geom1_boundary_points = self.geom1.random_boundary_points(n, random=random)
+        def sample_func(num_draw):
+            geom1_boundary_points = self.geom1.random_boundary_points(
+                num_draw, random=random
+            )
             geom1_boundary_points = geom1_boundary_points[
                 ~self.geom2.is_inside(geom1_boundary_points)
             ]
 
-            geom2_boundary_points = self.geom2.random_boundary_points(n, random=random)
+            geom2_boundary_points = self.geom2.random_boundary_points(
+                num_draw, random=random
+            )
             geom2_boundary_points = geom2_boundary_points[
                 self.geom1.is_inside(geom2_boundary_points)
             ]
 
             points = np.concatenate((geom1_boundary_points, geom2_boundary_points))
             points = np.random.permutation(points)
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-            _size += len(points)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def periodic_point(self, x, component):
         x = np.copy(x)
-        on_boundary_geom1 = np.logical_and(
-            self.geom1.on_boundary(x), ~self.geom2.is_inside(x)
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ~ctx.is_inside(self.geom2)
+            )
         x[on_boundary_geom1] = self.geom1.periodic_point(x, component)[
             on_boundary_geom1
         ]
@@ -199,9 +381,17 @@ class CSGDifference(geometry.Geometry):
 
 
 class CSGIntersection(geometry.Geometry):
-    """Construct an object by CSG Intersection."""
+    """Construct an object by CSG Intersection.
+
+    Args:
+        geom1 (geometry.Geometry): First geometry.
+        geom2 (geometry.Geometry): Second geometry.
+        smoothness (float, optional): Blending radius of signed distance field, which
+            only rounds off `sdf_func` at where two geometries meet and doesn't affect
+            points sampled. Defaults to 0.0.
+    """
 
-    def __init__(self, geom1, geom2):
+    def __init__(self, geom1, geom2, smoothness: float = 0.0):
         if geom1.ndim != geom2.ndim:
             raise ValueError(
                 f"{geom1}.ndim({geom1.ndim}) should be equal to "
@@ -217,74 +407,94 @@ class CSGIntersection(geometry.Geometry):
         )
         self.geom1 = geom1
         self.geom2 = geom2
+        self.smoothness = smoothness
+
+    @property
+    def sdf_func(self):
+        """Signed distance field, available if both geometries have `sdf_func`."""
+        _check_sdf(self.geom1, self.geom2)
+        return self._sdf_func
+
+    def _sdf_func(self, points: np.ndarray) -> np.ndarray:
+        """Compute signed distance field by maximum of two sdf.
+
+        Args:
+            points (np.ndarray): The coordinate points used to calculate the SDF value,
+                the shape is [N, ndim].
+
+        Returns:
+            np.ndarray: SDF values of input points, the shape is [N, 1].
+        """
+        with evaluation_context(points) as ctx:
+            return smooth_max(ctx.sdf(self.geom1), ctx.sdf(self.geom2), self.smoothness)
 
     def is_inside(self, x):
-        return np.logical_and(self.geom1.is_inside(x), self.geom2.is_inside(x))
+        with evaluation_context(x) as ctx:
+            return np.logical_and(ctx.is_inside(self.geom1), ctx.is_inside(self.geom2))
 
     def on_boundary(self, x):
-        return np.logical_or(
-            np.logical_and(self.geom1.on_boundary(x), self.geom2.is_inside(x)),
-            np.logical_and(self.geom1.is_inside(x), self.geom2.on_boundary(x)),
-        )
+        with evaluation_context(x) as ctx:
+            return np.logical_or(
+                np.logical_and(ctx.on_boundary(self.geom1), ctx.is_inside(self.geom2)),
+                np.logical_and(ctx.is_inside(self.geom1), ctx.on_boundary(self.geom2)),
+            )
 
     def boundary_normal(self, x):
-        return np.logical_and(self.geom1.on_boundary(x), self.geom2.is_inside(x))[
-            :, np.newaxis
-        ] * self.geom1.boundary_normal(x) + np.logical_and(
-            self.geom1.is_inside(x), self.geom2.on_boundary(x)
-        )[
-            :, np.newaxis
-        ] * self.geom2.boundary_normal(
-            x
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ctx.is_inside(self.geom2)
+            )
+            on_boundary_geom2 = np.logical_and(
+                ctx.is_inside(self.geom1), ctx.on_boundary(self.geom2)
+            )
+            return on_boundary_geom1[:, np.newaxis] * ctx.boundary_normal(
+                self.geom1
+            ) + on_boundary_geom2[:, np.newaxis] * ctx.boundary_normal(self.geom2)
 
     def random_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
-            points = self.geom1.random_points(n, random=random)
+        def sample_func(num_draw):
+            points = self.geom1.random_points(num_draw, random=random)
             points = points[self.geom2.is_inside(points)]
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-            _size += len(points)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def random_boundary_points(self, n, random="pseudo"):
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size = 0
-        while _size < n:
-            geom1_boundary_points = self.geom1.random_boundary_points(n, random=random)
+        def sample_func(num_draw):
+            geom1_boundary_points = self.geom1.random_boundary_points(
+                num_draw, random=random
+            )
             geom1_boundary_points = geom1_boundary_points[
                 self.geom2.is_inside(geom1_boundary_points)
             ]
 
-            geom2_boundary_points = self.geom2.random_boundary_points(n, random=random)
+            geom2_boundary_points = self.geom2.random_boundary_points(
+                num_draw, random=random
+            )
             geom2_boundary_points = geom2_boundary_points[
                 self.geom1.is_inside(geom2_boundary_points)
             ]
 
             points = np.concatenate((geom1_boundary_points, geom2_boundary_points))
             points = np.random.permutation(points)
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-            _size += len(points)
-        return x
+        return sampler.rejection_sample(sample_func, n)
 
     def periodic_point(self, x, component):
         x = np.copy(x)
-        on_boundary_geom1 = np.logical_and(
-            self.geom1.on_boundary(x), self.geom2.is_inside(x)
-        )
+        with evaluation_context(x) as ctx:
+            on_boundary_geom1 = np.logical_and(
+                ctx.on_boundary(self.geom1), ctx.is_inside(self.geom2)
+            )
         x[on_boundary_geom1] = self.geom1.periodic_point(x, component)[
             on_boundary_geom1
         ]
-        on_boundary_geom2 = np.logical_and(
-            self.geom2.on_boundary(x), self.geom1.is_inside(x)
-        )
+        # predicates are evaluated again as points are moved
+        with evaluation_context(x) as ctx:
+            on_boundary_geom2 = np.logical_and(
+                ctx.on_boundary(self.geom2), ctx.is_inside(self.geom1)
+            )
         x[on_boundary_geom2] = self.geom2.periodic_point(x, component)[
             on_boundary_geom2
         ]
@@ -20,8 +20,8 @@ import abc
 from typing import Tuple
 
 import numpy as np
-import paddle
 
+from ppsci.geometry import sampler
 from ppsci.utils import logger
 from ppsci.utils import misc
 
@@ -42,7 +42,10 @@ class Geometry:
 
     @property
     def dim_keys(self):
-        return ("x", "y", "z")[: self.ndim]
+        if self.ndim <= 3:
+            return ("x", "y", "z")[: self.ndim]
+        # use numbered keys for high-dimensional geometry, e.g. ("x0", "x1", ...)
+        return tuple(f"x{i}" for i in range(self.ndim))
 
     @abc.abstractmethod
     def is_inside(self, x):
@@ -65,35 +68,26 @@ class Geometry:
 
     def sample_interior(self, n, random="pseudo", criteria=None, evenly=False):
         """Sample random points in the geometry and return those meet criteria."""
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size, _ntry, _nsuc = 0, 0, 0
-        while _size < n:
+        if sampler.is_parallel(n, random, evenly):
+            return sampler.parallel_sample(
+                self.sample_interior, n, random, criteria, evenly
+            )
+
+        def sample_func(num_draw):
             if evenly:
-                points = self.uniform_points(n)
+                points = self.uniform_points(num_draw)
             else:
                 if misc.typename(self) == "TimeXGeometry":
-                    points = self.random_points(n, random, criteria)
+                    points = self.random_points(num_draw, random, criteria)
                 else:
-                    points = self.random_points(n, random)
+                    points = self.random_points(num_draw, random)
 
             if criteria is not None:
                 criteria_mask = criteria(*np.split(points, self.ndim, axis=1)).flatten()
                 points = points[criteria_mask]
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-
-            _size += len(points)
-            _ntry += 1
-            if len(points) > 0:
-                _nsuc += 1
-
-            if _ntry >= 1000 and _nsuc == 0:
-                raise ValueError(
-                    "Sample interior points failed, "
-                    "please check correctness of geometry and given creteria."
-                )
+        x = sampler.rejection_sample(sample_func, n, "interior points")
 
         # if sdf_func added, return x_dict and sdf_dict, else, only return the x_dict
         if hasattr(self, "sdf_func"):
@@ -106,52 +100,43 @@ class Geometry:
 
     def sample_boundary(self, n, random="pseudo", criteria=None, evenly=False):
         """Compute the random points in the geometry and return those meet criteria."""
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size, _ntry, _nsuc = 0, 0, 0
-        while _size < n:
+        if sampler.is_parallel(n, random, evenly):
+            return sampler.parallel_sample(
+                self.sample_boundary, n, random, criteria, evenly
+            )
+
+        is_time_mesh = (
+            misc.typename(self) == "TimeXGeometry"
+            and misc.typename(self.geometry) == "Mesh"
+        )
+
+        def sample_func(num_draw):
             if evenly:
-                if (
-                    misc.typename(self) == "TimeXGeometry"
-                    and misc.typename(self.geometry) == "Mesh"
-                ):
-                    points, normal, area = self.uniform_boundary_points(n)
+                if is_time_mesh:
+                    # stack normal and area after points, so they are filtered together
+                    points = np.hstack(self.uniform_boundary_points(num_draw))
                 else:
-                    points = self.uniform_boundary_points(n)
+                    points = self.uniform_boundary_points(num_draw)
             else:
-                if (
-                    misc.typename(self) == "TimeXGeometry"
-                    and misc.typename(self.geometry) == "Mesh"
-                ):
-                    points, normal, area = self.random_boundary_points(n, random)
+                if is_time_mesh:
+                    points = np.hstack(self.random_boundary_points(num_draw, random))
                 else:
                     if misc.typename(self) == "TimeXGeometry":
-                        points = self.random_boundary_points(n, random, criteria)
+                        points = self.random_boundary_points(num_draw, random, criteria)
                     else:
-                        points = self.random_boundary_points(n, random)
+                        points = self.random_boundary_points(num_draw, random)
 
             if criteria is not None:
-                criteria_mask = criteria(*np.split(points, self.ndim, axis=1)).flatten()
+                criteria_mask = criteria(
+                    *np.split(points[:, : self.ndim], self.ndim, axis=1)
+                ).flatten()
                 points = points[criteria_mask]
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-
-            _size += len(points)
-            _ntry += 1
-            if len(points) > 0:
-                _nsuc += 1
-
-            if _ntry >= 1000 and _nsuc == 0:
-                raise ValueError(
-                    "Sample boundary points failed, "
-                    "please check correctness of geometry and given criteria."
-                )
-
-        if not (
-            misc.typename(self) == "TimeXGeometry"
-            and misc.typename(self.geometry) == "Mesh"
-        ):
+        x = sampler.rejection_sample(sample_func, n, "boundary points")
+        if is_time_mesh:
+            x, normal, area = np.split(x, (self.ndim, 2 * self.ndim), axis=1)
+        else:
             normal = self.boundary_normal(x)
 
         normal_dict = misc.convert_to_dict(
@@ -159,10 +144,7 @@ class Geometry:
             [f"normal_{key}" for key in self.dim_keys if key != "t"],
         )
         x_dict = misc.convert_to_dict(x, self.dim_keys)
-        if (
-            misc.typename(self) == "TimeXGeometry"
-            and misc.typename(self.geometry) == "Mesh"
-        ):
+        if is_time_mesh:
             area_dict = misc.convert_to_dict(area[:, 1:], ["area"])
             return {**x_dict, **normal_dict, **area_dict}
 
@@ -188,11 +170,11 @@ class Geometry:
         """Compute the periodic image of x."""
         raise NotImplementedError(f"{self}.periodic_point to be implemented")
 
-    def union(self, other):
-        """CSG Union."""
+    def union(self, other, smoothness: float = 0.0):
+        """CSG Union, sdf of result is blended within given smoothness."""
         from ppsci.geometry import csg
 
-        return csg.CSGUnion(self, other)
+        return csg.CSGUnion(self, other, smoothness)
 
     def __or__(self, other):
         """CSG Union."""
@@ -200,11 +182,11 @@ class Geometry:
 
         return csg.CSGUnion(self, other)
 
-    def difference(self, other):
-        """CSG Difference."""
+    def difference(self, other, smoothness: float = 0.0):
+        """CSG Difference, sdf of result is blended within given smoothness."""
         from ppsci.geometry import csg
 
-        return csg.CSGDifference(self, other)
+        return csg.CSGDifference(self, other, smoothness)
 
     def __sub__(self, other):
         """CSG Difference."""
@@ -212,11 +194,11 @@ class Geometry:
 
         return csg.CSGDifference(self, other)
 
-    def intersection(self, other):
-        """CSG Intersection."""
+    def intersection(self, other, smoothness: float = 0.0):
+        """CSG Intersection, sdf of result is blended within given smoothness."""
         from ppsci.geometry import csg
 
-        return csg.CSGIntersection(self, other)
+        return csg.CSGIntersection(self, other, smoothness)
 
     def __and__(self, other):
         """CSG Intersection."""
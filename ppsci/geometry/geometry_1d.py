@@ -111,6 +111,6 @@ class Interval(geometry.Geometry):
         the result of this function.
 
         For interval with [l, r], the sdf is defined by:
-            sdf(x) = -min(x-l, r-x) = ((r-l)/2 - abs(x-(l+r)/2))/2
+            sdf(x) = -min(x-l, r-x) = abs(x-(l+r)/2) - (r-l)/2
         """
-        return ((self.r - self.l) / 2 - np.abs(points - (self.l + self.r) / 2)) / 2
+        return np.abs(points - (self.l + self.r) / 2) - (self.r - self.l) / 2
@@ -16,6 +16,7 @@
 Code below is heavily based on [https://github.com/lululxvi/deepxde](https://github.com/lululxvi/deepxde)
 """
 
+from typing import Optional
 from typing import Tuple
 
 import numpy as np
@@ -26,6 +27,9 @@ from ppsci.geometry import geometry
 from ppsci.geometry import geometry_nd
 from ppsci.geometry import sampler
 
+# max number of point-edge pairs tested at once by Polygon
+_POINT_EDGE_BATCH = 2**20
+
 
 class Disk(geometry.Geometry):
     """Class for disk geometry
@@ -221,7 +225,7 @@ class Rectangle(geometry_nd.Hypercube):
         dist_from_center = (
             np.abs(points - center) - np.array([self.xmax - self.xmin]) / 2
         )
-        return -(
+        return (
             np.linalg.norm(np.maximum(dist_from_center, 0), axis=1)
             + np.minimum(np.max(dist_from_center, axis=1), 0)
         ).reshape(-1, 1)
@@ -438,7 +442,7 @@ class Triangle(geometry.Geometry):
             * np.clip(np.dot(v3p, self.v31.reshape(2, -1)) / self.l31**2, 0, 1)
             - v3p
         )
-        is_inside = self.is_inside(points).reshape(-1, 1) * 2 - 1
+        is_inside = 1 - self.is_inside(points).reshape(-1, 1) * 2
         len_vv12_p = np.linalg.norm(vv12_p, axis=1, keepdims=True)
         len_vv23_p = np.linalg.norm(vv23_p, axis=1, keepdims=True)
         len_vv31_p = np.linalg.norm(vv31_p, axis=1, keepdims=True)
@@ -453,13 +457,17 @@ class Polygon(geometry.Geometry):
         vertices (Tuple[Tuple[float, float], ...]): The order of vertices can be in a
             clockwise or counterclockwisedirection. The vertices will be re-ordered in
             counterclockwise (right hand rule).
+        edge_index (Optional[bool]): Whether to bucket edges into horizontal slabs
+            between adjacent vertex y-coordinates, so that `is_inside` only tests edges
+            crossing the slab of each point. Defaults to None, which means enabled when
+            the polygon has more than 32 vertices.
 
     Examples:
         >>> import ppsci
         >>> geom = ppsci.geometry.Polygon(((0, 0), (1, 0), (2, 1), (2, 2), (0, 2)))
     """
 
-    def __init__(self, vertices):
+    def __init__(self, vertices, edge_index: Optional[bool] = None):
         self.vertices = np.array(vertices, dtype=paddle.get_default_dtype())
         if len(vertices) == 3:
             raise ValueError("The polygon is a triangle. Use Triangle instead.")
@@ -494,58 +502,95 @@ class Polygon(geometry.Geometry):
         self.normal = clockwise_rotation_90(self.segments.T).T
         self.normal = self.normal / np.linalg.norm(self.normal, axis=1).reshape(-1, 1)
 
+        # edges from vertices[i] to vertices[i + 1], with an extra degenerate edge which
+        # is used for padding and never crossed
+        index = np.arange(self.nvertices)
+        self._edge_start = np.vstack(
+            (self.vertices, np.zeros((1, 2), self.vertices.dtype))
+        )
+        self._edge_end = np.vstack(
+            (np.roll(self.vertices, -1, axis=0), self._edge_start[-1:])
+        )
+        self._edge_length = self.diagonals[index, (index + 1) % self.nvertices]
+        # points on boundary are within this distance to bounding box
+        eps = 1e-8 + 1e-5 * np.max(self._edge_length)
+        self._boundary_tol = np.sqrt(eps * np.max(self._edge_length) + eps**2) + eps
+
+        if edge_index is None:
+            edge_index = self.nvertices > 32
+        self._slab_y = self._slab_edges = None
+        if edge_index:
+            self._slab_y, self._slab_edges = self._build_slab_index()
+
+    def _build_slab_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket edges into horizontal slabs between adjacent vertex y-coordinates.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sorted y-coordinates of slab bounds with
+                shape of [S + 1], and padded indices of edges crossing each slab with
+                shape of [S, K].
+        """
+        slab_y = np.unique(self.vertices[:, 1])
+        edge_y = np.stack((self._edge_start[:-1, 1], self._edge_end[:-1, 1]), axis=1)
+        # edge covers slabs in [lo, hi), horizontal edges cover none of them
+        lo = np.searchsorted(slab_y, edge_y.min(axis=1))
+        hi = np.searchsorted(slab_y, edge_y.max(axis=1))
+        count = hi - lo
+
+        edge = np.repeat(np.arange(self.nvertices), count)
+        slab = np.repeat(lo - np.cumsum(count) + count, count) + np.arange(count.sum())
+        order = np.argsort(slab, kind="stable")
+        edge, slab = edge[order], slab[order]
+        slab_count = np.bincount(slab, minlength=len(slab_y) - 1)
+        pos = np.arange(len(slab)) - np.repeat(
+            np.cumsum(slab_count) - slab_count, slab_count
+        )
+
+        slab_edges = np.full(
+            (len(slab_y) - 1, max(slab_count.max(initial=0), 1)), self.nvertices
+        )
+        slab_edges[slab, pos] = edge
+        return slab_y, slab_edges
+
     def is_inside(self, x):
-        def wn_PnPoly(P, V):
-            """Winding number algorithm.
-
-            https://en.wikipedia.org/wiki/Point_in_polygon
-            http://geomalgorithms.com/a03-_inclusion.html
-
-            Args:
-                P: A point.
-                V: Vertex points of a polygon.
-
-            Returns:
-                wn: Winding number (=0 only if P is outside polygon).
-            """
-            wn = np.zeros(len(P))  # Winding number counter
-
-            # Repeat the first vertex at end
-            # Loop through all edges of the polygon
-            for i in range(-1, self.nvertices - 1):  # Edge from V[i] to V[i+1]
-                tmp = np.all(
-                    np.hstack(
-                        [
-                            V[i, 1] <= P[:, 1:2],  # Start y <= P[1]
-                            V[i + 1, 1] > P[:, 1:2],  # An upward crossing
-                            is_left(V[i], V[i + 1], P) > 0,  # P left of edge
-                        ]
-                    ),
-                    axis=-1,
-                )
-                wn[tmp] += 1  # Have a valid up intersect
-                tmp = np.all(
-                    np.hstack(
-                        [
-                            V[i, 1] > P[:, 1:2],  # Start y > P[1]
-                            V[i + 1, 1] <= P[:, 1:2],  # A downward crossing
-                            is_left(V[i], V[i + 1], P) < 0,  # P right of edge
-                        ]
-                    ),
-                    axis=-1,
-                )
-                wn[tmp] -= 1  # Have a valid down intersect
-            return wn
+        inside = np.zeros(len(x), dtype=bool)
+        # points out of bounding box can not be inside
+        (candidate,) = np.nonzero(
+            np.all((x >= self.bbox[0]) & (x <= self.bbox[1]), axis=1)
+        )
+        if self._slab_edges is None:
+            start, end = self._edge_start[None, :-1], self._edge_end[None, :-1]
 
-        return wn_PnPoly(x, self.vertices) != 0
+        num_edges = (
+            self.nvertices if self._slab_edges is None else self._slab_edges.shape[1]
+        )
+        batch_size = max(_POINT_EDGE_BATCH // num_edges, 1)
+        for i in range(0, len(candidate), batch_size):
+            index = candidate[i : i + batch_size]
+            if self._slab_edges is not None:
+                slab = np.searchsorted(self._slab_y, x[index, 1], side="right") - 1
+                # point at top of polygon crosses no edge of the last slab
+                edges = self._slab_edges[np.clip(slab, 0, len(self._slab_edges) - 1)]
+                start, end = self._edge_start[edges], self._edge_end[edges]
+            inside[index] = winding_number(x[index], start, end) != 0
+        return inside
 
     def on_boundary(self, x):
-        _on = np.zeros(shape=len(x), dtype=np.int)
-        for i in range(-1, self.nvertices - 1):
-            l1 = np.linalg.norm(self.vertices[i] - x, axis=-1)
-            l2 = np.linalg.norm(self.vertices[i + 1] - x, axis=-1)
-            _on[np.isclose(l1 + l2, self.diagonals[i, i + 1])] += 1
-        return _on > 0
+        on = np.zeros(len(x), dtype=bool)
+        (candidate,) = np.nonzero(
+            np.all(
+                (x >= self.bbox[0] - self._boundary_tol)
+                & (x <= self.bbox[1] + self._boundary_tol),
+                axis=1,
+            )
+        )
+        batch_size = max(_POINT_EDGE_BATCH // self.nvertices, 1)
+        for i in range(0, len(candidate), batch_size):
+            index = candidate[i : i + batch_size]
+            l1 = np.linalg.norm(x[index, None] - self._edge_start[:-1], axis=-1)
+            l2 = np.linalg.norm(x[index, None] - self._edge_end[:-1], axis=-1)
+            on[index] = np.isclose(l1 + l2, self._edge_length).any(axis=1)
+        return on
 
     def random_points(self, n, random="pseudo"):
         x = np.empty((0, 2), dtype=paddle.get_default_dtype())
@@ -612,37 +657,18 @@ class Polygon(geometry.Geometry):
         is 0. Therefore, when used for weighting, a negative sign is often added before
         the result of this function.
         """
-        sdf_value = np.empty((points.shape[0], 1), dtype=paddle.get_default_dtype())
-        for n in range(points.shape[0]):
-            distance = np.dot(
-                points[n] - self.vertices[0], points[n] - self.vertices[0]
-            )
-            inside_tag = 1.0
-            for i in range(self.vertices.shape[0]):
-                j = (self.vertices.shape[0] - 1) if i == 0 else (i - 1)
-                # Calculate the shortest distance from point P to each edge.
-                vector_ij = self.vertices[j] - self.vertices[i]
-                vector_in = points[n] - self.vertices[i]
-                distance_vector = vector_in - vector_ij * np.clip(
-                    np.dot(vector_in, vector_ij) / np.dot(vector_ij, vector_ij),
-                    0.0,
-                    1.0,
-                )
-                distance = np.minimum(
-                    distance, np.dot(distance_vector, distance_vector)
-                )
-                # Calculate the inside and outside using the Odd-even rule
-                odd_even_rule_number = np.array(
-                    [
-                        points[n][1] >= self.vertices[i][1],
-                        points[n][1] < self.vertices[j][1],
-                        vector_ij[0] * vector_in[1] > vector_ij[1] * vector_in[0],
-                    ]
-                )
-                if odd_even_rule_number.all() or np.all(~odd_even_rule_number):
-                    inside_tag *= -1.0
-            sdf_value[n] = inside_tag * np.sqrt(distance)
-        return -sdf_value
+        sdf = np.empty((len(points), 1), dtype=paddle.get_default_dtype())
+        edge = self._edge_end[:-1] - self._edge_start[:-1]
+        batch_size = max(_POINT_EDGE_BATCH // self.nvertices, 1)
+        for i in range(0, len(points), batch_size):
+            # shortest distance from points to each edge
+            vector = points[i : i + batch_size, None] - self._edge_start[:-1]
+            t = np.clip(np.sum(vector * edge, -1) / np.sum(edge * edge, -1), 0.0, 1.0)
+            sdf[i : i + batch_size, 0] = np.linalg.norm(
+                vector - t[..., None] * edge, axis=-1
+            ).min(axis=1)
+        sdf[self.is_inside(points)] *= -1
+        return sdf
 
 
 def polygon_signed_area(vertices):
@@ -677,6 +703,31 @@ def clockwise_rotation_90(v):
     return np.array([v[1], -v[0]], dtype=paddle.get_default_dtype())
 
 
+def winding_number(P, P0, P1):
+    """Winding number of points with respect to edges, which is 0 only if point is
+    outside polygon.
+
+    See: https://en.wikipedia.org/wiki/Point_in_polygon,
+    http://geomalgorithms.com/a03-_inclusion.html
+
+    Args:
+        P (np.ndarray): Points to be tested with shape of [N, 2].
+        P0 (np.ndarray): Start points of edges with shape of [K, 2] or [N, K, 2].
+        P1 (np.ndarray): End points of edges with shape of [K, 2] or [N, K, 2].
+
+    Returns:
+        np.ndarray: Winding numbers with shape of [N].
+    """
+    x, y = P[:, None, 0], P[:, None, 1]
+    # left of edge if > 0, i.e. is_left(P0, P1, P)
+    left = (P1[..., 0] - P0[..., 0]) * (y - P0[..., 1]) - (P1[..., 1] - P0[..., 1]) * (
+        x - P0[..., 0]
+    )
+    up = (P0[..., 1] <= y) & (P1[..., 1] > y) & (left > 0)
+    down = (P0[..., 1] > y) & (P1[..., 1] <= y) & (left < 0)
+    return np.count_nonzero(up, axis=1) - np.count_nonzero(down, axis=1)
+
+
 def is_left(P0, P1, P2):
     """Test if a point is Left|On|Right of an infinite line.
 
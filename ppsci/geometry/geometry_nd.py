@@ -84,6 +84,13 @@ class Hypercube(geometry.Geometry):
         return _n
 
     def uniform_points(self, n, boundary=True):
+        """Compute the equispaced points in the hypercube. Grid points are used for
+        ndim <= 3, otherwise low-discrepancy Kronecker points are used instead, which
+        costs O(n * ndim) rather than a full grid, and `boundary` is ignored.
+        """
+        if self.ndim > 3:
+            return self.random_points(n, "Kronecker")
+
         dx = (self.volume / n) ** (1 / self.ndim)
         xi = []
         for i in range(self.ndim):
@@ -173,6 +180,11 @@ class Hypersphere(geometry.Geometry):
         _n = _n / l * np.isclose(l, self.radius)
         return _n
 
+    def uniform_points(self, n, boundary=True):
+        """Compute the evenly distributed points in the hypersphere by mapping
+        low-discrepancy Kronecker points, `boundary` is ignored."""
+        return self.random_points(n, "Kronecker")
+
     def random_points(self, n, random="pseudo"):
         # https://math.stackexchange.com/questions/87230/picking-random-points-in-the-volume-of-sphere-with-uniform-probability
         if random == "pseudo":
@@ -197,3 +209,8 @@ class Hypersphere(geometry.Geometry):
             X = stats.norm.ppf(U).astype(paddle.get_default_dtype())
         X = preprocessing.normalize(X)
         return self.radius * X + self.center
+
+    def uniform_boundary_points(self, n):
+        """Compute the evenly distributed points on the hypersphere by mapping
+        low-discrepancy Kronecker points."""
+        return self.random_boundary_points(n, "Kronecker")
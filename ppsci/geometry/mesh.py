@@ -16,14 +16,16 @@ from typing import TYPE_CHECKING
 from typing import Callable
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import numpy as np
 import paddle
+from typing_extensions import Literal
 
 from ppsci.geometry import geometry
-from ppsci.geometry import geometry_3d
 from ppsci.geometry import sampler
+from ppsci.utils import cache
 from ppsci.utils import checker
 from ppsci.utils import misc
 
@@ -92,6 +94,7 @@ class Mesh(geometry.Geometry):
         self.v2 = self.vectors[:, 2]
         self.num_vertices = self.py_mesh.num_vertices
         self.num_faces = self.py_mesh.num_faces
+        self.triangle_areas = area_of_triangles(self.v0, self.v1, self.v2)
 
         if not checker.dynamic_import_to_globals(["pysdf"]):
             raise ImportError(
@@ -106,6 +109,50 @@ class Mesh(geometry.Geometry):
             ((np.min(self.vectors[:, :, 1])), np.max(self.vectors[:, :, 1])),
             ((np.min(self.vectors[:, :, 2])), np.max(self.vectors[:, :, 2])),
         )
+        # occupancy grid for interior sampling, built lazily at first sampling
+        self.occupancy_grid: Optional[Tuple[np.ndarray, np.ndarray, float]] = None
+        # hash of mesh content and meshes derived from it, e.g. inflated meshes
+        self.content_hash = cache.hash_content(self.vertices, self.faces)
+        self.derived_meshes: Dict[str, "Mesh"] = {}
+
+    def _derived_mesh(
+        self, operation: str, build_func: Callable, *others: "Mesh", **params
+    ) -> "Mesh":
+        """Get mesh derived from this mesh(and other meshes) by given operation, which
+        is cached both in memory and on disk by content of meshes, operation and its
+        parameters, so the operation runs only once across calls, runs and ranks.
+
+        Args:
+            operation (str): Name of operation.
+            build_func (Callable): Function which returns derived pymesh.Mesh.
+            *others (Mesh): Other meshes involved in operation.
+            **params: Parameters of operation.
+
+        Returns:
+            Mesh: Derived mesh.
+        """
+        key = cache.hash_content(
+            meshes=tuple(mesh.content_hash for mesh in (self, *others)),
+            operation=operation,
+            **params,
+        )
+        if key in self.derived_meshes:
+            return self.derived_meshes[key]
+
+        arrays = cache.load_arrays(key)
+        if arrays is None:
+            py_mesh = build_func()
+            cache.save_arrays(
+                key, {"vertices": py_mesh.vertices, "faces": py_mesh.faces}
+            )
+        else:
+            import pymesh
+
+            py_mesh = pymesh.form_mesh(
+                np.asarray(arrays["vertices"]), np.asarray(arrays["faces"])
+            )
+        self.derived_meshes[key] = Mesh(py_mesh)
+        return self.derived_meshes[key]
 
     def sdf_func(self, points: np.ndarray) -> np.ndarray:
         """Compute signed distance field.
@@ -208,7 +255,11 @@ class Mesh(geometry.Geometry):
         all_points = []
         all_areas = []
         for _n, _dist in zip(n, distance):
-            inflated_mesh = Mesh(inflation.pymesh_inflation(self.py_mesh, _dist))
+            inflated_mesh = self._derived_mesh(
+                "inflate",
+                lambda: inflation.pymesh_inflation(self.py_mesh, _dist),
+                distance=float(_dist),
+            )
             points, areas = inflated_mesh.random_points(_n, random, criteria)
             all_points.append(points)
             all_areas.append(areas)
@@ -234,80 +285,32 @@ class Mesh(geometry.Geometry):
         Returns:
             np.ndarray: Approximated areas with shape of [n_faces, ].
         """
-        triangle_areas = area_of_triangles(self.v0, self.v1, self.v2)
-        triangle_probabilities = triangle_areas / np.linalg.norm(triangle_areas, ord=1)
-        triangle_index = np.arange(triangle_probabilities.shape[0])
-        npoint_per_triangle = np.random.choice(
-            triangle_index, n_appr, p=triangle_probabilities
+        aux_points, triangle_index = sample_in_triangles(
+            self.v0, self.v1, self.v2, n_appr, random, self.triangle_areas
         )
-        npoint_per_triangle, _ = np.histogram(
-            npoint_per_triangle,
-            np.arange(triangle_probabilities.shape[0] + 1) - 0.5,
-        )
-
-        appr_areas = []
-        if criteria is not None:
-            aux_points = []
-
-        for i, npoint in enumerate(npoint_per_triangle):
-            if npoint == 0:
-                continue
-            # sample points for computing criteria mask if criteria is given
-            if criteria is not None:
-                points_at_triangle_i = sample_in_triangle(
-                    self.v0[i], self.v1[i], self.v2[i], npoint, random
-                )
-                aux_points.append(points_at_triangle_i)
-
-            appr_areas.append(
-                np.full(
-                    (npoint, 1), triangle_areas[i] / npoint, paddle.get_default_dtype()
-                )
-            )
-        appr_areas = np.concatenate(appr_areas, axis=0)  # [n_appr, 1]
+        npoint_per_triangle = np.bincount(triangle_index, minlength=self.num_faces)
+        appr_areas = (
+            self.triangle_areas[triangle_index] / npoint_per_triangle[triangle_index]
+        ).astype(paddle.get_default_dtype())[
+            :, np.newaxis
+        ]  # [n_appr, 1]
 
         # set invalid area to 0 by computing criteria mask with auxiliary points
         if criteria is not None:
-            aux_points = np.concatenate(aux_points, axis=0)  # [n_appr, 3]
             criteria_mask = criteria(*np.split(aux_points, self.ndim, 1))
             appr_areas *= criteria_mask
         return appr_areas.sum()
 
     def random_boundary_points(self, n, random="pseudo"):
-        triangle_area = area_of_triangles(self.v0, self.v1, self.v2)
-        triangle_prob = triangle_area / np.linalg.norm(triangle_area, ord=1)
-        npoint_per_triangle = np.random.choice(
-            np.arange(len(triangle_prob)), n, p=triangle_prob
+        points, triangle_index = sample_in_triangles(
+            self.v0, self.v1, self.v2, n, random, self.triangle_areas
         )
-        npoint_per_triangle, _ = np.histogram(
-            npoint_per_triangle, np.arange(len(triangle_prob) + 1) - 0.5
-        )
-
-        points = []
-        normal = []
-        areas = []
-        for i, npoint in enumerate(npoint_per_triangle):
-            if npoint == 0:
-                continue
-            points_at_triangle_i = sample_in_triangle(
-                self.v0[i], self.v1[i], self.v2[i], npoint, random
-            )
-            normal_at_triangle_i = np.tile(self.face_normal[i], (npoint, 1)).astype(
-                paddle.get_default_dtype()
-            )
-            areas_at_triangle_i = np.full(
-                (npoint, 1),
-                triangle_area[i] / npoint,
-                dtype=paddle.get_default_dtype(),
-            )
-
-            points.append(points_at_triangle_i)
-            normal.append(normal_at_triangle_i)
-            areas.append(areas_at_triangle_i)
-
-        points = np.concatenate(points, axis=0)
-        normal = np.concatenate(normal, axis=0)
-        areas = np.concatenate(areas, axis=0)
+        normal = self.face_normal[triangle_index].astype(paddle.get_default_dtype())
+        # area of each triangle is shared by points sampled in it
+        npoint_per_triangle = np.bincount(triangle_index, minlength=self.num_faces)
+        areas = (
+            self.triangle_areas[triangle_index] / npoint_per_triangle[triangle_index]
+        ).astype(paddle.get_default_dtype())[:, np.newaxis]
 
         return points, normal, areas
 
@@ -330,7 +333,11 @@ class Mesh(geometry.Geometry):
             inflated_data_dict = {}
             for _n, _dist in zip(n, inflation_dist):
                 # 1. manually inflate mesh at first
-                inflated_mesh = Mesh(inflation.pymesh_inflation(self.py_mesh, _dist))
+                inflated_mesh = self._derived_mesh(
+                    "inflate",
+                    lambda: inflation.pymesh_inflation(self.py_mesh, _dist),
+                    distance=float(_dist),
+                )
                 # 2. compute all data by sample_boundary with `inflation_dist=None`
                 data_dict = inflated_mesh.sample_boundary(
                     _n,
@@ -352,6 +359,10 @@ class Mesh(geometry.Geometry):
                 raise ValueError(
                     "Can't sample evenly on mesh now, please set evenly=False."
                 )
+            if sampler.is_parallel(n, random, evenly):
+                return sampler.parallel_sample(
+                    self.sample_boundary, n, random, criteria, evenly
+                )
             _size, _ntry, _nsuc = 0, 0, 0
             all_points = []
             all_normal = []
@@ -395,16 +406,27 @@ class Mesh(geometry.Geometry):
         return {**x_dict, **normal_dict, **area_dict}
 
     def random_points(self, n, random="pseudo", criteria=None):
+        # draw candidates only from voxels intersecting with mesh, and test whether
+        # candidates are inside mesh exactly only for voxels intersected by surface
+        if self.occupancy_grid is None:
+            self.occupancy_grid = build_occupancy_grid(self.bounds, self.pysdf)
+        voxel_corners, voxel_on_boundary, voxel_size = self.occupancy_grid
+
+        if isinstance(random, str) and random != "pseudo":
+            # stream one sequence across rounds rather than redraw its leading points
+            random = sampler.QuasiRandomEngine(random, scramble=False)
+
         _size = 0
         all_points = []
-        cuboid = geometry_3d.Cuboid(
-            [bound[0] for bound in self.bounds],
-            [bound[1] for bound in self.bounds],
-        )
         _nsample, _nvalid = 0, 0
         while _size < n:
-            random_points = cuboid.random_points(n, random)
-            valid_mask = self.is_inside(random_points)
+            random_points, voxel_index = sample_in_voxels(
+                voxel_corners, voxel_size, n, random
+            )
+            random_points = random_points.astype(paddle.get_default_dtype())
+            valid_mask = ~voxel_on_boundary[voxel_index]
+            boundary_mask = ~valid_mask
+            valid_mask[boundary_mask] = self.is_inside(random_points[boundary_mask])
 
             if criteria:
                 valid_mask &= criteria(
@@ -421,8 +443,9 @@ class Mesh(geometry.Geometry):
             _nsample += n
 
         all_points = np.concatenate(all_points, axis=0)
-        cuboid_volume = np.prod([b[1] - b[0] for b in self.bounds])
-        all_areas = np.full((n, 1), cuboid_volume * (_nvalid / _nsample) / n)
+        # candidates are uniformly distributed in voxels which cover the whole mesh
+        voxel_volume = len(voxel_corners) * voxel_size**self.ndim
+        all_areas = np.full((n, 1), voxel_volume * (_nvalid / _nsample) / n)
         return all_points, all_areas
 
     def sample_interior(self, n, random="pseudo", criteria=None, evenly=False):
@@ -432,6 +455,13 @@ class Mesh(geometry.Geometry):
             raise NotImplementedError(
                 "uniformly sample for interior in mesh is not support yet"
             )
+        if sampler.is_parallel(n, random, evenly):
+            # build occupancy grid once before forking workers
+            if self.occupancy_grid is None:
+                self.occupancy_grid = build_occupancy_grid(self.bounds, self.pysdf)
+            return sampler.parallel_sample(
+                self.sample_interior, n, random, criteria, evenly
+            )
         points, areas = self.random_points(n, random, criteria)
 
         x_dict = misc.convert_to_dict(points, self.dim_keys)
@@ -451,10 +481,13 @@ class Mesh(geometry.Geometry):
             )
         import pymesh
 
-        csg = pymesh.CSGTree(
-            {"union": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+        return self._derived_mesh(
+            "union",
+            lambda: pymesh.CSGTree(
+                {"union": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+            ).mesh,
+            other,
         )
-        return Mesh(csg.mesh)
 
     def __or__(self, other: "Mesh"):
         return self.union(other)
@@ -470,10 +503,13 @@ class Mesh(geometry.Geometry):
             )
         import pymesh
 
-        csg = pymesh.CSGTree(
-            {"difference": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+        return self._derived_mesh(
+            "difference",
+            lambda: pymesh.CSGTree(
+                {"difference": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+            ).mesh,
+            other,
         )
-        return Mesh(csg.mesh)
 
     def __sub__(self, other: "Mesh"):
         return self.difference(other)
@@ -486,10 +522,13 @@ class Mesh(geometry.Geometry):
             )
         import pymesh
 
-        csg = pymesh.CSGTree(
-            {"intersection": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+        return self._derived_mesh(
+            "intersection",
+            lambda: pymesh.CSGTree(
+                {"intersection": [{"mesh": self.py_mesh}, {"mesh": other.py_mesh}]}
+            ).mesh,
+            other,
         )
-        return Mesh(csg.mesh)
 
     def __and__(self, other: "Mesh"):
         return self.intersection(other)
@@ -541,6 +580,48 @@ def area_of_triangles(v0, v1, v2):
     return area
 
 
+def build_occupancy_grid(
+    bounds: Tuple[Tuple[float, float], ...],
+    sdf_func: Callable,
+    resolution: int = 64,
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Build occupancy grid which divides bounding box into cubic voxels and keeps
+    voxels inside or intersected by surface, according to signed distance at center of
+    each voxel. A voxel whose distance to surface at center is not greater than half
+    of its diagonal is regarded as intersected by surface. Size of voxel is determined
+    by volume of bounding box, so that slender geometry is divided finely as well.
+
+    Args:
+        bounds (Tuple[Tuple[float, float], ...]): Lower and upper bound of each axis.
+        sdf_func (Callable): Signed distance function which takes points with shape of
+            [N, ndim] and returns distances with shape of [N, ], positive inside.
+        resolution (int, optional): Resolution of grid, which contains about
+            resolution ** ndim voxels. Defaults to 64.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: Lower corner of kept voxels with shape
+            of [M, ndim], whether kept voxels are intersected by surface with shape of
+            [M, ] and edge length of voxel.
+    """
+    lower = np.array([bound[0] for bound in bounds], dtype="float64")
+    upper = np.array([bound[1] for bound in bounds], dtype="float64")
+    ndim = len(bounds)
+    # avoid zero volume for flat geometry
+    extent = np.maximum(upper - lower, (upper - lower).max() / resolution)
+    voxel_size = float((np.prod(extent) / resolution**ndim) ** (1 / ndim))
+    grid_shape = np.maximum(np.ceil((upper - lower) / voxel_size), 1).astype("int64")
+    voxel_index = np.stack(
+        np.meshgrid(*[np.arange(num) for num in grid_shape], indexing="ij"), axis=-1
+    ).reshape([-1, ndim])
+    voxel_corners = lower + voxel_index * voxel_size
+
+    sdf = np.asarray(sdf_func(voxel_corners + voxel_size / 2)).reshape([-1])
+    half_diagonal = np.sqrt(ndim) / 2 * voxel_size
+    on_boundary = np.abs(sdf) <= half_diagonal
+    kept = on_boundary | (sdf > 0)
+    return voxel_corners[kept], on_boundary[kept], voxel_size
+
+
 def sample_in_triangle(v0, v1, v2, n, random="pseudo", criteria=None):
     """
     Uniformly sample n points in an 3D triangle defined by 3 vertices v0, v1, v2
@@ -586,3 +667,84 @@ def sample_in_triangle(v0, v1, v2, n, random="pseudo", criteria=None):
     zs = np.concatenate(zs, axis=0)
 
     return np.stack([xs, ys, zs], axis=1)
+
+
+def sample_in_voxels(
+    voxel_corners: np.ndarray,
+    voxel_size: float,
+    n: int,
+    random: Union[Literal["pseudo"], sampler.QuasiRandomEngine] = "pseudo",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniformly sample n points in cubic voxels of the same size.
+
+    For quasi-random engine, every point is mapped from one (ndim + 1)-dimensional
+    sample, whose first coordinate selects voxel and the others locate the point in
+    voxel, so that points are evenly spread over voxels as well as inside them.
+
+    Args:
+        voxel_corners (np.ndarray): Lower corner of voxels with shape of [N, ndim].
+        voxel_size (float): Edge length of voxels.
+        n (int): Number of points to be sampled.
+        random (Union[Literal["pseudo"], sampler.QuasiRandomEngine], optional):
+            Random method, quasi-random sequence is continued across calls. Defaults
+            to "pseudo".
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Coordinates of sampled points with shape of
+            [n, ndim] and index of voxel each point belongs to with shape of [n, ].
+    """
+    num_voxels, ndim = voxel_corners.shape
+    if isinstance(random, sampler.QuasiRandomEngine):
+        r = random.random(n, ndim + 1)
+        if random.method == "Hammersley":
+            # Hammersley set is not streamed, shift it randomly to avoid repeating
+            r = np.mod(r + np.random.rand(ndim + 1), 1.0)
+        voxel_index = np.minimum((r[:, 0] * num_voxels).astype("int64"), num_voxels - 1)
+        offset = r[:, 1:]
+    else:
+        voxel_index = np.random.randint(0, num_voxels, n)
+        offset = sampler.sample(n, ndim, random)
+    return voxel_corners[voxel_index] + offset * voxel_size, voxel_index
+
+
+def sample_in_triangles(
+    v0: np.ndarray,
+    v1: np.ndarray,
+    v2: np.ndarray,
+    n: int,
+    random: str = "pseudo",
+    triangle_areas: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniformly sample n points on the surface formed by triangles in batch, i.e.
+    draw the triangle of every point with probability proportional to its area, then
+    sample in the triangle with barycentric coordinates.
+
+    Args:
+        v0 (np.ndarray): Coordinates of the first vertex of triangles with shape of [N, 3].
+        v1 (np.ndarray): Coordinates of the second vertex of triangles with shape of [N, 3].
+        v2 (np.ndarray): Coordinates of the third vertex of triangles with shape of [N, 3].
+        n (int): Number of points to be sampled.
+        random (str, optional): Random method. Defaults to "pseudo".
+        triangle_areas (Optional[np.ndarray]): Precomputed area of each triangle
+            with shape of [N, ]. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Coordinates of sampled points with shape of
+            [n, 3] and ascending index of triangle each point belongs to with shape of
+            [n, ].
+    """
+    if triangle_areas is None:
+        triangle_areas = area_of_triangles(v0, v1, v2)
+    triangle_prob = triangle_areas / triangle_areas.sum()
+    # sort to group points by triangle as sampling triangle one by one does
+    triangle_index = np.sort(np.random.choice(len(triangle_prob), n, p=triangle_prob))
+
+    r = sampler.sample(n, 2, random)
+    s1 = np.sqrt(r[:, 0:1])
+    r2 = r[:, 1:2]
+    points = (
+        v0[triangle_index] * (1.0 - s1)
+        + v1[triangle_index] * ((1.0 - r2) * s1)
+        + v2[triangle_index] * (r2 * s1)
+    )
+    return points.astype(paddle.get_default_dtype()), triangle_index
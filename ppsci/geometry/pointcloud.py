@@ -13,18 +13,26 @@
 # limitations under the License.
 
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
 import numpy as np
+from scipy import spatial
 
 from ppsci.geometry import geometry
+from ppsci.utils import cache
 from ppsci.utils import misc
 
 
 class PointCloud(geometry.Geometry):
     """Class for point cloud geometry, i.e. a set of points from given file or array.
 
+    Interior and boundary points are indexed by KD-trees, so that membership,
+    nearest-neighbor and radius queries cost O(log M) per point with memory
+    independent of number of points M. Trees are rebuilt lazily after `translate`
+    and `scale`.
+
     Args:
         interior (Dict[str, np.ndarray]): Filepath or dict data, which store interior points of a point cloud, such as {"x": np.ndarray, "y": np.ndarray}.
         coord_keys (Tuple[str, ...]): Tuple of coordinate keys, such as ("x", "y").
@@ -66,6 +74,12 @@ class PointCloud(geometry.Geometry):
                     f"to normal's shape({self.normal.shape})"
                 )
 
+        # spatial indices of points, which are reset after transformation
+        self._interior_tree = spatial.cKDTree(self.interior)
+        self._boundary_tree = None
+        if self.boundary is not None:
+            self._boundary_tree = spatial.cKDTree(self.boundary)
+
         self.input_keys = coord_keys
         super().__init__(
             len(coord_keys),
@@ -77,43 +91,116 @@ class PointCloud(geometry.Geometry):
     def dim_keys(self):
         return self.input_keys
 
+    @property
+    def content_hash(self) -> str:
+        """Hash of points, used to fingerprint point cloud instead of its KD-trees."""
+        arrays = [self.interior]
+        if self.boundary is not None:
+            arrays.append(self.boundary)
+        if self.normal is not None:
+            arrays.append(self.normal)
+        return cache.hash_content(
+            *arrays,
+            keys=self.input_keys,
+            boundary=self.boundary is not None,
+            normal=self.normal is not None,
+        )
+
+    @property
+    def interior_tree(self) -> spatial.cKDTree:
+        """KD-tree of interior points."""
+        if self._interior_tree is None:
+            self._interior_tree = spatial.cKDTree(self.interior)
+        return self._interior_tree
+
+    @property
+    def boundary_tree(self) -> spatial.cKDTree:
+        """KD-tree of boundary points."""
+        if self.boundary is None:
+            raise ValueError("boundary points of PointCloud are not given.")
+        if self._boundary_tree is None:
+            self._boundary_tree = spatial.cKDTree(self.boundary)
+        return self._boundary_tree
+
+    def query_nearest(
+        self, x: np.ndarray, k: int = 1, boundary: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find k nearest points of given points.
+
+        Args:
+            x (np.ndarray): Query points with shape of [N, ndim].
+            k (int, optional): Number of nearest points. Defaults to 1.
+            boundary (bool, optional): Whether search in boundary points rather than
+                interior points. Defaults to False.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Euclidean distances and indices of nearest
+                points, both with shape of [N] if k is 1, otherwise [N, k].
+
+        Examples:
+            >>> import numpy as np
+            >>> import ppsci
+            >>> geom = ppsci.geometry.PointCloud(
+            ...     {"x": np.array([[0.0], [1.0], [2.0]])}, ("x",)
+            ... )
+            >>> dist, index = geom.query_nearest(np.array([[0.9], [2.5]]))
+            >>> index.tolist()
+            [1, 2]
+        """
+        tree = self.boundary_tree if boundary else self.interior_tree
+        return tree.query(x, k)
+
+    def query_radius(
+        self, x: np.ndarray, radius: float, boundary: bool = False
+    ) -> List[List[int]]:
+        """Find indices of points within given radius of given points.
+
+        Args:
+            x (np.ndarray): Query points with shape of [N, ndim].
+            radius (float): Euclidean radius.
+            boundary (bool, optional): Whether search in boundary points rather than
+                interior points. Defaults to False.
+
+        Returns:
+            List[List[int]]: Indices of points within radius of each query point.
+        """
+        tree = self.boundary_tree if boundary else self.interior_tree
+        return tree.query_ball_point(x, radius)
+
+    @staticmethod
+    def _contains(tree: spatial.cKDTree, x: np.ndarray) -> np.ndarray:
+        """Whether each point coincides with a point in tree, i.e. all coordinates are
+        close within 1e-6."""
+        dist, _ = tree.query(x, p=np.inf)
+        return dist <= 1e-6
+
     def is_inside(self, x):
         # NOTE: point on boundary is included
-        return (
-            np.isclose((x[:, None, :] - self.interior[None, :, :]), 0, atol=1e-6)
-            .all(axis=2)
-            .any(axis=1)
-        )
+        return self._contains(self.interior_tree, x)
 
     def on_boundary(self, x):
-        if not self.boundary:
+        if self.boundary is None:
             raise ValueError(
                 "self.boundary must be initialized" " when call 'on_boundary' function"
             )
-        return (
-            np.isclose(
-                (x[:, None, :] - self.boundary[None, :, :]),
-                0,
-                atol=1e-6,
-            )
-            .all(axis=2)
-            .any(axis=1)
-        )
+        return self._contains(self.boundary_tree, x)
 
     def translate(self, translation):
         for i, offset in enumerate(translation):
             self.interior[:, i] += offset
-            if self.boundary:
-                self.boundary += offset
+            if self.boundary is not None:
+                self.boundary[:, i] += offset
+        self._interior_tree = self._boundary_tree = None
         return self
 
     def scale(self, scale):
         for i, _scale in enumerate(scale):
             self.interior[:, i] *= _scale
-            if self.boundary:
+            if self.boundary is not None:
                 self.boundary[:, i] *= _scale
-            if self.normal:
+            if self.normal is not None:
                 self.normal[:, i] *= _scale
+        self._interior_tree = self._boundary_tree = None
         return self
 
     def uniform_boundary_points(self, n: int):
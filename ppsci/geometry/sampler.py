@@ -16,14 +16,35 @@
 Code below is heavily based on [https://github.com/lululxvi/deepxde](https://github.com/lululxvi/deepxde)
 """
 
+import functools
+import gc
+import multiprocessing
+import random as pyrandom
+import traceback
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
 import numpy as np
 import paddle
-import skopt
 from typing_extensions import Literal
 
+# maximum number of candidates drawn in one round of rejection sampling
+MAX_DRAW = 1 << 18
+# minimum number of points sampled by each worker of parallel sampling
+MIN_POINTS_PER_WORKER = 1 << 14
+
+# number of processes used by sampling methods of geometries, see `set_num_workers`
+_num_workers = 1
+
 
 def sample(
-    n_samples: int, ndim: int, method: Literal["pseudo", "LHS"] = "pseudo"
+    n_samples: int,
+    ndim: int,
+    method: Union[Literal["pseudo", "LHS"], "QuasiRandomEngine"] = "pseudo",
 ) -> np.ndarray:
     """Generate pseudorandom or quasirandom samples in [0, 1]^ndim.
 
@@ -32,13 +53,16 @@ def sample(
         ndim (int): Number of dimension.
         method (str): One of the following: "pseudo" (pseudorandom), "LHS" (Latin
             hypercube sampling), "Halton" (Halton sequence), "Hammersley" (Hammersley
-            sequence), or "Sobol" (Sobol sequence).
+            sequence), "Sobol" (Sobol sequence), or "Kronecker" (Kronecker sequence),
+            or a `QuasiRandomEngine`, whose sequence is continued.
     Returns:
         np.ndarray: Generated random samples with shape of [n_samples, ndim].
     """
+    if isinstance(method, QuasiRandomEngine):
+        return method.random(n_samples, ndim)
     if method == "pseudo":
         return pseudorandom(n_samples, ndim)
-    if method in ["LHS", "Halton", "Hammersley", "Sobol"]:
+    if method in ["LHS", "Halton", "Hammersley", "Sobol", "Kronecker"]:
         return quasirandom(n_samples, ndim, method)
     raise ValueError(f"Sampling method({method}) is not available.")
 
@@ -62,28 +86,530 @@ def quasirandom(
     # - Boundary points such as [..., 0, ...]
     # - Special points [0, 0, 0, ...] and [0.5, 0.5, 0.5, ...], which cause error in
     #   Hypersphere.random_points() and Hypersphere.random_boundary_points()
-    skip = 0
-    if method == "LHS":
-        sampler = skopt.sampler.Lhs()
-    elif method == "Halton":
+    engine = QuasiRandomEngine(method, scramble=False)
+    if method == "Halton":
         # 1st point: [0, 0, ...]
-        sampler = skopt.sampler.Halton(min_skip=1, max_skip=1)
+        engine.fast_forward(1, ndim)
     elif method == "Hammersley":
         # 1st point: [0, 0, ...]
         if ndim == 1:
-            sampler = skopt.sampler.Hammersly(min_skip=1, max_skip=1)
+            engine.fast_forward(1, ndim)
         else:
-            sampler = skopt.sampler.Hammersly()
-            skip = 1
+            return engine.random(n_samples + 1, ndim)[1:]
     elif method == "Sobol":
         # 1st point: [0, 0, ...], 2nd point: [0.5, 0.5, ...]
-        sampler = skopt.sampler.Sobol(randomize=False)
-        if ndim < 3:
-            skip = 1
+        engine.fast_forward(1 if ndim < 3 else 2, ndim)
+    return engine.random(n_samples, ndim)
+
+
+_SOBOL_INIT = (
+    (3, (1,)), (7, (1, 1)), (11, (1, 3, 7)), (13, (1, 1, 5)), (19, (1, 3, 1, 1)),
+    (25, (1, 1, 3, 7)), (37, (1, 3, 3, 9, 9)), (59, (1, 3, 7, 13, 3)),
+    (47, (1, 1, 5, 11, 27)), (61, (1, 3, 5, 1, 15)), (55, (1, 1, 7, 3, 29)),
+    (41, (1, 3, 7, 7, 21)), (67, (1, 1, 1, 9, 23, 37)), (97, (1, 3, 3, 5, 19, 33)),
+    (91, (1, 1, 3, 13, 11, 7)), (109, (1, 1, 7, 13, 25, 5)),
+    (103, (1, 3, 5, 11, 7, 11)), (115, (1, 1, 1, 3, 13, 39)),
+    (131, (1, 3, 1, 15, 17, 63, 13)), (193, (1, 1, 5, 5, 1, 27, 33)),
+    (137, (1, 3, 3, 3, 25, 17, 115)), (145, (1, 1, 3, 15, 29, 15, 41)),
+    (143, (1, 3, 1, 7, 3, 23, 79)), (241, (1, 3, 7, 9, 31, 29, 17)),
+    (157, (1, 1, 5, 13, 11, 3, 29)), (185, (1, 3, 1, 9, 5, 21, 119)),
+    (167, (1, 1, 3, 1, 23, 13, 75)), (229, (1, 3, 3, 11, 27, 31, 73)),
+    (171, (1, 1, 7, 7, 19, 25, 105)), (213, (1, 3, 5, 5, 21, 9, 7)),
+    (191, (1, 1, 1, 15, 5, 49, 59)), (253, (1, 1, 1, 1, 1, 33, 65)),
+    (203, (1, 3, 5, 15, 17, 19, 21)), (211, (1, 1, 7, 11, 13, 29, 3)),
+    (239, (1, 3, 7, 5, 7, 11, 113)), (247, (1, 1, 5, 3, 15, 19, 61)),
+    (285, (1, 3, 1, 1, 9, 27, 89, 7)), (369, (1, 1, 3, 7, 31, 15, 45, 23)),
+    (299, (1, 3, 3, 9, 9, 25, 107, 39)),
+)  # fmt: skip
+# number of bits of Sobol sequence, i.e. at most 2^32 points can be generated
+_SOBOL_BITS = 32
+
+
+@functools.lru_cache(maxsize=None)
+def _sobol_direction_numbers(ndim: int) -> np.ndarray:
+    """Direction numbers of Sobol sequence with shape of [ndim, _SOBOL_BITS], scaled
+    to 32-bit fraction."""
+    if not 1 <= ndim <= len(_SOBOL_INIT) + 1:
+        raise ValueError(
+            f"ndim({ndim}) of Sobol sequence should be in [1, {len(_SOBOL_INIT) + 1}]"
+        )
+    v = np.ones([ndim, _SOBOL_BITS], dtype="uint64")
+    for i, (poly, init) in enumerate(_SOBOL_INIT[: ndim - 1], start=1):
+        degree = len(init)
+        v[i, :degree] = init
+        # coefficients of primitive polynomial except the leading one
+        coefs = [(poly >> (degree - k)) & 1 for k in range(1, degree + 1)]
+        for j in range(degree, _SOBOL_BITS):
+            new_v = v[i, j - degree]
+            for k in range(1, degree + 1):
+                if coefs[k - 1]:
+                    new_v ^= v[i, j - k] << np.uint64(k)
+            v[i, j] = new_v
+    v <<= np.arange(_SOBOL_BITS - 1, -1, -1, dtype="uint64")
+    return v.astype("uint32")
+
+
+def _reverse_bits(x: np.ndarray) -> np.ndarray:
+    """Reverse bits of uint32 array."""
+    x = ((x >> 1) & np.uint32(0x55555555)) | ((x & np.uint32(0x55555555)) << 1)
+    x = ((x >> 2) & np.uint32(0x33333333)) | ((x & np.uint32(0x33333333)) << 2)
+    x = ((x >> 4) & np.uint32(0x0F0F0F0F)) | ((x & np.uint32(0x0F0F0F0F)) << 4)
+    x = ((x >> 8) & np.uint32(0x00FF00FF)) | ((x & np.uint32(0x00FF00FF)) << 8)
+    return (x >> 16) | (x << 16)
+
+
+def _owen_scramble(x: np.ndarray, seed: np.ndarray) -> np.ndarray:
+    """Nested uniform(Owen) scrambling of 32-bit fractions by hashing, ref: Brent
+    Burley, Practical Hash-based Owen Scrambling, JCGT 9(4), 2020.
+
+    Each bit of reversed fraction is flipped by a hash of lower bits only, i.e.
+    every digit is permuted depending on all preceding digits.
+    """
+    x = _reverse_bits(x)
+    x ^= x * np.uint32(0x3D20ADEA)
+    x += seed
+    x *= (seed >> 16) | np.uint32(1)
+    x ^= x * np.uint32(0x05526C56)
+    x ^= x * np.uint32(0x53A22864)
+    return _reverse_bits(x)
+
+
+@functools.lru_cache(maxsize=None)
+def _primes(num: int) -> np.ndarray:
+    """First num prime numbers."""
+    primes = []
+    candidate = 2
+    while len(primes) < num:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return np.array(primes, dtype="int64")
+
+
+class QuasiRandomEngine:
+    """Vectorized quasi-random engine, which generates Sobol, Halton, Hammersley,
+    Kronecker or Latin hypercube samples in [0, 1]^ndim.
+
+    Kronecker sequence is the R_d sequence, i.e. x_i = frac(0.5 + i * alpha) with
+    alpha_j = phi_d^-j, where phi_d is the generalized golden ratio, which costs O(n)
+    time and memory in any dimension, so it is used for evenly spaced points of
+    high-dimensional geometries.
+
+    Sobol, Halton and Kronecker sequences are streamed, i.e. successive calls of `random` with
+    the same ndim continue the sequence rather than regenerate it from scratch, and
+    can be resumed from any offset by `fast_forward`. Hammersley set depends on its
+    size(except for 1D, which is van der Corput sequence) and a new Latin hypercube
+    design is drawn on every call, so they are not streamed.
+
+    Engine can be passed as `random` argument of `Geometry.random_points` and
+    `Geometry.sample_interior`, etc., in place of method name.
+
+    Args:
+        method (Literal["Sobol", "Halton", "Hammersley", "Kronecker", "LHS"], optional):
+            Sampling method. Defaults to "Sobol".
+        scramble (bool, optional): Whether to randomize the sequence, i.e. nested
+            uniform(Owen) scrambling for Sobol, random digit permutation for Halton
+            and Hammersley and random shift for Kronecker. Defaults to True.
+        seed (Optional[int]): Random seed for scrambling and LHS. Defaults to None,
+            which means seed is drawn from numpy's global random generator.
+
+    Examples:
+        >>> from ppsci.geometry import sampler
+        >>> engine = sampler.QuasiRandomEngine("Sobol", seed=42)
+        >>> x1 = engine.random(4, 2)
+        >>> x2 = engine.random(4, 2)  # continue the sequence
+        >>> engine.reset().fast_forward(4, 2).random(4, 2).tolist() == x2.tolist()
+        True
+    """
+
+    def __init__(
+        self,
+        method: Literal["Sobol", "Halton", "Hammersley", "Kronecker", "LHS"] = "Sobol",
+        scramble: bool = True,
+        seed: Optional[int] = None,
+    ):
+        if method not in ("Sobol", "Halton", "Hammersley", "Kronecker", "LHS"):
+            raise ValueError(f"Quasi random method({method}) is not available.")
+        self.method = method
+        self.scramble = scramble
+        self.seed = int(np.random.randint(2**31)) if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+        # number of points generated for each dimension
+        self.offsets: Dict[int, int] = {}
+
+    def reset(self) -> "QuasiRandomEngine":
+        """Reset engine to the initial state.
+
+        Returns:
+            QuasiRandomEngine: Engine itself.
+        """
+        self.rng = np.random.default_rng(self.seed)
+        self.offsets.clear()
+        return self
+
+    def fast_forward(self, n: int, ndim: int) -> "QuasiRandomEngine":
+        """Skip next n points of ndim-dimensional sequence.
+
+        Args:
+            n (int): Number of points to be skipped.
+            ndim (int): Number of dimension.
+
+        Returns:
+            QuasiRandomEngine: Engine itself.
+        """
+        self.offsets[ndim] = self.offsets.get(ndim, 0) + n
+        return self
+
+    def _coordinate_seeds(self, ndim: int) -> np.ndarray:
+        """Scrambling seed of each coordinate, independent of ndim."""
+        return np.array(
+            [
+                np.random.default_rng((self.seed, j)).integers(2**32)
+                for j in range(ndim)
+            ],
+            dtype="uint32",
+        )
+
+    def _sobol(self, start: int, n: int, ndim: int) -> np.ndarray:
+        if start + n > 2**_SOBOL_BITS:
+            raise ValueError(f"At most 2^{_SOBOL_BITS} Sobol points can be generated")
+        v = _sobol_direction_numbers(ndim)
+        index = np.arange(start, start + n, dtype="uint64")
+        gray = index ^ (index >> np.uint64(1))
+        x = np.zeros([n, ndim], dtype="uint32")
+        for bit in range(int(start + n - 1).bit_length()):
+            bit_mask = ((gray >> np.uint64(bit)) & np.uint64(1)).astype("uint32")
+            x ^= bit_mask[:, None] * v[:, bit]
+        if self.scramble:
+            x = _owen_scramble(x, self._coordinate_seeds(ndim))
+        return x * 2.0**-_SOBOL_BITS
+
+    def _radical_inverse(self, index: np.ndarray, ndim: int) -> np.ndarray:
+        """Radical inverse of index in first ndim prime bases, i.e. Halton sequence."""
+        x = np.zeros([len(index), ndim], dtype="float64")
+        for j, base in enumerate(_primes(ndim)):
+            digit_map = np.arange(base)
+            if self.scramble:
+                # permute non-zero digits, so that trailing zeros are kept
+                digit_map[1:] = np.random.default_rng((self.seed, j)).permutation(
+                    digit_map[1:]
+                )
+            remain = index.copy()
+            scale = 1.0 / base
+            while remain.any():
+                x[:, j] += digit_map[remain % base] * scale
+                remain //= base
+                scale /= base
+        return x
+
+    def _kronecker(self, start: int, n: int, ndim: int) -> np.ndarray:
+        # generalized golden ratio, i.e. positive root of x^(ndim + 1) = x + 1
+        phi = 2.0
+        for _ in range(64):
+            phi = (1.0 + phi) ** (1.0 / (ndim + 1))
+        alpha = np.mod(phi ** -np.arange(1, ndim + 1), 1.0)
+        shift = (
+            self._coordinate_seeds(ndim) * 2.0**-32
+            if self.scramble
+            else np.full(ndim, 0.5)
+        )
+        # start from 1st point, as 0th point is [0.5, 0.5, ...]
+        index = np.arange(start + 1, start + n + 1, dtype="float64")
+        return np.mod(shift + index[:, None] * alpha, 1.0)
+
+    def random(self, n: int, ndim: int) -> np.ndarray:
+        """Generate next n points of ndim-dimensional sequence.
+
+        Args:
+            n (int): Number of points.
+            ndim (int): Number of dimension.
+
+        Returns:
+            np.ndarray: Generated samples with shape of [n, ndim].
+        """
+        start = self.offsets.get(ndim, 0)
+        if self.method == "Sobol":
+            x = self._sobol(start, n, ndim)
+        elif self.method == "Kronecker":
+            x = self._kronecker(start, n, ndim)
+        elif self.method == "Halton" or (self.method == "Hammersley" and ndim == 1):
+            # 1D Hammersley set degenerates to van der Corput sequence
+            x = self._radical_inverse(np.arange(start, start + n), ndim)
+        elif self.method == "Hammersley":
+            x = np.empty([n, ndim], dtype="float64")
+            x[:, :-1] = self._radical_inverse(np.arange(n), ndim - 1)
+            x[:, -1] = np.arange(n) / n
         else:
-            skip = 2
-    space = [(0.0, 1.0)] * ndim
-    return np.asarray(
-        sampler.generate(space, n_samples + skip)[skip:],
-        dtype=paddle.get_default_dtype(),
+            # one random stratum of each dimension for every sample
+            strata = self.rng.random([n, ndim]).argsort(axis=0)
+            x = (strata + self.rng.random([n, ndim])) / n
+        if self.method != "LHS" and (self.method != "Hammersley" or ndim == 1):
+            self.offsets[ndim] = start + n
+        return x.astype(paddle.get_default_dtype())
+
+
+def rejection_sample(
+    sample_func: Callable[[int], np.ndarray],
+    n: int,
+    desc: str = "points",
+    max_trials: int = 1000,
+) -> np.ndarray:
+    """Collect n samples by rejection sampling, i.e. call `sample_func(m)` repeatedly,
+    which draws m candidates and returns accepted ones among them.
+
+    Only n candidates are drawn in the first round, then number of candidates in
+    later rounds is adjusted to remaining number of samples divided by running
+    acceptance ratio, so that sampling usually finishes within one or two rounds even
+    if most of candidates are rejected. Accepted samples are filled into a
+    preallocated buffer.
+
+    Args:
+        sample_func (Callable[[int], np.ndarray]): Function which takes number of
+            candidates and returns accepted samples with shape of [k, ...].
+        n (int): Number of samples.
+        desc (str, optional): Description of samples in error message.
+            Defaults to "points".
+        max_trials (int, optional): Raise error if no candidate is accepted after
+            given rounds or drawing `max_trials * n` candidates. Defaults to 1000.
+
+    Returns:
+        np.ndarray: Samples with shape of [n, ...].
+
+    Examples:
+        >>> import numpy as np
+        >>> from ppsci.geometry import sampler
+        >>> def sample_func(m):
+        ...     x = np.random.rand(m, 2)
+        ...     return x[x[:, 0] < 0.01]
+        >>> sampler.rejection_sample(sample_func, 100).shape
+        (100, 2)
+    """
+    x = None
+    _size, _ndraw, _naccept, _ntry = 0, 0, 0, 0
+    num_draw = n
+    while _size < n:
+        points = sample_func(num_draw)
+        _ndraw += num_draw
+        _naccept += len(points)
+        _ntry += 1
+
+        if len(points) > n - _size:
+            # keep random subset rather than leading ones, as candidates may be
+            # ordered, e.g. evenly spaced
+            points = points[
+                np.sort(np.random.choice(len(points), n - _size, replace=False))
+            ]
+        if x is None:
+            x = np.empty((n, *points.shape[1:]), dtype=paddle.get_default_dtype())
+        x[_size : _size + len(points)] = points
+        _size += len(points)
+
+        if _naccept == 0:
+            if _ntry >= max_trials or _ndraw >= max_trials * n:
+                raise ValueError(
+                    f"Sample {desc} failed, "
+                    "please check correctness of geometry and given criteria."
+                )
+            num_draw = min(num_draw * 2, max(MAX_DRAW, n))
+        else:
+            # over-draw by 10% to reduce probability of another round
+            num_draw = int(np.ceil((n - _size) * _ndraw / _naccept * 1.1))
+            num_draw = min(num_draw, max(MAX_DRAW, n - _size))
+    return x
+
+
+def set_num_workers(num_workers: int):
+    """Set number of processes used by `sample_interior`, `sample_boundary` and
+    `sample_initial_interior` of geometries, which is 1 by default, i.e. sampling in
+    main process. See `parallel_sample` for details.
+
+    Args:
+        num_workers (int): Number of processes.
+
+    Examples:
+        >>> from ppsci.geometry import sampler
+        >>> sampler.set_num_workers(4)
+        >>> sampler.get_num_workers()
+        4
+        >>> sampler.set_num_workers(1)
+    """
+    if num_workers < 1:
+        raise ValueError(f"num_workers({num_workers}) should be positive.")
+    global _num_workers
+    _num_workers = num_workers
+
+
+def get_num_workers() -> int:
+    """Get number of processes used by sampling methods of geometries.
+
+    Returns:
+        int: Number of processes.
+    """
+    return _num_workers
+
+
+def is_parallel(n: int, random: Any = "pseudo", evenly: bool = False) -> bool:
+    """Whether n points should be sampled in parallel by sampling methods of geometries.
+    Only pseudo random sampling is parallelized, as evenly spaced points, LHS and
+    quasi-random sequences depend on the total number of points, e.g. concatenated
+    LHS chunks are not a Latin hypercube.
+
+    Args:
+        n (int): Number of points.
+        random (Any, optional): Random method. Defaults to "pseudo".
+        evenly (bool, optional): Whether to sample evenly. Defaults to False.
+
+    Returns:
+        bool: Whether to sample in parallel.
+    """
+    return (
+        _num_workers > 1
+        and isinstance(n, int)
+        and n >= 2 * MIN_POINTS_PER_WORKER
+        and random == "pseudo"
+        and not evenly
     )
+
+
+def _sample_chunk(
+    sample_func: Callable[..., Dict[str, np.ndarray]],
+    n: int,
+    args: tuple,
+    kwargs: dict,
+    seed_seq: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    """Sample a chunk of points with global random generators seeded by seed_seq."""
+    global _num_workers
+    np.random.seed(seed_seq.generate_state(4))
+    pyrandom.seed(int(seed_seq.generate_state(1)[0]))
+    num_workers, _num_workers = _num_workers, 1
+    try:
+        return sample_func(n, *args, **kwargs)
+    finally:
+        _num_workers = num_workers
+
+
+def _work(sample_func, index, n, args, kwargs, seed_seq, result_queue):
+    try:
+        result = _sample_chunk(sample_func, n, args, kwargs, seed_seq)
+    except Exception:
+        # original error may not be picklable
+        result = RuntimeError(traceback.format_exc())
+    result_queue.put((index, result))
+
+
+def parallel_sample(
+    sample_func: Callable[..., Dict[str, np.ndarray]],
+    n: int,
+    *args,
+    num_workers: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """Sample n points by calling `sample_func(n_i, *args, **kwargs)` in forked
+    processes, where n is split into chunks n_i, and merge results into preallocated
+    arrays in order of chunks.
+
+    Each worker seeds numpy's and Python's global random generators by an independent
+    stream spawned from a seed drawn from numpy's global random generator of main
+    process, so points are reproducible given random seed and number of workers.
+    "area" of points, i.e. weights of points which sum to measure of geometry, are
+    rescaled by n_i / n. If fork is not supported by platform, chunks are sampled in
+    main process one by one with the same streams.
+
+    Args:
+        sample_func (Callable[..., Dict[str, np.ndarray]]): Sampling function whose
+            first argument is number of points, e.g. `geom.sample_interior`. It is
+            inherited by forked workers, so can be any callable, but its return value
+            should be picklable.
+        n (int): Number of points.
+        *args: Other positional arguments of `sample_func`.
+        num_workers (Optional[int]): Number of processes. Defaults to None, which means
+            number set by `set_num_workers`. Workers are reduced so that each samples
+            at least `MIN_POINTS_PER_WORKER` points.
+        **kwargs: Keyword arguments of `sample_func`.
+
+    Returns:
+        Dict[str, np.ndarray]: Sampled points.
+
+    Examples:
+        >>> import ppsci
+        >>> from ppsci.geometry import sampler
+        >>> rect = ppsci.geometry.Rectangle((0, 0), (1, 1))
+        >>> points = sampler.parallel_sample(rect.sample_interior, 100000, num_workers=2)
+        >>> points["x"].shape
+        (100000, 1)
+    """
+    num_workers = num_workers or _num_workers
+    num_workers = max(min(num_workers, n // MIN_POINTS_PER_WORKER), 1)
+    if num_workers == 1:
+        return sample_func(n, *args, **kwargs)
+
+    seed_seqs = np.random.SeedSequence(np.random.randint(2**31)).spawn(num_workers)
+    sizes = [n // num_workers + (i < n % num_workers) for i in range(num_workers)]
+    offsets = np.cumsum([0] + sizes)
+
+    results: List[Optional[Dict[str, np.ndarray]]] = [None] * num_workers
+    if "fork" not in multiprocessing.get_all_start_methods():
+        np_state, py_state = np.random.get_state(), pyrandom.getstate()
+        try:
+            for i in range(num_workers):
+                results[i] = _sample_chunk(
+                    sample_func, sizes[i], args, kwargs, seed_seqs[i]
+                )
+        finally:
+            np.random.set_state(np_state)
+            pyrandom.setstate(py_state)
+        chunks = enumerate(results)
+    else:
+        chunks = _fork_sample(sample_func, sizes, args, kwargs, seed_seqs)
+
+    output = {}
+    for i, chunk in chunks:
+        for key, value in chunk.items():
+            if key not in output:
+                output[key] = np.empty((n, *value.shape[1:]), value.dtype)
+            if key == "area":
+                value = value * (sizes[i] / n)
+            output[key][offsets[i] : offsets[i + 1]] = value
+    return output
+
+
+def _fork_sample(sample_func, sizes, args, kwargs, seed_seqs):
+    """Sample chunks in forked processes, yield (index, points) once a chunk is done."""
+    ctx = multiprocessing.get_context("fork")
+    result_queue = ctx.SimpleQueue()
+    processes = [
+        ctx.Process(
+            target=_work,
+            args=(sample_func, i, size, args, kwargs, seed_seqs[i], result_queue),
+            daemon=True,
+        )
+        for i, size in enumerate(sizes)
+    ]
+    try:
+        # disable garbage collection in workers forked from a multi-threaded
+        # process, see `ppsci.data.dataloader.BackgroundSampler`
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for process in processes:
+                process.start()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        for _ in processes:
+            # fetch before join, otherwise worker may be blocked on writing pipe
+            index, result = result_queue.get()
+            if isinstance(result, Exception):
+                raise result
+            yield index, result
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            # kill rather than terminate workers left on error, as SIGTERM handler
+            # installed by paddle may hang in worker
+            if process.pid is not None and process.exitcode is None:
+                process.kill()
+                process.join()
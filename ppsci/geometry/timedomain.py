@@ -29,6 +29,7 @@ from ppsci.geometry import geometry_2d
 from ppsci.geometry import geometry_3d
 from ppsci.geometry import geometry_nd
 from ppsci.geometry import mesh
+from ppsci.geometry import sampler
 from ppsci.utils import misc
 
 
@@ -151,12 +152,7 @@ class TimeXGeometry(geometry.Geometry):
                 )[:, None][::-1]
             else:
                 t = self.timedomain.timestamps[1:]
-        tx = []
-        for ti in t:
-            tx.append(
-                np.hstack((np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x))
-            )
-        tx = np.vstack(tx)
+        tx = misc.combine_array_with_time(x, t)
         if len(tx) > n:
             tx = tx[:n]
         return tx
@@ -176,42 +172,21 @@ class TimeXGeometry(geometry.Geometry):
             ]  # [nt, 1]
             # 1. sample nx points in static geometry with criteria
             nx = int(np.ceil(n / nt))
-            _size, _ntry, _nsuc = 0, 0, 0
-            x = np.empty(
-                shape=(nx, self.geometry.ndim), dtype=paddle.get_default_dtype()
-            )
-            while _size < nx:
-                _x = self.geometry.random_points(nx, random)
+
+            def sample_func(num_draw):
+                _x = self.geometry.random_points(num_draw, random)
                 if criteria is not None:
                     # fix arg 't' to None in criteria there
                     criteria_mask = criteria(
                         None, *np.split(_x, self.geometry.ndim, axis=1)
                     ).flatten()
                     _x = _x[criteria_mask]
-                if len(_x) > nx - _size:
-                    _x = _x[: nx - _size]
-                x[_size : _size + len(_x)] = _x
-
-                _size += len(_x)
-                _ntry += 1
-                if len(_x) > 0:
-                    _nsuc += 1
-
-                if _ntry >= 1000 and _nsuc == 0:
-                    raise ValueError(
-                        "Sample points failed, "
-                        "please check correctness of geometry and given criteria."
-                    )
+                return _x
+
+            x = sampler.rejection_sample(sample_func, nx, "points")
 
             # 2. repeat spatial points along time
-            tx = []
-            for ti in t:
-                tx.append(
-                    np.hstack(
-                        (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x)
-                    )
-                )
-            tx = np.vstack(tx)
+            tx = misc.combine_array_with_time(x, t)
             if len(tx) > n:
                 tx = tx[:n]
             return tx
@@ -220,41 +195,19 @@ class TimeXGeometry(geometry.Geometry):
             t = self.timedomain.timestamps[1:]
             nx = int(np.ceil(n / nt))
 
-            _size, _ntry, _nsuc = 0, 0, 0
-            x = np.empty(
-                shape=(nx, self.geometry.ndim), dtype=paddle.get_default_dtype()
-            )
-            while _size < nx:
-                _x = self.geometry.random_points(nx, random)
+            def sample_func(num_draw):
+                _x = self.geometry.random_points(num_draw, random)
                 if criteria is not None:
                     # fix arg 't' to None in criteria there
                     criteria_mask = criteria(
                         None, *np.split(_x, self.geometry.ndim, axis=1)
                     ).flatten()
                     _x = _x[criteria_mask]
-                if len(_x) > nx - _size:
-                    _x = _x[: nx - _size]
-                x[_size : _size + len(_x)] = _x
-
-                _size += len(_x)
-                _ntry += 1
-                if len(_x) > 0:
-                    _nsuc += 1
-
-                if _ntry >= 1000 and _nsuc == 0:
-                    raise ValueError(
-                        "Sample interior points failed, "
-                        "please check correctness of geometry and given creteria."
-                    )
+                return _x
 
-            tx = []
-            for ti in t:
-                tx.append(
-                    np.hstack(
-                        (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x)
-                    )
-                )
-            tx = np.vstack(tx)
+            x = sampler.rejection_sample(sample_func, nx, "interior points")
+
+            tx = misc.combine_array_with_time(x, t)
             if len(tx) > n:
                 tx = tx[:n]
             return tx
@@ -305,30 +258,17 @@ class TimeXGeometry(geometry.Geometry):
             nx = int((n * s / self.timedomain.diam) ** 0.5)
         nt = int(np.ceil(n / nx))
 
-        _size, _ntry, _nsuc = 0, 0, 0
-        x = np.empty(shape=(nx, self.geometry.ndim), dtype=paddle.get_default_dtype())
-        while _size < nx:
-            _x = self.geometry.uniform_boundary_points(nx)
+        def sample_func(num_draw):
+            _x = self.geometry.uniform_boundary_points(num_draw)
             if criteria is not None:
                 # fix arg 't' to None in criteria there
                 criteria_mask = criteria(
                     None, *np.split(_x, self.geometry.ndim, axis=1)
                 ).flatten()
                 _x = _x[criteria_mask]
-            if len(_x) > nx - _size:
-                _x = _x[: nx - _size]
-            x[_size : _size + len(_x)] = _x
-
-            _size += len(_x)
-            _ntry += 1
-            if len(_x) > 0:
-                _nsuc += 1
-
-            if _ntry >= 1000 and _nsuc == 0:
-                raise ValueError(
-                    "Sample boundary points failed, "
-                    "please check correctness of geometry and given creteria."
-                )
+            return _x
+
+        x = sampler.rejection_sample(sample_func, nx, "boundary points")
 
         nx = len(x)
         t = np.linspace(
@@ -338,12 +278,7 @@ class TimeXGeometry(geometry.Geometry):
             endpoint=False,
             dtype=paddle.get_default_dtype(),
         )[:, None][::-1]
-        tx = []
-        for ti in t:
-            tx.append(
-                np.hstack((np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x))
-            )
-        tx = np.vstack(tx)
+        tx = misc.combine_array_with_time(x, t)
         if len(tx) > n:
             tx = tx[:n]
         return tx
@@ -364,60 +299,23 @@ class TimeXGeometry(geometry.Geometry):
             if isinstance(self.geometry, mesh.Mesh):
                 x, _n, a = self.geometry.random_boundary_points(nx, random=random)
             else:
-                _size, _ntry, _nsuc = 0, 0, 0
-                x = np.empty(
-                    shape=(nx, self.geometry.ndim), dtype=paddle.get_default_dtype()
-                )
-                while _size < nx:
-                    _x = self.geometry.random_boundary_points(nx, random)
+
+                def sample_func(num_draw):
+                    _x = self.geometry.random_boundary_points(num_draw, random)
                     if criteria is not None:
                         # fix arg 't' to None in criteria there
                         criteria_mask = criteria(
                             None, *np.split(_x, self.geometry.ndim, axis=1)
                         ).flatten()
                         _x = _x[criteria_mask]
-                    if len(_x) > nx - _size:
-                        _x = _x[: nx - _size]
-                    x[_size : _size + len(_x)] = _x
-
-                    _size += len(_x)
-                    _ntry += 1
-                    if len(_x) > 0:
-                        _nsuc += 1
-
-                    if _ntry >= 1000 and _nsuc == 0:
-                        raise ValueError(
-                            "Sample boundary points failed, "
-                            "please check correctness of geometry and given creteria."
-                        )
-
-            t_x = []
-            if isinstance(self.geometry, mesh.Mesh):
-                t_normal = []
-                t_area = []
+                    return _x
 
-            for ti in t:
-                t_x.append(
-                    np.hstack(
-                        (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x)
-                    )
-                )
-                if isinstance(self.geometry, mesh.Mesh):
-                    t_normal.append(
-                        np.hstack(
-                            (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), _n)
-                        )
-                    )
-                    t_area.append(
-                        np.hstack(
-                            (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), a)
-                        )
-                    )
+                x = sampler.rejection_sample(sample_func, nx, "boundary points")
 
-            t_x = np.vstack(t_x)
+            t_x = misc.combine_array_with_time(x, t)
             if isinstance(self.geometry, mesh.Mesh):
-                t_normal = np.vstack(t_normal)
-                t_area = np.vstack(t_area)
+                t_normal = misc.combine_array_with_time(_n, t)
+                t_area = misc.combine_array_with_time(a, t)
 
             if len(t_x) > n:
                 t_x = t_x[:n]
@@ -438,60 +336,23 @@ class TimeXGeometry(geometry.Geometry):
             if isinstance(self.geometry, mesh.Mesh):
                 x, _n, a = self.geometry.random_boundary_points(nx, random=random)
             else:
-                _size, _ntry, _nsuc = 0, 0, 0
-                x = np.empty(
-                    shape=(nx, self.geometry.ndim), dtype=paddle.get_default_dtype()
-                )
-                while _size < nx:
-                    _x = self.geometry.random_boundary_points(nx, random)
+
+                def sample_func(num_draw):
+                    _x = self.geometry.random_boundary_points(num_draw, random)
                     if criteria is not None:
                         # fix arg 't' to None in criteria there
                         criteria_mask = criteria(
                             None, *np.split(_x, self.geometry.ndim, axis=1)
                         ).flatten()
                         _x = _x[criteria_mask]
-                    if len(_x) > nx - _size:
-                        _x = _x[: nx - _size]
-                    x[_size : _size + len(_x)] = _x
-
-                    _size += len(_x)
-                    _ntry += 1
-                    if len(_x) > 0:
-                        _nsuc += 1
-
-                    if _ntry >= 1000 and _nsuc == 0:
-                        raise ValueError(
-                            "Sample boundary points failed, "
-                            "please check correctness of geometry and given creteria."
-                        )
-
-            t_x = []
-            if isinstance(self.geometry, mesh.Mesh):
-                t_normal = []
-                t_area = []
+                    return _x
 
-            for ti in t:
-                t_x.append(
-                    np.hstack(
-                        (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), x)
-                    )
-                )
-                if isinstance(self.geometry, mesh.Mesh):
-                    t_normal.append(
-                        np.hstack(
-                            (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), _n)
-                        )
-                    )
-                    t_area.append(
-                        np.hstack(
-                            (np.full([nx, 1], ti, dtype=paddle.get_default_dtype()), a)
-                        )
-                    )
+                x = sampler.rejection_sample(sample_func, nx, "boundary points")
 
-            t_x = np.vstack(t_x)
+            t_x = misc.combine_array_with_time(x, t)
             if isinstance(self.geometry, mesh.Mesh):
-                t_normal = np.vstack(t_normal)
-                t_area = np.vstack(t_area)
+                t_normal = misc.combine_array_with_time(_n, t)
+                t_area = misc.combine_array_with_time(a, t)
 
             if len(t_x) > n:
                 t_x = t_x[:n]
@@ -542,32 +403,23 @@ class TimeXGeometry(geometry.Geometry):
         self, n: int, random: str = "pseudo", criteria=None, evenly=False
     ):
         """Sample random points in the time-geometry and return those meet criteria."""
-        x = np.empty(shape=(n, self.ndim), dtype=paddle.get_default_dtype())
-        _size, _ntry, _nsuc = 0, 0, 0
-        while _size < n:
+        if sampler.is_parallel(n, random, evenly):
+            return sampler.parallel_sample(
+                self.sample_initial_interior, n, random, criteria, evenly
+            )
+
+        def sample_func(num_draw):
             if evenly:
-                points = self.uniform_initial_points(n)
+                points = self.uniform_initial_points(num_draw)
             else:
-                points = self.random_initial_points(n, random)
+                points = self.random_initial_points(num_draw, random)
 
             if criteria is not None:
                 criteria_mask = criteria(*np.split(points, self.ndim, axis=1)).flatten()
                 points = points[criteria_mask]
+            return points
 
-            if len(points) > n - _size:
-                points = points[: n - _size]
-            x[_size : _size + len(points)] = points
-
-            _size += len(points)
-            _ntry += 1
-            if len(points) > 0:
-                _nsuc += 1
-
-            if _ntry >= 1000 and _nsuc == 0:
-                raise ValueError(
-                    "Sample initial interior points failed, "
-                    "please check correctness of geometry and given creteria."
-                )
+        x = sampler.rejection_sample(sample_func, n, "initial interior points")
         return misc.convert_to_dict(x, self.dim_keys)
 
     def __str__(self) -> str:
@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ppsci.solver import adaptive
 from ppsci.solver import eval
 from ppsci.solver import train
 from ppsci.solver import visu
 from ppsci.solver.solver import Solver
 
 __all__ = [
+    "adaptive",
     "eval",
     "train",
     "visu",
@@ -0,0 +1,255 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+import numpy as np
+import paddle
+from typing_extensions import Literal
+
+from ppsci.constraint import base as constraint_base
+from ppsci.geometry import sampler
+from ppsci.utils import misc
+
+if TYPE_CHECKING:
+    from ppsci import constraint
+    from ppsci import solver
+
+__all__ = ["RAR"]
+
+
+def _to_numpy(data_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Copy values of dict into numpy arrays."""
+    return {
+        key: value.numpy() if paddle.is_tensor(value) else np.array(value)
+        for key, value in data_dict.items()
+    }
+
+
+def _concat(*data_dicts: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Concatenate dicts with same keys along batch axis."""
+    return {
+        key: np.concatenate([data_dict[key] for data_dict in data_dicts])
+        for key in data_dicts[0]
+    }
+
+
+def _take(data_dict: Dict[str, np.ndarray], index: np.ndarray) -> Dict[str, np.ndarray]:
+    """Take samples of dict by index."""
+    return {key: value[index] for key, value in data_dict.items()}
+
+
+class RAR:
+    """Residual-based adaptive refinement(RAR) of collocation points of a constraint.
+
+    Every `freq` epochs, residual of constraint, i.e. absolute difference between its
+    output expressions and labels, is evaluated on `num_candidates` candidates
+    sampled from geometry of constraint, and `num_points` candidates with high
+    residual are appended to dataset of constraint, or replace points of lowest
+    residual in dataset.
+
+    Candidates are sampled and evaluated batch by batch, only selected ones are kept
+    during evaluation, so that large candidate pool fits in memory. Proportional
+    sampling draws candidates without replacement by weighted reservoir
+    sampling(Efraimidis and Spirakis, 2006), which is streamed as well.
+
+    Refinement is attached to Solver by `adaptive` argument, keyed by name of
+    constraint, which should support sampling(e.g. InteriorConstraint and
+    BoundaryConstraint without resampling). Candidates are always sampled randomly
+    even if points of constraint are sampled evenly, and quasi-random sequence of
+    candidates is randomly scrambled and continued across batches, so that no
+    candidate is drawn twice.
+
+    Args:
+        num_candidates (int): Number of candidates evaluated for each refinement.
+        num_points (int): Number of points added for each refinement.
+        freq (int, optional): Refine every `freq` epochs. Defaults to 1.
+        mode (Literal["append", "replace"], optional): Append new points to dataset,
+            or replace points of lowest residual in dataset with them, which keeps
+            size of dataset. Defaults to "append".
+        sampling (Literal["greedy", "proportional"], optional): Select candidates of
+            highest residual, or draw candidates with probability proportional to
+            residual^power. Defaults to "greedy".
+        power (float, optional): Power of residual for proportional sampling.
+            Defaults to 1.0.
+        batch_size (int, optional): Number of candidates sampled and evaluated at
+            once. Defaults to 8192.
+
+    Examples:
+        >>> import ppsci
+        >>> rar = ppsci.solver.adaptive.RAR(100000, 1000, freq=5)
+        >>> # solver = ppsci.solver.Solver(..., adaptive={"EQ": rar})
+    """
+
+    def __init__(
+        self,
+        num_candidates: int,
+        num_points: int,
+        freq: int = 1,
+        mode: Literal["append", "replace"] = "append",
+        sampling: Literal["greedy", "proportional"] = "greedy",
+        power: float = 1.0,
+        batch_size: int = 8192,
+    ):
+        if num_points > num_candidates:
+            raise ValueError(
+                f"num_points({num_points}) should not be greater than "
+                f"num_candidates({num_candidates})."
+            )
+        if mode not in ("append", "replace"):
+            raise ValueError(f"mode({mode}) should be 'append' or 'replace'.")
+        if sampling not in ("greedy", "proportional"):
+            raise ValueError(
+                f"sampling({sampling}) should be 'greedy' or 'proportional'."
+            )
+        self.num_candidates = num_candidates
+        self.num_points = num_points
+        self.freq = freq
+        self.mode = mode
+        self.sampling = sampling
+        self.power = power
+        self.batch_size = batch_size
+
+    def residual(
+        self,
+        solver: "solver.Solver",
+        _constraint: "constraint.Constraint",
+        input_dict: Dict[str, np.ndarray],
+        label_dict: Dict[str, np.ndarray],
+    ) -> np.ndarray:
+        """Compute residual of constraint on given points.
+
+        Args:
+            solver (solver.Solver): Solver.
+            _constraint (constraint.Constraint): Constraint.
+            input_dict (Dict[str, np.ndarray]): Input dict.
+            label_dict (Dict[str, np.ndarray]): Label dict.
+
+        Returns:
+            np.ndarray: Sum of absolute residuals of all labels with shape of [N].
+        """
+        expr_dict = {key: _constraint.output_expr[key] for key in label_dict}
+        # copy input as predict pads it in place for distributed prediction
+        pred_dict = solver.predict(
+            dict(input_dict), expr_dict, self.batch_size, no_grad=False
+        )
+        residual = 0
+        for key, label in label_dict.items():
+            residual += np.abs(pred_dict[key].numpy() - label).reshape([len(label), -1])
+        return residual.sum(axis=1)
+
+    @staticmethod
+    def _candidate_sample_func(
+        _constraint: "constraint.Constraint",
+    ) -> Callable[[int], Tuple[Dict[str, np.ndarray], ...]]:
+        """Function which samples different candidates on every call, rather than
+        evenly spaced points or leading points of quasi-random sequence, which are
+        the same for every call.
+        """
+        sample_func = _constraint.sample_func
+        if not isinstance(sample_func, constraint_base.GeometryDataSampler):
+            return sample_func
+        random = sample_func.random
+        if random in ("Sobol", "Halton", "Kronecker"):
+            # scrambled by seed drawn from global random generator, and streamed
+            random = sampler.QuasiRandomEngine(random)
+        elif isinstance(random, str) and random != "LHS":
+            # Hammersley set is the same for every call of the same size
+            random = "pseudo"
+        return functools.partial(sample_func, random=random)
+
+    def _score(self, residual: np.ndarray) -> np.ndarray:
+        """Score of points, points of largest scores are selected."""
+        if self.sampling == "greedy":
+            return residual
+        # key of weighted reservoir sampling, i.e. log(u^(1/w)) with u ~ U(0, 1)
+        weight = np.maximum(residual**self.power, np.finfo(residual.dtype).tiny)
+        return np.log(np.random.random(len(residual))) / weight
+
+    def refine(
+        self, solver: "solver.Solver", _constraint: "constraint.Constraint"
+    ) -> Dict[str, float]:
+        """Refine collocation points of constraint in place.
+
+        Args:
+            solver (solver.Solver): Solver.
+            _constraint (constraint.Constraint): Constraint to be refined.
+
+        Returns:
+            Dict[str, float]: Statistics of refinement, including mean residual of
+                candidates and selected points, and number of points in dataset.
+        """
+        if _constraint.sample_func is None or _constraint.resampler is not None:
+            raise ValueError(
+                f"{misc.typename(_constraint)}({_constraint.name}) doesn't support "
+                "sampling, or its points are resampled every epoch."
+            )
+
+        dataset = _constraint.data_loader.dataset
+        num_samples = len(next(iter(dataset.input.values())))
+        if self.mode == "replace" and self.num_points > num_samples:
+            raise ValueError(
+                f"num_points({self.num_points}) should not be greater than number of "
+                f"samples({num_samples}) of constraint({_constraint.name}) when mode "
+                "is 'replace'."
+            )
+
+        # keep num_points candidates of highest scores while streaming
+        sample_func = self._candidate_sample_func(_constraint)
+        score, residual, selected = np.empty([0]), np.empty([0]), None
+        residual_sum = 0.0
+        for st in range(0, self.num_candidates, self.batch_size):
+            num = min(self.batch_size, self.num_candidates - st)
+            batch = sample_func(num)
+            batch_residual = self.residual(solver, _constraint, batch[0], batch[1])
+            residual_sum += float(batch_residual.sum())
+
+            score = np.concatenate((score, self._score(batch_residual)))
+            residual = np.concatenate((residual, batch_residual))
+            selected = (
+                batch
+                if selected is None
+                else tuple(_concat(*pair) for pair in zip(selected, batch))
+            )
+            if len(score) > self.num_points:
+                index = np.argpartition(-score, self.num_points - 1)
+                index = np.sort(index[: self.num_points])
+                score, residual = score[index], residual[index]
+                selected = tuple(_take(data_dict, index) for data_dict in selected)
+
+        data = tuple(
+            _to_numpy(data_dict)
+            for data_dict in (dataset.input, dataset.label, dataset.weight)
+        )
+        if self.mode == "append":
+            data = tuple(_concat(*pair) for pair in zip(data, selected))
+        else:
+            # replace points of lowest residual
+            old_residual = self.residual(solver, _constraint, data[0], data[1])
+            index = np.argpartition(old_residual, self.num_points - 1)
+            index = index[: self.num_points]
+            for data_dict, new_dict in zip(data, selected):
+                for key, value in data_dict.items():
+                    value[index] = new_dict[key]
+        _constraint.update_dataset(*data)
+
+        return {
+            "candidate_residual": residual_sum / self.num_candidates,
+            "selected_residual": float(residual.mean()),
+            "num_samples": len(next(iter(data[0].values()))),
+        }
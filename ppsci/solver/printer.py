@@ -18,16 +18,50 @@ from __future__ import print_function
 
 import datetime
 
+import numpy as np
+import paddle
+
 from ppsci.utils import logger
 from ppsci.utils import misc
 
 
 def update_train_loss(trainer, loss_dict, batch_size):
-    # update_output_info
-    for key in loss_dict:
-        if key not in trainer.train_output_info:
-            trainer.train_output_info[key] = misc.AverageMeter(key, "7.5f")
-        trainer.train_output_info[key].update(float(loss_dict[key]), batch_size)
+    # losses of one iteration are stacked into one tensor and kept on device, which
+    # are merged into train_output_info by `flush_train_loss` when logging, so as to
+    # avoid kernels per loss and device-to-host synchronization every iteration
+    values = [
+        value.detach() if isinstance(value, paddle.Tensor) else paddle.to_tensor(value)
+        for value in loss_dict.values()
+    ]
+    dtype = values[0].dtype
+    losses = paddle.concat(
+        [
+            (value if value.dtype == dtype else value.astype(dtype)).reshape([1])
+            for value in values
+        ]
+    )
+    trainer.train_loss_buffer.append((tuple(loss_dict), losses, batch_size))
+
+
+def flush_train_loss(trainer):
+    # merge buffered losses into train_output_info with one device-to-host copy per
+    # group of iterations with the same loss keys, accumulated in float64 on host
+    groups = {}
+    for keys, losses, batch_size in trainer.train_loss_buffer:
+        group = groups.setdefault(keys, ([], []))
+        group[0].append(losses)
+        group[1].append(batch_size)
+    trainer.train_loss_buffer.clear()
+
+    for keys, (losses, batch_sizes) in groups.items():
+        batch_sizes = np.asarray(batch_sizes, "float64")
+        losses = paddle.stack(losses).numpy().astype("float64")
+        total_size = batch_sizes.sum()
+        loss_avgs = batch_sizes @ losses / total_size
+        for key, loss_avg in zip(keys, loss_avgs):
+            if key not in trainer.train_output_info:
+                trainer.train_output_info[key] = misc.AverageMeter(key, "7.5f")
+            trainer.train_output_info[key].update(float(loss_avg), total_size)
 
 
 def update_eval_loss(trainer, loss_dict, batch_size):
@@ -41,12 +75,12 @@ def update_eval_loss(trainer, loss_dict, batch_size):
 def log_train_info(trainer, batch_size, epoch_id, iter_id):
     lr_msg = f"lr: {trainer.optimizer.get_lr():.8f}"
 
-    metric_msg = ", ".join(
-        [
-            f"{key}: {trainer.train_output_info[key].avg:.5f}"
-            for key in trainer.train_output_info
-        ]
-    )
+    # fetch losses from device once per logging
+    flush_train_loss(trainer)
+    loss_avgs = {
+        key: trainer.train_output_info[key].avg for key in trainer.train_output_info
+    }
+    metric_msg = ", ".join([f"{key}: {loss_avgs[key]:.5f}" for key in loss_avgs])
 
     time_msg = ", ".join(
         [trainer.train_time_info[key].mean for key in trainer.train_time_info]
@@ -74,10 +108,10 @@ def log_train_info(trainer, batch_size, epoch_id, iter_id):
         wandb_writer=trainer.wandb_writer,
     )
 
-    for key in trainer.train_output_info:
+    for key in loss_avgs:
         logger.scaler(
             name=f"train_{key}",
-            value=trainer.train_output_info[key].avg,
+            value=loss_avgs[key],
             step=trainer.global_step,
             vdl_writer=trainer.vdl_writer,
             wandb_writer=trainer.wandb_writer,
@@ -18,10 +18,13 @@ import contextlib
 import itertools
 import os
 import sys
+import time
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import numpy as np
@@ -78,6 +81,31 @@ class Solver:
         eval_with_no_grad (bool, optional): Whether set `stop_gradient=True` for every Tensor if no differentiation
             involved during computation, generally for save GPU memory and accelerate computing. Defaults to False.
         to_static (bool, optional): Whether enable to_static for forward pass. Defaults to False.
+        plan_derivatives (bool, optional): Whether trace derivatives required by
+            constraints once and compute them with fewest backward passes during training.
+            Defaults to False.
+        batch_constraints (bool, optional): Whether concatenate inputs of constraints
+            and run model forward once per group rather than per constraint during
+            training, constraints requiring derivatives and those not are grouped
+            separately. It requires samples being computed independently by model.
+            Defaults to False.
+        compile_train_step (bool, optional): Experimental. Whether trace the whole
+            training step, including forward, backward and parameters update, into one
+            static program, which implies to_static. The step is always traced in
+            full-graph(AST) mode, as SOT mode(ENABLE_FALL_BACK=True) can not trace it,
+            and it is not necessarily faster than dynamic mode, so benchmark before use.
+            Not supported with AMP, update_freq > 1, distributed training or L-BFGS
+            optimizer, and requires paddlepaddle>=2.6. Defaults to False.
+        async_save (bool, optional): Whether write checkpoints on a background thread
+            after snapshotting states to host memory. Defaults to False.
+        keep_checkpoint_max (int, optional): Number of latest "epoch_N" checkpoints
+            kept on disk, 0 means keeping all. Defaults to 0.
+        num_prefetch (int, optional): Number of batches prepared in advance on a
+            background thread for every constraint, 0 means no prefetching.
+            Defaults to 0.
+        adaptive (Optional[Dict[str, ppsci.solver.adaptive.RAR]]): Adaptive refinement
+            of collocation points, keyed by name of constraint to be refined.
+            Defaults to None.
 
     Examples:
         >>> import ppsci
@@ -136,6 +164,13 @@ class Solver:
         compute_metric_by_batch: bool = False,
         eval_with_no_grad: bool = False,
         to_static: bool = False,
+        plan_derivatives: bool = False,
+        batch_constraints: bool = False,
+        compile_train_step: bool = False,
+        async_save: bool = False,
+        keep_checkpoint_max: int = 0,
+        num_prefetch: int = 0,
+        adaptive: Optional[Dict[str, ppsci.solver.adaptive.RAR]] = None,
     ):
         # set model
         self.model = model
@@ -166,6 +201,8 @@ class Solver:
 
         # initialize traning log recorder for loss, time cost, metric, etc.
         self.train_output_info = {}
+        # losses of iterations not logged yet, see `printer.update_train_loss`
+        self.train_loss_buffer = []
         self.train_time_info = {
             "batch_cost": misc.AverageMeter("batch_cost", ".5f", postfix="s"),
             "reader_cost": misc.AverageMeter("reader_cost", ".5f", postfix="s"),
@@ -298,10 +335,192 @@ class Solver:
 
         self.forward_helper = expression.ExpressionSolver()
 
+        # plan derivatives required by constraints for training
+        if plan_derivatives and self.constraint is not None:
+            self.forward_helper.derivative_planner = ppsci.autodiff.DerivativePlanner(
+                self.model, self.constraint
+            )
+            logger.info(
+                "Derivative plan for constraint(s):\n"
+                f"{self.forward_helper.derivative_planner.summary()}"
+            )
+
+        # prefetch batches of constraints on background threads
+        if num_prefetch > 0 and self.constraint is not None:
+            for _constraint in self.constraint.values():
+                _constraint.data_iter = ppsci.data.dataloader.Prefetcher(
+                    _constraint.data_iter, num_prefetch
+                )
+
+        # adaptive refinement of collocation points of constraints
+        self.adaptive = {} if adaptive is None else adaptive
+        for name in self.adaptive:
+            if self.constraint is None or name not in self.constraint:
+                raise ValueError(
+                    f"Constraint({name}) to be refined adaptively is not found."
+                )
+
+        # writer for saving checkpoints during training
+        self.checkpoint_writer = save_load.CheckpointWriter(
+            async_save, keep_checkpoint_max
+        )
+
+        # whether trace the whole training step into one static program
+        self.compile_train_step = compile_train_step
+        if compile_train_step:
+            if not expression.SUPPORT_COMPILE_TRAIN_STEP:
+                raise ValueError(
+                    "compile_train_step requires paddlepaddle>=2.6 or develop build, "
+                    f"but got {paddle.__version__}."
+                )
+            if (
+                self.use_amp
+                or self.update_freq > 1
+                or self.world_size > 1
+                or isinstance(self.optimizer, optim.LBFGS)
+            ):
+                raise ValueError(
+                    "compile_train_step is not supported with AMP, update_freq > 1, "
+                    "distributed training or L-BFGS optimizer."
+                )
+            to_static = True
+
         # whether enable static for forward pass, default to Fals
         jit.enable_to_static(to_static)
         logger.info(f"Set to_static={to_static} for forward computation.")
 
+        # run model forward for batched constraints at once and report speedup
+        if batch_constraints and self.constraint is not None:
+            profile = self._profile_batching()
+            if profile is None:
+                logger.warning(
+                    "batch_constraints is disabled as dataset of some constraint does "
+                    "not hold input, label and weight as dict of arrays."
+                )
+            elif np.allclose(*profile[2], rtol=1e-4, atol=1e-6):
+                batch_groups, costs, _ = profile
+                self.forward_helper.batch_groups = batch_groups
+                logger.info(
+                    f"Batch constraint(s) into {len(batch_groups)} group(s) for model forward, "
+                    f"cost per step: {costs[0] * 1000:.3f}ms -> "
+                    f"{costs[1] * 1000:.3f}ms, speedup: {costs[0] / costs[1]:.2f}x"
+                )
+            else:
+                losses = profile[2]
+                logger.warning(
+                    f"Losses computed with batched constraints({losses[1]}) "
+                    f"mismatch the original ones({losses[0]}), batch_constraints is "
+                    "disabled as model may not compute samples independently."
+                )
+
+    def _profile_batching(
+        self, repeat: int = 2
+    ) -> Optional[
+        Tuple[
+            Tuple[Tuple[int, ...], ...],
+            Tuple[float, float],
+            Tuple[List[float], List[float]],
+        ]
+    ]:
+        """Group constraints by whether derivatives are required, so that rows which
+        need no differentiation are not involved in backward passes, then profile
+        training forward and backward with leading samples of every constraint,
+        computed one by one and batched respectively.
+
+        Args:
+            repeat (int, optional): Number of repeat after one warmup. Defaults to 2.
+
+        Returns:
+            Optional[Tuple[Tuple[Tuple[int, ...], ...], Tuple[float, float], Tuple[List[float], List[float]]]]:
+                Batch groups, time cost per step and constraint losses, both without
+                and with batching. None if probe samples can not be taken.
+        """
+        input_dicts, label_dicts, weight_dicts = [], [], []
+        for _constraint in self.constraint.values():
+            probe = self._probe_batch(_constraint)
+            if probe is None:
+                return None
+            input_dicts.append(probe[0])
+            label_dicts.append(probe[1])
+            weight_dicts.append(probe[2])
+
+        def train_step(indices: Tuple[int, ...]) -> List[paddle.Tensor]:
+            names = [tuple(self.constraint.keys())[i] for i in indices]
+            constraint_losses = self.forward_helper.train_forward(
+                tuple(self.constraint[name].output_expr for name in names),
+                [input_dicts[i] for i in indices],
+                self.model,
+                {name: self.constraint[name] for name in names},
+                [label_dicts[i] for i in indices],
+                [weight_dicts[i] for i in indices],
+            )
+            paddle.add_n(constraint_losses).backward()
+            self.model.clear_gradients()
+            return constraint_losses
+
+        # group constraints which require model forward by whether differentiated
+        differentiated, underived = [], []
+        for i, _constraint in enumerate(self.constraint.values()):
+            if not callable(next(iter(_constraint.output_expr.values()))):
+                continue
+            ppsci.autodiff.cache_info(reset=True)
+            train_step((i,))
+            if ppsci.autodiff.cache_info().backward_calls > 0:
+                differentiated.append(i)
+            else:
+                underived.append(i)
+        ppsci.autodiff.cache_info(reset=True)
+        # single constraint is not worth batching
+        batch_groups = tuple(
+            tuple(group) for group in (differentiated, underived) if len(group) > 1
+        )
+
+        all_indices = tuple(range(len(self.constraint)))
+        costs, losses = [], []
+        for groups in (None, batch_groups):
+            self.forward_helper.batch_groups = groups
+            for i in range(repeat + 1):
+                if i == 1:
+                    # skip warmup
+                    tic = time.perf_counter()
+                constraint_losses = train_step(all_indices)
+            costs.append((time.perf_counter() - tic) / repeat)
+            losses.append([float(loss) for loss in constraint_losses])
+        self.forward_helper.batch_groups = None
+        return batch_groups, tuple(costs), tuple(losses)
+
+    @staticmethod
+    def _probe_batch(
+        _constraint: ppsci.constraint.Constraint,
+    ) -> Optional[Tuple[Dict[str, paddle.Tensor], ...]]:
+        """Take one batch of leading samples from constraint's dataset directly, so
+        that data iterator of constraint is left untouched.
+        """
+        dataset = _constraint.data_loader.dataset
+        data_dicts = tuple(
+            getattr(dataset, attr, None) for attr in ("input", "label", "weight")
+        )
+        if not all(isinstance(data_dict, dict) for data_dict in data_dicts):
+            return None
+
+        # iterable dataset yields all samples as one batch
+        batch_sampler = getattr(
+            _constraint.data_loader.dataloader, "batch_sampler", None
+        )
+        batch_size = getattr(batch_sampler, "batch_size", None)
+        probe = tuple(
+            {
+                key: value[:batch_size].detach()
+                if paddle.is_tensor(value)
+                else paddle.to_tensor(value[:batch_size])
+                for key, value in data_dict.items()
+            }
+            for data_dict in data_dicts
+        )
+        for value in probe[0].values():
+            value.stop_gradient = False
+        return probe
+
     @staticmethod
     def from_config(cfg: Dict[str, Any]) -> Solver:
         """Initialize solver from given config.
@@ -396,6 +615,7 @@ class Solver:
         self.global_step = self.best_metric["epoch"] * self.iters_per_epoch + 1
 
         for epoch_id in range(self.best_metric["epoch"] + 1, self.epochs + 1):
+            ppsci.autodiff.cache_info(reset=True)
             self.train_epoch_func(self, epoch_id, self.log_freq)
 
             # log training summation at end of a epoch
@@ -405,6 +625,27 @@ class Solver:
             logger.info(f"[Train][Epoch {epoch_id}/{self.epochs}][Avg] {metric_msg}")
             self.train_output_info.clear()
 
+            # log statistics of derivative cache for finding duplicated work and leaks
+            cache_info = ppsci.autodiff.cache_info()
+            if cache_info.backward_calls > 0:
+                logger.info(
+                    f"[Train][Epoch {epoch_id}/{self.epochs}][Autodiff] "
+                    f"backward_calls/step: "
+                    f"{cache_info.backward_calls / self.iters_per_epoch:.1f}, "
+                    f"hits: {cache_info.hits}, misses: {cache_info.misses}, "
+                    f"evictions: {cache_info.evictions}, "
+                    f"bytes held: {cache_info.bytes}, peak bytes: {cache_info.peak_bytes}"
+                )
+
+            # refine collocation points of constraints adaptively
+            for name, refiner in self.adaptive.items():
+                if epoch_id % refiner.freq == 0:
+                    refine_info = refiner.refine(self, self.constraint[name])
+                    logger.info(
+                        f"[Train][Epoch {epoch_id}/{self.epochs}][Adaptive] {name}: "
+                        + ", ".join(f"{k}: {v:.5g}" for k, v in refine_info.items())
+                    )
+
             cur_metric = float("inf")
             # evaluate during training
             if (
@@ -416,13 +657,13 @@ class Solver:
                 if cur_metric < self.best_metric["metric"]:
                     self.best_metric["metric"] = cur_metric
                     self.best_metric["epoch"] = epoch_id
-                    save_load.save_checkpoint(
+                    self.checkpoint_writer.save(
                         self.model,
                         self.optimizer,
                         self.scaler,
                         self.best_metric,
                         self.output_dir,
-                        "best_model",
+                        ("best_model",),
                         self.equation,
                     )
                 logger.info(
@@ -439,29 +680,24 @@ class Solver:
             if self.lr_scheduler is not None and self.lr_scheduler.by_epoch:
                 self.lr_scheduler.step()
 
-            # save epoch model every save_freq epochs
+            # save epoch model every save_freq epochs, and the latest model for
+            # convenient resume training, both share the same states
+            prefixes = ("latest",)
             if self.save_freq > 0 and epoch_id % self.save_freq == 0:
-                save_load.save_checkpoint(
-                    self.model,
-                    self.optimizer,
-                    self.scaler,
-                    {"metric": cur_metric, "epoch": epoch_id},
-                    self.output_dir,
-                    f"epoch_{epoch_id}",
-                    self.equation,
-                )
-
-            # save the latest model for convenient resume training
-            save_load.save_checkpoint(
+                prefixes = (f"epoch_{epoch_id}",) + prefixes
+            self.checkpoint_writer.save(
                 self.model,
                 self.optimizer,
                 self.scaler,
                 {"metric": cur_metric, "epoch": epoch_id},
                 self.output_dir,
-                "latest",
+                prefixes,
                 self.equation,
             )
 
+        # wait for checkpoints being written
+        self.checkpoint_writer.wait()
+
         # close VisualDL
         if self.vdl_writer is not None:
             self.vdl_writer.close()
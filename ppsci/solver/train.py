@@ -43,20 +43,21 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
         total_batch_size = 0
         reader_cost = 0
         batch_cost = 0
-        reader_tic = time.perf_counter()
 
         input_dicts = []
         label_dicts = []
         weight_dicts = []
         for _, _constraint in solver.constraint.items():
+            # only time cost of fetching batch(or waiting for prefetched batch)
+            reader_tic = time.perf_counter()
             input_dict, label_dict, weight_dict = next(_constraint.data_iter)
+            reader_cost += time.perf_counter() - reader_tic
             # profile code below
             # profiler.add_profiler_step(solver.cfg["profiler_options"])
             if iter_id == 5:
                 # 5 step for warmup
                 for key in solver.train_time_info:
                     solver.train_time_info[key].reset()
-            reader_cost += time.perf_counter() - reader_tic
             for v in input_dict.values():
                 v.stop_gradient = False
 
@@ -65,41 +66,60 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
             label_dicts.append(label_dict)
             weight_dicts.append(weight_dict)
             total_batch_size += next(iter(input_dict.values())).shape[0]
-            reader_tic = time.perf_counter()
 
         with solver.no_sync_context_manager(solver.world_size > 1, solver.model):
             # forward for every constraint, including model and equation expression
             with solver.autocast_context_manager(solver.use_amp, solver.amp_level):
-                constraint_losses = solver.forward_helper.train_forward(
-                    (
-                        _constraint.output_expr
-                        for _constraint in solver.constraint.values()
-                    ),
-                    input_dicts,
-                    solver.model,
-                    solver.constraint,
-                    label_dicts,
-                    weight_dicts,
-                )
-                # accumulate all losses
+                if solver.compile_train_step:
+                    # forward, backward and update are run as one static program
+                    constraint_losses = solver.forward_helper.train_step(
+                        tuple(
+                            _constraint.output_expr
+                            for _constraint in solver.constraint.values()
+                        ),
+                        input_dicts,
+                        solver.model,
+                        solver.constraint,
+                        label_dicts,
+                        weight_dicts,
+                        solver.optimizer,
+                    )
+                else:
+                    constraint_losses = solver.forward_helper.train_forward(
+                        tuple(
+                            _constraint.output_expr
+                            for _constraint in solver.constraint.values()
+                        ),
+                        input_dicts,
+                        solver.model,
+                        solver.constraint,
+                        label_dicts,
+                        weight_dicts,
+                    )
+                # accumulate all losses, which are kept on device for logging
                 for i, _constraint in enumerate(solver.constraint.values()):
                     total_loss += constraint_losses[i]
-                    loss_dict[_constraint.name] += (
-                        float(constraint_losses[i]) / solver.update_freq
-                    )
+                    loss_dict[_constraint.name] = constraint_losses[i].detach()
                 if solver.update_freq > 1:
                     total_loss = total_loss / solver.update_freq
-                loss_dict["loss"] = float(total_loss)
-
-            # backward
-            if solver.use_amp:
-                total_loss_scaled = solver.scaler.scale(total_loss)
-                total_loss_scaled.backward()
-            else:
-                total_loss.backward()
-
-        # update parameters
-        if iter_id % solver.update_freq == 0 or iter_id == solver.iters_per_epoch:
+                    for _constraint in solver.constraint.values():
+                        loss_dict[_constraint.name] = (
+                            loss_dict[_constraint.name] / solver.update_freq
+                        )
+                loss_dict["loss"] = total_loss.detach()
+
+            # backward, which has been done within compiled training step
+            if not solver.compile_train_step:
+                if solver.use_amp:
+                    total_loss_scaled = solver.scaler.scale(total_loss)
+                    total_loss_scaled.backward()
+                else:
+                    total_loss.backward()
+
+        # update parameters, which has been done within compiled training step
+        if not solver.compile_train_step and (
+            iter_id % solver.update_freq == 0 or iter_id == solver.iters_per_epoch
+        ):
             if solver.world_size > 1:
                 # fuse + allreduce manually before optimization if use DDP + no_sync
                 # details in https://github.com/PaddlePaddle/Paddle/issues/48898#issuecomment-1343838622
@@ -126,6 +146,9 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
 
         batch_tic = time.perf_counter()
 
+    # merge losses not logged yet for summation of epoch
+    printer.flush_train_loss(solver)
+
 
 def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
     """Train function for one epoch with L-BFGS optimizer.
@@ -143,12 +166,13 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
         total_batch_size = 0
         reader_cost = 0
         batch_cost = 0
-        reader_tic = time.perf_counter()
 
         input_dicts = []
         label_dicts = []
         weight_dicts = []
         for _, _constraint in solver.constraint.items():
+            # only time cost of fetching batch(or waiting for prefetched batch)
+            reader_tic = time.perf_counter()
             input_dict, label_dict, weight_dict = next(_constraint.data_iter)
             reader_cost += time.perf_counter() - reader_tic
             for v in input_dict.values():
@@ -159,7 +183,6 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
             label_dicts.append(label_dict)
             weight_dicts.append(weight_dict)
             total_batch_size += next(iter(input_dict.values())).shape[0]
-            reader_tic = time.perf_counter()
 
         def closure():
             """Forward-backward closure function for LBFGS optimizer.
@@ -172,7 +195,7 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
                 with solver.autocast_context_manager(solver.use_amp, solver.amp_level):
                     # forward for every constraint, including model and equation expression
                     constraint_losses = solver.forward_helper.train_forward(
-                        (
+                        tuple(
                             _constraint.output_expr
                             for _constraint in solver.constraint.values()
                         ),
@@ -182,11 +205,11 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
                         label_dicts,
                         weight_dicts,
                     )
-                    # accumulate all losses
+                    # accumulate all losses, which are kept on device for logging
                     for i, _constraint in enumerate(solver.constraint.values()):
                         total_loss += constraint_losses[i]
-                        loss_dict[_constraint.name] = float(constraint_losses[i])
-                    loss_dict["loss"] = float(total_loss)
+                        loss_dict[_constraint.name] = constraint_losses[i].detach()
+                    loss_dict["loss"] = total_loss.detach()
 
                 # backward
                 solver.optimizer.clear_grad()
@@ -217,3 +240,6 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
             printer.log_train_info(solver, total_batch_size, epoch_id, iter_id)
 
         batch_tic = time.perf_counter()
+
+    # merge losses not logged yet for summation of epoch
+    printer.flush_train_loss(solver)
@@ -0,0 +1,394 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Content-addressed on-disk cache of numpy arrays, each entry is a directory named by
+hash key and holds one `.npy` file per array, which is loaded as memory-mapped array.
+"""
+
+import functools
+import glob
+import hashlib
+import os
+import os.path as osp
+import re
+import shutil
+import tempfile
+import types
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from ppsci.utils import logger
+
+__all__ = [
+    "CACHE_HOME",
+    "set_cache_dir",
+    "get_cache_dir",
+    "hash_content",
+    "load_arrays",
+    "save_arrays",
+    "fingerprint",
+    "enable_point_cache",
+    "cached_sample",
+]
+
+CACHE_HOME = osp.expanduser("~/.paddlesci/cache")
+
+_cache_dir = CACHE_HOME
+# whether to cache sampled points, which is disabled by default
+_point_cache_enabled = False
+
+
+def set_cache_dir(cache_dir: Optional[str]):
+    """Set directory of cache, cache will be disabled if None is given.
+
+    Args:
+        cache_dir (Optional[str]): Directory of cache.
+
+    Examples:
+        >>> from ppsci.utils import cache
+        >>> cache.set_cache_dir("./cache")
+        >>> cache.get_cache_dir()
+        './cache'
+        >>> cache.set_cache_dir(cache.CACHE_HOME)
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get directory of cache.
+
+    Returns:
+        Optional[str]: Directory of cache, None if cache is disabled.
+    """
+    return _cache_dir
+
+
+def hash_content(*arrays: np.ndarray, **params) -> str:
+    """Compute hash key of given arrays and parameters, arrays with same content,
+    dtype and shape always share the same key.
+
+    Args:
+        *arrays (np.ndarray): Arrays to be hashed.
+        **params: Parameters to be hashed, which should have deterministic `repr`.
+
+    Returns:
+        str: Hash key.
+
+    Examples:
+        >>> import numpy as np
+        >>> from ppsci.utils import cache
+        >>> key = cache.hash_content(np.zeros([3, 3]), operation="inflate", distance=0.1)
+        >>> key == cache.hash_content(np.zeros([3, 3]), distance=0.1, operation="inflate")
+        True
+    """
+    sha = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        sha.update(f"{array.dtype.str}{array.shape}".encode())
+        sha.update(array.data)
+    sha.update(repr(sorted(params.items())).encode())
+    return sha.hexdigest()
+
+
+def load_arrays(
+    key: str, cache_dir: Optional[str] = None
+) -> Optional[Dict[str, np.ndarray]]:
+    """Load arrays cached with given key as read-only memory-mapped arrays.
+
+    Args:
+        key (str): Hash key.
+        cache_dir (Optional[str]): Directory of cache. Defaults to None, which means
+            directory set by `set_cache_dir`.
+
+    Returns:
+        Optional[Dict[str, np.ndarray]]: Cached arrays, None if cache missed or disabled.
+    """
+    cache_dir = cache_dir or _cache_dir
+    if cache_dir is None:
+        return None
+    entry_dir = osp.join(cache_dir, key)
+    if not osp.isdir(entry_dir):
+        return None
+    return {
+        osp.splitext(osp.basename(path))[0]: np.load(path, mmap_mode="r")
+        for path in glob.glob(osp.join(entry_dir, "*.npy"))
+    }
+
+
+def save_arrays(
+    key: str, arrays: Dict[str, np.ndarray], cache_dir: Optional[str] = None
+) -> Optional[str]:
+    """Save arrays into cache with given key. Arrays are written into a temporary
+    directory first and then renamed atomically, so that concurrent writers(e.g.
+    multiple ranks) never expose a partial entry to readers.
+
+    Args:
+        key (str): Hash key.
+        arrays (Dict[str, np.ndarray]): Arrays to be cached.
+        cache_dir (Optional[str]): Directory of cache. Defaults to None, which means
+            directory set by `set_cache_dir`.
+
+    Returns:
+        Optional[str]: Directory of cache entry, None if cache is disabled.
+    """
+    cache_dir = cache_dir or _cache_dir
+    if cache_dir is None:
+        return None
+    entry_dir = osp.join(cache_dir, key)
+    if osp.isdir(entry_dir):
+        return entry_dir
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{key}.", dir=cache_dir)
+    try:
+        for name, array in arrays.items():
+            np.save(osp.join(tmp_dir, f"{name}.npy"), np.asarray(array))
+        os.rename(tmp_dir, entry_dir)
+        logger.debug(f"Save {len(arrays)} array(s) into cache: {entry_dir}")
+    except OSError:
+        # entry has been written by another process
+        if not osp.isdir(entry_dir):
+            raise
+    finally:
+        if osp.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+    return entry_dir
+
+
+_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _update_fingerprint(
+    sha: "hashlib._Hash", obj: Any, memo: Dict[int, Tuple[int, Any]]
+):
+    """Feed content of given object into hash recursively."""
+    if isinstance(obj, (type(None), bool, int, float, complex, str, bytes, np.generic)):
+        sha.update(f"{type(obj).__name__}:{obj!r};".encode())
+        return
+    if type(obj).__module__.startswith("paddle") and hasattr(obj, "numpy"):
+        # paddle.Tensor, whose repr is truncated
+        obj = obj.numpy()
+    if isinstance(obj, np.ndarray):
+        obj = np.ascontiguousarray(obj)
+        sha.update(f"ndarray:{obj.dtype.str}{obj.shape};".encode())
+        sha.update(obj.data)
+        return
+    if isinstance(obj, (types.ModuleType, type, types.BuiltinFunctionType, np.ufunc)):
+        sha.update(f"{type(obj).__name__}:{getattr(obj, '__name__', obj)!r};".encode())
+        return
+
+    # avoid infinite recursion of self-referencing objects
+    if id(obj) in memo:
+        sha.update(f"ref:{memo[id(obj)][0]};".encode())
+        return
+    # keep object alive so that its id won't be reused by temporary objects
+    memo[id(obj)] = (len(memo), obj)
+
+    sha.update(f"{type(obj).__module__}.{type(obj).__qualname__}:".encode())
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            _update_fingerprint(sha, item, memo)
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            _update_fingerprint(sha, key, memo)
+            _update_fingerprint(sha, obj[key], memo)
+    elif isinstance(obj, (set, frozenset)):
+        # iteration order of set varies with hash seed
+        for item_hash in sorted(fingerprint(item) for item in obj):
+            sha.update(f"{item_hash};".encode())
+    elif isinstance(obj, functools.partial):
+        _update_fingerprint(sha, (obj.func, obj.args, obj.keywords), memo)
+    elif isinstance(obj, types.CodeType):
+        sha.update(obj.co_code)
+        _update_fingerprint(sha, (obj.co_consts, obj.co_names), memo)
+    elif isinstance(obj, types.MethodType):
+        _update_fingerprint(sha, (obj.__func__.__qualname__, obj.__self__), memo)
+    elif isinstance(obj, types.FunctionType):
+        closure = tuple(cell.cell_contents for cell in obj.__closure__ or ())
+        # global variables used by function, e.g. constants and other functions
+        global_vars = {
+            name: obj.__globals__[name]
+            for name in obj.__code__.co_names
+            if name in obj.__globals__
+        }
+        _update_fingerprint(
+            sha,
+            (obj.__code__, obj.__defaults__, obj.__kwdefaults__, closure, global_vars),
+            memo,
+        )
+    elif hasattr(obj, "content_hash"):
+        # e.g. mesh, whose content is hashed already
+        _update_fingerprint(sha, obj.content_hash, memo)
+    elif hasattr(obj, "__dict__"):
+        _update_fingerprint(sha, vars(obj), memo)
+    else:
+        text = repr(obj)
+        if _ADDRESS_PATTERN.search(text):
+            # default repr identifies object instead of its content, e.g. cKDTree
+            raise TypeError(
+                f"Object of type {type(obj).__module__}.{type(obj).__qualname__} "
+                "can not be fingerprinted by content, define `content_hash` for it "
+                "or its owner."
+            )
+        sha.update(text.encode())
+
+
+def fingerprint(*objs: Any) -> str:
+    """Compute fingerprint of given objects by their content, including arrays,
+    containers, attributes of objects, and code, default arguments, closure and global
+    variables of functions.
+
+    Args:
+        *objs (Any): Objects to be fingerprinted.
+
+    Returns:
+        str: Fingerprint.
+
+    Raises:
+        TypeError: If any object can only be represented by its identity, e.g.
+            extension object whose repr contains memory address.
+
+    Examples:
+        >>> import ppsci
+        >>> from ppsci.utils import cache
+        >>> rect = ppsci.geometry.Rectangle((0, 0), (1, 1))
+        >>> key = cache.fingerprint(rect, lambda x, y: x > 0.5)
+        >>> key == cache.fingerprint(rect, lambda x, y: x > 0.5)
+        True
+        >>> key == cache.fingerprint(rect, lambda x, y: x > 0.6)
+        False
+    """
+    sha = hashlib.sha256()
+    _update_fingerprint(sha, objs, {})
+    return sha.hexdigest()
+
+
+def enable_point_cache(enable: bool = True):
+    """Enable or disable cache of points sampled by `cached_sample`, which is
+    disabled by default. Points are saved into "points" directory under directory
+    set by `set_cache_dir`.
+
+    Args:
+        enable (bool, optional): Whether to enable point cache. Defaults to True.
+
+    Examples:
+        >>> from ppsci.utils import cache
+        >>> cache.enable_point_cache()
+        >>> cache.enable_point_cache(False)
+    """
+    global _point_cache_enabled
+    _point_cache_enabled = enable
+
+
+def cached_sample(
+    sample_func: Callable[..., Dict[str, np.ndarray]], *args, **kwargs
+) -> Dict[str, np.ndarray]:
+    """Call `sample_func(*args, **kwargs)` to sample points, or load points sampled
+    before from cache if point cache is enabled.
+
+    Points are keyed by fingerprint of `sample_func`(including geometry it bound to),
+    arguments, number of sampling workers and state of numpy's global random
+    generator, which is determined by random seed. State of random generator after
+    sampling is cached as well and restored when cache hit, so that points sampled
+    afterwards are identical whether cache hit or not.
+
+    NOTE: Functions used for sampling, e.g. criteria, should be pure, since external
+    state they depend on can not be fingerprinted. If any argument can not be
+    fingerprinted by content, a warning is logged and points are sampled without
+    cache.
+
+    Args:
+        sample_func (Callable[..., Dict[str, np.ndarray]]): Sampling function, e.g.
+            `geom.sample_interior`.
+        *args: Positional arguments of `sample_func`.
+        **kwargs: Keyword arguments of `sample_func`.
+
+    Returns:
+        Dict[str, np.ndarray]: Sampled points.
+
+    Examples:
+        >>> import ppsci
+        >>> from ppsci.utils import cache
+        >>> rect = ppsci.geometry.Rectangle((0, 0), (1, 1))
+        >>> points = cache.cached_sample(rect.sample_interior, 10, "pseudo")
+        >>> points["x"].shape
+        (10, 1)
+    """
+    if not _point_cache_enabled or _cache_dir is None:
+        return sample_func(*args, **kwargs)
+
+    import paddle
+
+    from ppsci.geometry import sampler
+
+    name = getattr(sample_func, "__qualname__", type(sample_func).__name__)
+    try:
+        content_key = fingerprint(sample_func, args, kwargs)
+    except TypeError as e:
+        logger.warning(f"Point cache is skipped for {name}: {e}")
+        return sample_func(*args, **kwargs)
+
+    _, rng_keys, rng_pos, rng_has_gauss, rng_gauss = np.random.get_state()
+    key = hash_content(
+        rng_keys,
+        content_key,
+        rng=(int(rng_pos), int(rng_has_gauss), float(rng_gauss)),
+        dtype=paddle.get_default_dtype(),
+        # points sampled in parallel depend on number of workers
+        num_workers=sampler.get_num_workers(),
+    )
+    cache_dir = osp.join(_cache_dir, "points")
+
+    arrays = load_arrays(key, cache_dir)
+    if arrays is not None:
+        rng_keys, rng_state = arrays.pop("__rng_keys__"), arrays.pop("__rng_state__")
+        np.random.set_state(
+            (
+                "MT19937",
+                np.array(rng_keys),
+                int(rng_state[0]),
+                int(rng_state[1]),
+                float(rng_state[2]),
+            )
+        )
+        logger.info(
+            f"Point cache hit for {name}, load {len(next(iter(arrays.values())))} "
+            f"point(s) from {osp.join(cache_dir, key)}"
+        )
+        # copy into memory as points may be modified in place
+        return {k: np.array(v) for k, v in arrays.items()}
+
+    points = sample_func(*args, **kwargs)
+    _, rng_keys, rng_pos, rng_has_gauss, rng_gauss = np.random.get_state()
+    entry_dir = save_arrays(
+        key,
+        {
+            **points,
+            "__rng_keys__": rng_keys,
+            "__rng_state__": np.array([rng_pos, rng_has_gauss, rng_gauss], "float64"),
+        },
+        cache_dir,
+    )
+    logger.info(
+        f"Point cache miss for {name}, save {len(next(iter(points.values())))} "
+        f"point(s) into {entry_dir}"
+    )
+    return points
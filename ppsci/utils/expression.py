@@ -18,15 +18,33 @@ from typing import Dict
 from typing import Optional
 from typing import Tuple
 
+import paddle
+from packaging import version
 from paddle import jit
 from paddle import nn
 
 if TYPE_CHECKING:
-    import paddle
+    from paddle import optimizer
+
+    from ppsci import autodiff
     from ppsci import constraint
     from ppsci import validate
 
 from ppsci.autodiff import clear
+from ppsci.autodiff import concat_batch
+from ppsci.autodiff import fuse_inputs
+from ppsci.autodiff import split_batch
+
+# `full_graph` of `jit.to_static` is supported since paddle 2.6, earlier versions can
+# not trace backward and parameters update into one static program, while develop
+# build is versioned as 0.0.0
+_PADDLE_VERSION = version.Version(paddle.__version__)
+SUPPORT_COMPILE_TRAIN_STEP = _PADDLE_VERSION >= version.Version(
+    "2.6.0"
+) or _PADDLE_VERSION == version.Version("0.0.0")
+_TRAIN_STEP_TO_STATIC_KWARGS = (
+    {"full_graph": True} if SUPPORT_COMPILE_TRAIN_STEP else {}
+)
 
 
 class ExpressionSolver(nn.Layer):
@@ -41,6 +59,12 @@ class ExpressionSolver(nn.Layer):
 
     def __init__(self):
         super().__init__()
+        # planner for computing derivatives required by constraints, set by solver
+        self.derivative_planner: Optional["autodiff.DerivativePlanner"] = None
+        # groups of constraint indices whose inputs are fed into model at once, so
+        # that model forward runs once per group rather than per constraint, set by
+        # solver
+        self.batch_groups: Optional[Tuple[Tuple[int, ...], ...]] = None
 
     def forward(self, *args, **kwargs):
         raise NotImplementedError(
@@ -72,10 +96,30 @@ class ExpressionSolver(nn.Layer):
             Tuple[paddle.Tensor, ...]: Tuple of losses for each constraint.
         """
         output_dicts = []
+        constraint_names = tuple(constraint.keys())
+        expr_dicts = tuple(expr_dicts)
+        batched_output_dicts = {}
+        if self.batch_groups is not None:
+            for group in self.batch_groups:
+                batched_output_dicts.update(
+                    self._batched_model_forward(group, input_dicts, model)
+                )
         for i, expr_dict in enumerate(expr_dicts):
             # model forward
             if callable(next(iter(expr_dict.values()))):
-                output_dict = model(input_dicts[i])
+                if i in batched_output_dicts:
+                    output_dict = batched_output_dicts[i]
+                else:
+                    output_dict = model(input_dicts[i])
+                    # compute derivatives w.r.t. all inputs within one backward pass
+                    fuse_inputs(
+                        [v for v in input_dicts[i].values() if not v.stop_gradient]
+                    )
+                # compute all planned derivatives level by level in advance
+                if self.derivative_planner is not None:
+                    self.derivative_planner.execute(
+                        constraint_names[i], {**output_dict, **input_dicts[i]}
+                    )
 
             # equation forward
             for name, expr in expr_dict.items():
@@ -92,7 +136,10 @@ class ExpressionSolver(nn.Layer):
 
             output_dicts.append(output_dict)
 
-            # clear differentiation cache
+            # clear differentiation cache, unless it is shared by batched constraints
+            if self.batch_groups is None:
+                clear()
+        if self.batch_groups is not None:
             clear()
 
         # compute loss for each constraint according to its' own output, label and weight
@@ -106,6 +153,84 @@ class ExpressionSolver(nn.Layer):
             constraint_losses.append(constraint_loss)
         return constraint_losses
 
+    @jit.to_static(**_TRAIN_STEP_TO_STATIC_KWARGS)
+    def train_step(
+        self,
+        expr_dicts: Tuple[Dict[str, Callable], ...],
+        input_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        model: nn.Layer,
+        constraint: Dict[str, "constraint.Constraint"],
+        label_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        weight_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        optimizer: "optimizer.Optimizer",
+    ) -> Tuple["paddle.Tensor", ...]:
+        """A whole training step, including model forward, equation forward, backward
+        and parameters update, which will be traced into one static program when
+        to_static is enabled. It is traced in full-graph(AST) mode regardless of
+        ENABLE_FALL_BACK, since SOT mode fails to trace nested `train_forward`, which
+        requires paddle>=2.6(see `SUPPORT_COMPILE_TRAIN_STEP`).
+
+        Args:
+            expr_dicts (Tuple[Dict[str, Callable], ...]): Tuple of expression dicts.
+            input_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of input dicts.
+            model (nn.Layer): NN model.
+            constraint (Dict[str, "constraint.Constraint"]): Constraint dict.
+            label_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of label dicts.
+            weight_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of weight dicts.
+            optimizer (optimizer.Optimizer): Optimizer.
+
+        Returns:
+            Tuple[paddle.Tensor, ...]: Tuple of losses for each constraint.
+        """
+        constraint_losses = self.train_forward(
+            expr_dicts, input_dicts, model, constraint, label_dicts, weight_dicts
+        )
+        total_loss = paddle.add_n(list(constraint_losses))
+        total_loss.backward()
+        optimizer.step()
+        optimizer.clear_grad()
+        return constraint_losses
+
+    def _batched_model_forward(
+        self,
+        indices: Tuple[int, ...],
+        input_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        model: nn.Layer,
+    ) -> Dict[int, Dict[str, "paddle.Tensor"]]:
+        """Concatenate inputs of given constraints along batch axis, run model forward
+        once and split outputs back to each constraint. Derivatives of one constraint's
+        outputs w.r.t. its own inputs are sliced from derivatives of the whole batch,
+        so they are computed only once for all constraints in batch.
+
+        Args:
+            indices (Tuple[int, ...]): Indices of constraints in batch.
+            input_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of input dicts.
+            model (nn.Layer): NN model.
+
+        Returns:
+            Dict[int, Dict[str, paddle.Tensor]]: Output dict of every constraint in
+                batch, keyed by index of constraint.
+        """
+        # only keys shared by all constraints can be model inputs
+        keys = [
+            key
+            for key in input_dicts[indices[0]]
+            if all(key in input_dicts[i] for i in indices)
+        ]
+        sections = [next(iter(input_dicts[i].values())).shape[0] for i in indices]
+        batched_input_dict = {
+            key: concat_batch([input_dicts[i][key] for i in indices]) for key in keys
+        }
+        # compute derivatives w.r.t. all inputs within one backward pass
+        fuse_inputs([v for v in batched_input_dict.values() if not v.stop_gradient])
+
+        batched_output_dict = model(batched_input_dict)
+        output_dicts = {i: {} for i in indices}
+        for key, value in batched_output_dict.items():
+            for i, chunk in zip(indices, split_batch(value, sections)):
+                output_dicts[i][key] = chunk
+        return output_dicts
+
     @jit.to_static
     def eval_forward(
         self,
@@ -134,6 +259,8 @@ class ExpressionSolver(nn.Layer):
         # model forward
         if callable(next(iter(expr_dict.values()))):
             output_dict = model(input_dict)
+            # compute derivatives w.r.t. all inputs within one backward pass
+            fuse_inputs([v for v in input_dict.values() if not v.stop_gradient])
 
         # equation forward
         for name, expr in expr_dict.items():
@@ -180,6 +307,9 @@ class ExpressionSolver(nn.Layer):
         output_dict = model(input_dict)
 
         if isinstance(expr_dict, dict):
+            # compute derivatives w.r.t. all inputs within one backward pass
+            fuse_inputs([v for v in input_dict.values() if not v.stop_gradient])
+
             # equation forward
             for name, expr in expr_dict.items():
                 if callable(expr):
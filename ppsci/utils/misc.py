@@ -201,27 +201,33 @@ def typename(obj: object) -> str:
 
 def combine_array_with_time(x: np.ndarray, t: Tuple[int, ...]) -> np.ndarray:
     """Combine given data x with time sequence t.
-    Given x with shape (N, D) and t with shape (T, ),
+    Given x with shape (N, D) and t with shape (T, ) or (T, 1),
     this function will repeat t_i for N times and will concat it with data x for each t_i in t,
     finally return the stacked result, which is of shape (NxT, D+1).
 
     Args:
         x (np.ndarray): Points data with shape (N, D).
-        t (Tuple[int, ...]): Time sequence with shape (T, ).
+        t (Tuple[int, ...]): Time sequence with shape (T, ) or (T, 1).
 
     Returns:
         np.ndarray: Combined data with shape of (NxT, D+1).
+
+    Examples:
+        >>> import numpy as np
+        >>> from ppsci.utils import misc
+        >>> misc.combine_array_with_time(np.array([[1.0], [2.0]]), (0.0, 0.5))
+        array([[0. , 1. ],
+               [0. , 2. ],
+               [0.5, 1. ],
+               [0.5, 2. ]], dtype=float32)
     """
-    nx = len(x)
-    tx = []
-    for ti in t:
-        tx.append(
-            np.hstack(
-                (np.full([nx, 1], float(ti), dtype=paddle.get_default_dtype()), x)
-            )
-        )
-    tx = np.vstack(tx)
-    return tx
+    t = np.asarray(t, dtype=paddle.get_default_dtype()).reshape([-1])
+    x = np.asarray(x).reshape([len(x), -1])
+    # fill repeated time and tiled data into one preallocated array by broadcasting
+    tx = np.empty((len(t), len(x), x.shape[1] + 1), dtype=paddle.get_default_dtype())
+    tx[:, :, 0] = t[:, None]
+    tx[:, :, 1:] = x
+    return tx.reshape([-1, x.shape[1] + 1])
 
 
 def set_random_seed(seed: int):
@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import glob
 import os
+import queue
+import re
+import shutil
+import threading
 from typing import Any
 from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
 import paddle
 
 from ppsci.utils import download
 from ppsci.utils import logger
 
-__all__ = ["load_checkpoint", "save_checkpoint", "load_pretrain"]
+__all__ = ["load_checkpoint", "save_checkpoint", "load_pretrain", "CheckpointWriter"]
 
 
 def _load_pretrain_from_path(model, path, equation=None):
@@ -82,6 +91,10 @@ def load_checkpoint(
         raise FileNotFoundError(f"{path}.pdparams not exist.")
     if not os.path.exists(f"{path}.pdopt"):
         raise FileNotFoundError(f"{path}.pdopt not exist.")
+    if not os.path.exists(f"{path}.pdstates"):
+        raise FileNotFoundError(
+            f"{path}.pdstates not exist, checkpoint may be incomplete."
+        )
     if grad_scaler is not None and not os.path.exists(f"{path}.pdscaler"):
         raise FileNotFoundError(f"{path}.scaler not exist.")
 
@@ -134,15 +147,218 @@ def save_checkpoint(
     os.makedirs(model_dir, exist_ok=True)
     model_path = os.path.join(model_dir, prefix)
 
-    paddle.save(model.state_dict(), f"{model_path}.pdparams")
-    paddle.save(optimizer.state_dict(), f"{model_path}.pdopt")
-    paddle.save(metric, f"{model_path}.pdstates")
+    _write_states(
+        _collect_states(model, optimizer, grad_scaler, metric, equation), model_path
+    )
+    logger.info(f"Finish saving checkpoint to {model_path}")
+
+
+# suffixes of checkpoint files, ".pdstates" is written at last so that its existence
+# indicates the checkpoint is complete
+_SUFFIXES = (".pdparams", ".pdopt", ".pdscaler", ".pdeqn", ".pdstates")
+
+
+def _collect_states(
+    model, optimizer, grad_scaler, metric, equation=None
+) -> Dict[str, Any]:
+    """Collect objects to be saved, keyed by file suffix."""
+    states = {
+        ".pdparams": model.state_dict(),
+        ".pdopt": optimizer.state_dict(),
+        ".pdstates": metric,
+    }
     if grad_scaler is not None:
-        paddle.save(grad_scaler.state_dict(), f"{model_path}.pdscaler")
+        states[".pdscaler"] = grad_scaler.state_dict()
     if equation is not None:
-        paddle.save(
-            {key: eq.state_dict() for key, eq in equation.items()},
-            f"{model_path}.pdeqn",
-        )
+        states[".pdeqn"] = {key: eq.state_dict() for key, eq in equation.items()}
+    return states
 
-    logger.info(f"Finish saving checkpoint to {model_path}")
+
+def _write_states(states: Dict[str, Any], model_path: str):
+    """Write every object to a temporary file and then swap them in, so that a
+    reader never sees a partially written file or checkpoint.
+    """
+    for suffix in _SUFFIXES:
+        if suffix in states:
+            paddle.save(states[suffix], f"{model_path}{suffix}.tmp")
+    _replace_states(model_path, tuple(states))
+
+
+def _copy_states(src_path: str, dst_path: str):
+    """Copy written checkpoint files to another prefix atomically."""
+    suffixes = tuple(
+        suffix for suffix in _SUFFIXES if os.path.exists(f"{src_path}{suffix}")
+    )
+    for suffix in suffixes:
+        shutil.copyfile(f"{src_path}{suffix}", f"{dst_path}{suffix}.tmp")
+    _replace_states(dst_path, suffixes)
+
+
+def _replace_states(model_path: str, suffixes: Tuple[str, ...]):
+    """Rename temporary files of given suffixes to checkpoint files. Checkpoint can
+    not be swapped in by one rename as it consists of several files, so the old
+    ".pdstates" is removed first and the new one is renamed at last, then a
+    checkpoint interrupted halfway has no ".pdstates" and is never regarded as
+    complete, rather than mixing files of old and new checkpoints.
+    """
+    if os.path.exists(f"{model_path}.pdstates"):
+        os.remove(f"{model_path}.pdstates")
+    for suffix in _SUFFIXES:
+        path = f"{model_path}{suffix}"
+        if suffix in suffixes:
+            os.replace(f"{path}.tmp", path)
+        elif os.path.exists(path):
+            # stale file of old checkpoint, e.g. ".pdscaler" saved with AMP before
+            os.remove(path)
+
+
+def _to_host(obj: Any) -> Any:
+    """Recursively snapshot tensors in obj to host memory."""
+    if isinstance(obj, paddle.Tensor):
+        obj = obj.detach()
+        # copy explicitly as tensor on cpu may be returned as is
+        return obj.clone().cpu() if obj.place.is_cpu_place() else obj.cpu()
+    if isinstance(obj, dict):
+        return obj.__class__((key, _to_host(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return obj.__class__(_to_host(value) for value in obj)
+    return copy.deepcopy(obj)
+
+
+class CheckpointWriter:
+    """Checkpoint writer, which snapshots states to host memory and writes them to
+    disk on a background thread, so that training is not blocked by disk IO.
+
+    Every file is written to a temporary file first and then renamed, so a checkpoint
+    file is either complete or absent. Saves pending in queue are coalesced:
+
+    1. A checkpoint saved with several prefixes at once, e.g. "epoch_N" and "latest",
+    is serialized only once and copied to the other prefixes.
+    2. A pending save is dropped if a newer one with the same prefix arrives.
+
+    Args:
+        async_save (bool, optional): Whether write checkpoint on background thread,
+            otherwise write synchronously. Defaults to True.
+        keep_checkpoint_max (int, optional): Number of latest "epoch_N" checkpoints
+            kept on disk, older ones will be removed. 0 means keeping all. Defaults
+            to 0.
+
+    Examples:
+        >>> import ppsci
+        >>> from ppsci.utils import save_load
+        >>> model = ppsci.arch.MLP(("x",), ("u",), 2, 8)
+        >>> opt = ppsci.optimizer.Adam(1e-3)((model,))
+        >>> writer = save_load.CheckpointWriter(keep_checkpoint_max=2)
+        >>> writer.save(model, opt, None, {"epoch": 1}, "./output", ("epoch_1", "latest"))  # doctest: +SKIP
+        >>> writer.wait()  # doctest: +SKIP
+    """
+
+    def __init__(self, async_save: bool = True, keep_checkpoint_max: int = 0):
+        if keep_checkpoint_max < 0:
+            raise ValueError(
+                f"keep_checkpoint_max({keep_checkpoint_max}) should not be negative."
+            )
+        self.async_save = async_save
+        self.keep_checkpoint_max = keep_checkpoint_max
+
+        self._lock = threading.Lock()
+        # pending saves, (model_dir, prefixes) -> states
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._queue = queue.Queue()
+        self._error: Optional[Exception] = None
+        self._thread = None
+        if async_save:
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+
+    def save(
+        self,
+        model,
+        optimizer,
+        grad_scaler,
+        metric: Dict[str, Any],
+        model_dir: Optional[str],
+        prefixes: Sequence[str] = ("model",),
+        equation=None,
+    ):
+        """Save checkpoint with given prefixes, arguments are the same as
+        `save_checkpoint` except that `prefixes` can be a sequence of prefixes.
+        """
+        self._raise_error()
+        if paddle.distributed.get_rank() != 0:
+            return
+        if model_dir is None:
+            logger.warning("model_dir is set to None, skip save_checkpoint...")
+            return
+        if isinstance(prefixes, str):
+            prefixes = (prefixes,)
+        model_dir = os.path.join(model_dir, "checkpoints")
+        os.makedirs(model_dir, exist_ok=True)
+
+        states = _collect_states(model, optimizer, grad_scaler, metric, equation)
+        key = (model_dir, tuple(prefixes))
+        if not self.async_save:
+            self._write(key, states)
+            return
+
+        states = _to_host(states)
+        with self._lock:
+            # only the newest states of the same prefixes will be written
+            is_pending = key in self._pending
+            for _key in list(self._pending):
+                if _key[0] == model_dir and set(_key[1]) <= set(prefixes):
+                    self._pending.pop(_key)
+            self._pending[key] = states
+        if not is_pending:
+            self._queue.put(key)
+
+    def wait(self):
+        """Block until all pending checkpoints are written."""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def _work(self):
+        while True:
+            key = self._queue.get()
+            try:
+                with self._lock:
+                    states = self._pending.pop(key, None)
+                if states is not None:
+                    self._write(key, states)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write(self, key: tuple, states: Dict[str, Any]):
+        model_dir, prefixes = key
+        model_path = os.path.join(model_dir, prefixes[0])
+        _write_states(states, model_path)
+        for prefix in prefixes[1:]:
+            _copy_states(model_path, os.path.join(model_dir, prefix))
+        for prefix in prefixes:
+            logger.info(
+                f"Finish saving checkpoint to {os.path.join(model_dir, prefix)}"
+            )
+        if self.keep_checkpoint_max > 0:
+            self._remove_outdated(model_dir)
+
+    def _remove_outdated(self, model_dir: str):
+        """Remove "epoch_N" checkpoints except the latest `keep_checkpoint_max` ones."""
+        epochs = set()
+        for path in glob.glob(os.path.join(model_dir, "epoch_*.pdstates")):
+            match = re.fullmatch(r"epoch_(\d+)\.pdstates", os.path.basename(path))
+            if match:
+                epochs.add(int(match.group(1)))
+        for epoch in sorted(epochs)[: -self.keep_checkpoint_max]:
+            for suffix in _SUFFIXES:
+                path = os.path.join(model_dir, f"epoch_{epoch}{suffix}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _raise_error(self):
+        """Raise error occurred on background thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to save checkpoint.") from error
@@ -28,6 +28,7 @@ from ppsci import geometry
 from ppsci import loss
 from ppsci import metric
 from ppsci.data import dataset
+from ppsci.utils import cache
 from ppsci.validate import base
 
 
@@ -103,13 +104,16 @@ class GeometryValidator(base.Validator):
                         nx % self.num_timestamps == 0
                     ), f"{nx} % {self.num_timestamps} != 0"
                     nx //= self.num_timestamps
-                    input = geom.sample_interior(
+                    input = cache.cached_sample(
+                        geom.sample_interior,
                         nx * (geom.timedomain.num_timestamps - 1),
                         random,
                         criteria,
                         evenly,
                     )
-                    initial = geom.sample_initial_interior(nx, random, criteria, evenly)
+                    initial = cache.cached_sample(
+                        geom.sample_initial_interior, nx, random, criteria, evenly
+                    )
                     input = {
                         key: np.vstack((initial[key], input[key])) for key in input
                     }
@@ -120,7 +124,8 @@ class GeometryValidator(base.Validator):
                         nx % self.num_timestamps == 0
                     ), f"{nx} % {self.num_timestamps} != 0"
                     nx //= self.num_timestamps
-                    input = geom.sample_interior(
+                    input = cache.cached_sample(
+                        geom.sample_interior,
                         nx * (geom.timedomain.num_timestamps - 1),
                         random,
                         criteria,
@@ -131,7 +136,9 @@ class GeometryValidator(base.Validator):
                     "TimeXGeometry with random timestamp not implemented yet."
                 )
         else:
-            input = geom.sample_interior(nx, random, criteria, evenly)
+            input = cache.cached_sample(
+                geom.sample_interior, nx, random, criteria, evenly
+            )
 
         label = {}
         for key, value in label_dict.items():
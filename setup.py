@@ -58,7 +58,6 @@ if __name__ == "__main__":
             "visualdl",
             "pyvista==0.37.0",
             "pyyaml",
-            "scikit-optimize",
             "h5py",
             "meshio==5.3.4",
             "tqdm",
@@ -0,0 +1,75 @@
+import gc
+
+import paddle
+import pytest
+
+from ppsci import autodiff
+
+__all__ = []
+
+
+def test_cache_evicted_when_collected():
+    """Test for cache entries are evicted once output is garbage collected."""
+    autodiff.clear()
+    x = paddle.randn([13, 1])
+    x.stop_gradient = False
+    y = paddle.tanh(x)
+    autodiff.hessian(y, x)
+    assert len(autodiff.jacobian.Js) == 2
+    assert len(autodiff.hessian.Hs) == 1
+    assert autodiff.cache_info().bytes > 0
+
+    del y
+    gc.collect()
+    assert len(autodiff.jacobian.Js) == 0
+    assert len(autodiff.hessian.Hs) == 0
+    assert autodiff.cache_info().bytes == 0
+
+
+def test_cache_info():
+    """Test for statistics of hits, misses and backward calls."""
+    autodiff.clear()
+    autodiff.cache_info(reset=True)
+    x = paddle.randn([13, 1])
+    t = paddle.randn([13, 1])
+    x.stop_gradient = False
+    t.stop_gradient = False
+    u = x * x * t
+
+    autodiff.jacobian(u, x)
+    autodiff.jacobian(u, x)
+    autodiff.jacobian(u, (x, t))
+    info = autodiff.cache_info(reset=True)
+    # the 3rd call hits u_x and computes u_t
+    assert (info.hits, info.misses, info.backward_calls) == (2, 2, 2)
+    assert info.bytes == 2 * 13 * 4
+
+    info = autodiff.cache_info()
+    assert (info.hits, info.misses, info.backward_calls) == (0, 0, 0)
+    autodiff.clear()
+    assert autodiff.cache_info().bytes == 0
+
+
+def test_cache_budget():
+    """Test for least recently used entries are evicted when exceeding budget."""
+    autodiff.clear()
+    autodiff.set_cache_budget(13 * 4)
+    try:
+        x = paddle.randn([13, 1])
+        x.stop_gradient = False
+        u = paddle.tanh(x)
+        v = paddle.sin(x)
+        autodiff.jacobian(u, x)
+        autodiff.jacobian(v, x)
+        autodiff.jacobian(v, x)
+        info = autodiff.cache_info()
+        assert info.evictions == 1
+        assert info.bytes == 13 * 4
+        assert len(autodiff.jacobian.Js) == 1
+    finally:
+        autodiff.set_cache_budget(None)
+        autodiff.clear()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,71 @@
+import itertools
+
+import paddle
+import pytest
+
+from ppsci import autodiff
+
+__all__ = []
+
+
+@pytest.mark.parametrize("order", (1, 2, 3, 4))
+def test_directional_derivative(order):
+    """Test for directional derivative against nested jacobian."""
+    x = paddle.randn([13, 1])
+    y = paddle.randn([13, 1])
+    x.stop_gradient = False
+    y.stop_gradient = False
+    u = paddle.tanh(x * y + x)
+    direction = (0.6, -0.8)
+
+    expected = 0
+    for indices in itertools.product(range(2), repeat=order):
+        derivative = u
+        coef = 1.0
+        for k in indices:
+            derivative = paddle.grad(derivative, (x, y)[k], create_graph=True)[0]
+            coef *= direction[k]
+        expected += coef * derivative
+
+    test_result = autodiff.directional_derivative(u, (x, y), order, direction)
+    assert paddle.allclose(test_result, expected, atol=1e-5)
+
+    # derivative along single input
+    expected = u
+    for _ in range(order):
+        expected = paddle.grad(expected, x, create_graph=True)[0]
+    test_result = autodiff.directional_derivative(u, x, order)
+    assert paddle.allclose(test_result, expected, atol=1e-5)
+    autodiff.clear()
+
+
+def test_directional_derivative_cache():
+    """Test for lower order derivatives are reused."""
+    x = paddle.randn([13, 2])
+    x.stop_gradient = False
+    s = x.sum(axis=1, keepdim=True)
+    u = s * s * s
+
+    u_vvv = autodiff.directional_derivative(u, x, 3, (1.0, 1.0))
+    u_vv = autodiff.directional_derivative(u, x, 2, (1.0, 1.0))
+    assert len(autodiff.directional_derivative.Ds) == 1
+    assert autodiff.directional_derivative(u, x, 3, (1.0, 1.0)) is u_vvv
+    assert paddle.allclose(u_vv, 24 * s, atol=1e-5)
+    assert paddle.allclose(u_vvv, paddle.full_like(s, 48.0))
+    autodiff.clear()
+
+
+def test_directional_derivative_invalid():
+    x = paddle.randn([13, 2])
+    x.stop_gradient = False
+    u = paddle.sin(x).sum(axis=1, keepdim=True)
+    with pytest.raises(ValueError):
+        autodiff.directional_derivative(u, x, 2)
+    with pytest.raises(ValueError):
+        autodiff.directional_derivative(u, x, 2, (1.0, 0.0, 0.0))
+    with pytest.raises(ValueError):
+        autodiff.directional_derivative(u, x, 0, (1.0, 0.0))
+
+
+if __name__ == "__main__":
+    pytest.main()
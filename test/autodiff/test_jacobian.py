@@ -0,0 +1,93 @@
+import paddle
+import pytest
+
+from ppsci import autodiff
+
+__all__ = []
+
+
+def _make_inputs(batch_size, num):
+    xs = []
+    for _ in range(num):
+        x = paddle.randn([batch_size, 1])
+        x.stop_gradient = False
+        xs.append(x)
+    return xs
+
+
+def test_jacobian_sequence_inputs():
+    """Test for jacobian w.r.t. a sequence of inputs."""
+    x, y, z = _make_inputs(13, 3)
+    u = paddle.sin(x) * y + z**2
+
+    du_dx, du_dy, du_dz = autodiff.jacobian(u, (x, y, z))
+    assert paddle.allclose(du_dx, paddle.cos(x) * y)
+    assert paddle.allclose(du_dy, paddle.sin(x))
+    assert paddle.allclose(du_dz, 2 * z)
+
+    # fetch from cache
+    assert autodiff.jacobian(u, y) is du_dy
+    autodiff.clear()
+
+
+def test_fuse_inputs():
+    """Test for gradients computed within one backward pass."""
+    x, y, t = _make_inputs(13, 3)
+    u = paddle.sin(x) * y * t
+
+    autodiff.fuse_inputs((x, y, t))
+    du_dx = autodiff.jacobian(u, x)
+    assert len(autodiff.jacobian.Js) == 3
+    du_dt = autodiff.jacobian(u, t)
+    assert paddle.allclose(du_dx, paddle.cos(x) * y * t)
+    assert paddle.allclose(du_dt, paddle.sin(x) * y)
+
+    # mixed second order derivative is computed along with hessian
+    u_xx = autodiff.hessian(u, x)
+    assert paddle.allclose(u_xx, -paddle.sin(x) * y * t)
+    u_xt = autodiff.jacobian(du_dx, t)
+    assert paddle.allclose(u_xt, paddle.cos(x) * y)
+
+    autodiff.clear()
+    assert len(autodiff.jacobian.fused_groups) == 0
+
+
+def test_fuse_inputs_unused():
+    """Test for input which is not used by output."""
+    x, y = _make_inputs(13, 2)
+    u = x * x
+
+    autodiff.fuse_inputs((x, y))
+    assert paddle.allclose(autodiff.jacobian(u, x), 2 * x)
+    with pytest.raises(Exception):
+        autodiff.jacobian(u, y)
+    autodiff.clear()
+
+
+def test_batched_chunks():
+    """Test for jacobian of chunks sliced from jacobian of whole batch."""
+    x1, y1 = _make_inputs(5, 2)
+    x2, y2 = _make_inputs(7, 2)
+    x = autodiff.concat_batch((x1, x2))
+    y = autodiff.concat_batch((y1, y2))
+    autodiff.fuse_inputs((x, y))
+    u1, u2 = autodiff.split_batch(paddle.sin(x) * y, (5, 7))
+
+    autodiff.cache_info(reset=True)
+    assert paddle.allclose(autodiff.jacobian(u1, x1), paddle.cos(x1) * y1)
+    assert paddle.allclose(autodiff.jacobian(u2, y2), paddle.sin(x2))
+    assert paddle.allclose(autodiff.hessian(u2, x2), -paddle.sin(x2) * y2)
+    assert paddle.allclose(autodiff.hessian(u1, x1), -paddle.sin(x1) * y1)
+    # one backward pass for each order
+    assert autodiff.cache_info().backward_calls == 2
+
+    # chunks of different rows are differentiated directly
+    assert paddle.allclose(autodiff.jacobian(u1 * u1, x1), 2 * u1 * paddle.cos(x1) * y1)
+    with pytest.raises(ValueError):
+        autodiff.split_batch(x, (5, 6))
+    autodiff.clear()
+    assert len(autodiff.jacobian.chunks) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
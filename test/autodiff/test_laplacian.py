@@ -0,0 +1,86 @@
+import paddle
+import pytest
+
+from ppsci import autodiff
+
+__all__ = []
+
+
+def _func(x):
+    """A non-separable function of x with shape [N, D]."""
+    return paddle.sin((x * x).sum(axis=1, keepdim=True) + x[:, :1] * x[:, 1:2])
+
+
+def _exact_laplacian(y, x):
+    grad_y = paddle.grad(y, x, create_graph=True)[0]
+    return sum(
+        paddle.grad(grad_y[:, k : k + 1], x, create_graph=True)[0][:, k : k + 1]
+        for k in range(x.shape[1])
+    )
+
+
+@pytest.mark.parametrize("dim", (2, 5))
+def test_laplacian_exact(dim):
+    """Test for exact laplacian of tensor input and sequence inputs."""
+    x = paddle.randn([13, dim])
+    x.stop_gradient = False
+    y = _func(x)
+    expected = _exact_laplacian(y, x)
+    assert paddle.allclose(autodiff.laplacian(y, x), expected, atol=1e-5)
+    autodiff.clear()
+
+    xs = [paddle.randn([13, 1]) for _ in range(dim)]
+    for _xs in xs:
+        _xs.stop_gradient = False
+    x = paddle.concat(xs, axis=1)
+    y = _func(x)
+    expected = _exact_laplacian(y, x)
+    assert paddle.allclose(autodiff.laplacian(y, xs), expected, atol=1e-5)
+    autodiff.clear()
+
+
+def test_laplacian_hutchinson():
+    """Test for hutchinson estimator, which is exact for diagonal hessian."""
+    x = paddle.randn([13, 10])
+    x.stop_gradient = False
+    y = paddle.sin(x).sum(axis=1, keepdim=True)
+    expected = -y
+    test_result = autodiff.laplacian(y, x, "hutchinson", 2)
+    assert paddle.allclose(test_result, expected, atol=1e-5)
+    autodiff.clear()
+
+
+@pytest.mark.parametrize("method", ("hutchinson", "hutch++"))
+def test_laplacian_unbiased(method):
+    """Test for randomized estimators are unbiased."""
+    x = paddle.tile(paddle.randn([1, 10]), [4000, 1])
+    x.stop_gradient = False
+    y = _func(x)
+    expected = _exact_laplacian(y, x)[0]
+
+    test_result = autodiff.laplacian(y, x, method, 6)
+    assert paddle.allclose(test_result.mean(axis=0), expected, rtol=0.05, atol=0.1)
+    autodiff.clear()
+
+
+def test_laplacian_hutchpp_full_sketch():
+    """Test for hutch++ is exact when sketch covers the whole space."""
+    x = paddle.randn([13, 10])
+    x.stop_gradient = False
+    y = _func(x)
+    expected = _exact_laplacian(y, x)
+
+    test_result = autodiff.laplacian(y, x, "hutch++", 30)
+    assert paddle.allclose(test_result, expected, atol=1e-5)
+    autodiff.clear()
+
+
+def test_laplacian_invalid_method():
+    x = paddle.randn([13, 2])
+    x.stop_gradient = False
+    with pytest.raises(ValueError):
+        autodiff.laplacian(_func(x), x, "unknown")
+
+
+if __name__ == "__main__":
+    pytest.main()
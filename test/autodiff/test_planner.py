@@ -0,0 +1,220 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+from ppsci import autodiff
+from ppsci.utils import logger
+
+__all__ = []
+
+
+def test_derivative_planner():
+    """Test for planned derivatives are equal to lazily computed ones."""
+    model = ppsci.arch.MLP(("x", "y"), ("u", "v", "p"), 3, 16)
+    equation = ppsci.equation.NavierStokes(0.01, 1.0, 2, False)
+    geom = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    constraint = ppsci.constraint.InteriorConstraint(
+        equation.equations,
+        {"continuity": 0, "momentum_x": 0, "momentum_y": 0},
+        geom,
+        {
+            "dataset": "IterableNamedArrayDataset",
+            "iters_per_epoch": 1,
+            "batch_size": 16,
+        },
+        ppsci.loss.MSELoss("mean"),
+        name="EQ",
+    )
+    planner = autodiff.DerivativePlanner(model, {"EQ": constraint})
+
+    # first order: u, v, p; second order: u_xx, u_yy, v_xx, v_yy
+    assert [len(level) for level in planner.plans["EQ"]] == [3, 4]
+    assert planner.num_backward("EQ") == (7, 10)
+
+    input_dict, _, _ = next(constraint.data_iter)
+    for v in input_dict.values():
+        v.stop_gradient = False
+    output_dict = model(input_dict)
+    data_dict = {**output_dict, **input_dict}
+
+    expected = {key: expr(data_dict) for key, expr in equation.equations.items()}
+    autodiff.clear()
+
+    planner.execute("EQ", data_dict)
+    num_computed = planner._num_computed()
+    for key, expr in equation.equations.items():
+        assert paddle.allclose(expr(data_dict), expected[key])
+    # all derivatives are fetched from cache
+    assert planner._num_computed() == num_computed
+    autodiff.clear()
+
+
+def test_batch_constraints():
+    """Test for losses and gradients computed with batched constraints."""
+    model = ppsci.arch.MLP(("x", "y"), ("u", "v", "p"), 3, 16)
+    equation = ppsci.equation.NavierStokes(0.01, 1.0, 2, False)
+    geom = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    constraint = {
+        "EQ": ppsci.constraint.InteriorConstraint(
+            equation.equations,
+            {"continuity": 0, "momentum_x": 0, "momentum_y": 0},
+            geom,
+            {
+                "dataset": "IterableNamedArrayDataset",
+                "iters_per_epoch": 1,
+                "batch_size": 16,
+            },
+            ppsci.loss.MSELoss("mean"),
+            name="EQ",
+        ),
+        "BC": ppsci.constraint.BoundaryConstraint(
+            {"u": lambda out: out["u"], "v": lambda out: out["v"]},
+            {"u": 1, "v": 0},
+            geom,
+            {
+                "dataset": "IterableNamedArrayDataset",
+                "iters_per_epoch": 1,
+                "batch_size": 8,
+            },
+            ppsci.loss.MSELoss("sum"),
+            name="BC",
+        ),
+    }
+    input_dicts, label_dicts, weight_dicts = [], [], []
+    for _constraint in constraint.values():
+        input_dict, label_dict, weight_dict = next(_constraint.data_iter)
+        for v in input_dict.values():
+            v.stop_gradient = False
+        input_dicts.append(input_dict)
+        label_dicts.append(label_dict)
+        weight_dicts.append(weight_dict)
+
+    # run in dynamic mode as Solver does by default
+    paddle.jit.enable_to_static(False)
+    forward_helper = ppsci.utils.expression.ExpressionSolver()
+    results = []
+    for batch_groups in (None, ((0, 1),)):
+        forward_helper.batch_groups = batch_groups
+        losses = forward_helper.train_forward(
+            tuple(_constraint.output_expr for _constraint in constraint.values()),
+            input_dicts,
+            model,
+            constraint,
+            label_dicts,
+            weight_dicts,
+        )
+        paddle.add_n(losses).backward()
+        grads = [param.grad.clone() for param in model.parameters()]
+        model.clear_gradients()
+        results.append((losses, grads))
+
+    for expected, actual in zip(*results):
+        for a, b in zip(expected, actual):
+            assert paddle.allclose(a, b, rtol=1e-5, atol=1e-6)
+
+
+def test_batch_groups_fused():
+    """Test for inputs of every batch group fused into one backward pass."""
+    model = ppsci.arch.MLP(("x", "y"), ("u",), 2, 8)
+    equation = ppsci.equation.Laplace(2)
+    geom = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    constraint = {
+        name: ppsci.constraint.InteriorConstraint(
+            equation.equations,
+            {"laplace": 0},
+            geom,
+            {
+                "dataset": "IterableNamedArrayDataset",
+                "iters_per_epoch": 1,
+                "batch_size": 8,
+            },
+            ppsci.loss.MSELoss("mean"),
+            name=name,
+        )
+        for name in ("A", "B", "C", "D")
+    }
+    input_dicts, label_dicts, weight_dicts = [], [], []
+    for _constraint in constraint.values():
+        input_dict, label_dict, weight_dict = next(_constraint.data_iter)
+        for v in input_dict.values():
+            v.stop_gradient = False
+        input_dicts.append(input_dict)
+        label_dicts.append(label_dict)
+        weight_dicts.append(weight_dict)
+
+    paddle.jit.enable_to_static(False)
+    forward_helper = ppsci.utils.expression.ExpressionSolver()
+
+    def backward_calls(num_constraints, batch_groups):
+        names = tuple(constraint)[:num_constraints]
+        forward_helper.batch_groups = batch_groups
+        autodiff.cache_info(reset=True)
+        forward_helper.train_forward(
+            tuple(constraint[name].output_expr for name in names),
+            input_dicts[:num_constraints],
+            model,
+            {name: constraint[name] for name in names},
+            label_dicts[:num_constraints],
+            weight_dicts[:num_constraints],
+        )
+        return autodiff.cache_info(reset=True).backward_calls
+
+    # u_x and u_y within one pass, u_xx and u_yy within one pass respectively
+    single_group = backward_calls(2, ((0, 1),))
+    assert single_group == 3
+    # every group computes derivatives with fused inputs of its own
+    assert backward_calls(4, ((0, 1), (2, 3))) == 2 * single_group
+
+
+def test_solver_batch_constraints(tmp_path):
+    """Test for batching profiled without consuming data of constraints."""
+    logger.init_logger()
+    model = ppsci.arch.MLP(("x", "y"), ("u",), 2, 8)
+    geom = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    constraint = {
+        name: ppsci.constraint.InteriorConstraint(
+            {"u": lambda out: out["u"]},
+            {"u": 0},
+            geom,
+            {
+                "dataset": "NamedArrayDataset",
+                "iters_per_epoch": 2,
+                "batch_size": 8,
+                "sampler": {"name": "BatchSampler", "shuffle": False},
+            },
+            ppsci.loss.MSELoss("mean"),
+            name=name,
+        )
+        for name in ("A", "B")
+    }
+    consumed = []
+
+    def count(data_iter):
+        for batch in data_iter:
+            consumed.append(batch)
+            yield batch
+
+    for _constraint in constraint.values():
+        _constraint.data_iter = count(_constraint.data_iter)
+
+    solver = ppsci.solver.Solver(
+        model,
+        constraint,
+        str(tmp_path),
+        ppsci.optimizer.Adam(1e-3)(model),
+        epochs=1,
+        iters_per_epoch=2,
+        device="cpu",
+        batch_constraints=True,
+    )
+    assert solver.forward_helper.batch_groups == ((0, 1),)
+    assert not consumed
+    # first batch of data stream is still the leading samples
+    input_dict, _, _ = next(constraint["A"].data_iter)
+    dataset = constraint["A"].data_loader.dataset
+    np.testing.assert_array_equal(input_dict["x"].numpy(), dataset.input["x"][:8])
+
+
+if __name__ == "__main__":
+    pytest.main()
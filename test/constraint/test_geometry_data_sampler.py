@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import ppsci
+from ppsci.constraint import base
+
+__all__ = []
+
+
+def test_geometry_data_sampler():
+    """Test for label and weight prepared for points sampled from geometry."""
+    rect = ppsci.geometry.Rectangle((0, 0), (1, 2))
+    sampler = base.GeometryDataSampler(
+        rect.sample_interior,
+        rect.dim_keys,
+        {"u": 1, "v": "x + y", "w": lambda d: d["x"] * 2},
+        {"u": "sdf", "v": 0.5},
+        batch_size=25,
+    )
+    input, label, weight = sampler(100)
+    x, y = input["x"], input["y"]
+    np.testing.assert_allclose(label["u"], np.ones_like(x))
+    np.testing.assert_allclose(label["v"], x + y, rtol=1e-6)
+    np.testing.assert_allclose(label["w"], x * 2, rtol=1e-6)
+    np.testing.assert_allclose(weight["u"], -rect.sdf_func(np.hstack((x, y))))
+    np.testing.assert_allclose(weight["v"], 0.5)
+    np.testing.assert_allclose(weight["w"], 1.0)
+    # signed distance is only used as weight
+    assert "sdf" not in input
+
+    # area of points in one batch sums up to area of geometry, e.g. mesh
+    def sample_with_area(n, random, criteria, evenly):
+        return {
+            "x": np.random.rand(n, 1).astype("float32"),
+            "area": np.full([n, 1], 3.0 / n, "float32"),
+        }
+
+    data_sampler = base.GeometryDataSampler(
+        sample_with_area, ("x",), {"u": 0}, None, batch_size=25
+    )
+    for num_samples in (100, 10):
+        input, _, _ = data_sampler(num_samples)
+        np.testing.assert_allclose(input["area"], 3.0 / 25, rtol=1e-6)
+
+    with pytest.raises(NotImplementedError):
+        base.GeometryDataSampler(
+            rect.sample_interior, rect.dim_keys, {"u": [1, 2]}, None, 10
+        )(10)
+
+
+if __name__ == "__main__":
+    pytest.main()
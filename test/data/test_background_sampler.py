@@ -0,0 +1,84 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+from ppsci.data import dataloader
+
+__all__ = []
+
+
+def test_background_sampler():
+    """Test for data sampled in background process."""
+    np.random.seed(42)
+    sampler = dataloader.BackgroundSampler(lambda: np.random.rand(4, 2))
+    sampler.start()
+    x1, x2 = sampler.get(), sampler.get()
+    assert x1.shape == (4, 2)
+    assert not np.allclose(x1, x2)
+
+    # reproducible given random seed
+    np.random.seed(42)
+    sampler = dataloader.BackgroundSampler(lambda: np.random.rand(4, 2))
+    sampler.start()
+    np.testing.assert_array_equal(sampler.get(), x1)
+
+    def sample_func():
+        raise KeyError("x")
+
+    sampler = dataloader.BackgroundSampler(sample_func)
+    sampler.start()
+    with pytest.raises(RuntimeError, match="KeyError"):
+        sampler.get()
+
+
+@pytest.mark.parametrize(
+    "dataloader_cfg",
+    [
+        {
+            "dataset": "NamedArrayDataset",
+            "sampler": {"name": "BatchSampler", "shuffle": False, "drop_last": True},
+        },
+        {"dataset": "IterableNamedArrayDataset"},
+    ],
+)
+@pytest.mark.parametrize("num_prefetch", [0, 2])
+def test_resample(dataloader_cfg, num_prefetch):
+    """Test for constraint whose points are resampled for every epoch."""
+    rect = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    disk = ppsci.geometry.Disk((0.5, 0.5), 0.3)
+    dataloader_cfg = {**dataloader_cfg, "batch_size": 8, "iters_per_epoch": 2}
+    for constraint_cls, geom in (
+        (ppsci.constraint.InteriorConstraint, rect - disk),
+        (ppsci.constraint.BoundaryConstraint, rect),
+    ):
+        constraint = constraint_cls(
+            {"u": lambda out: out["u"]},
+            {"u": lambda out: out["x"] + out["y"]},
+            geom,
+            dataloader_cfg,
+            ppsci.loss.MSELoss("mean"),
+            resample=True,
+        )
+        if num_prefetch > 0:
+            constraint.data_iter = ppsci.data.dataloader.Prefetcher(
+                constraint.data_iter, num_prefetch
+            )
+        epochs = []
+        for _ in range(3):
+            batches = [next(constraint.data_iter) for _ in range(2)]
+            x = np.concatenate([paddle.to_tensor(b[0]["x"]).numpy() for b in batches])
+            y = np.concatenate([paddle.to_tensor(b[0]["y"]).numpy() for b in batches])
+            u = np.concatenate([paddle.to_tensor(b[1]["u"]).numpy() for b in batches])
+            np.testing.assert_allclose(u, x + y, rtol=1e-6)
+            if constraint_cls is ppsci.constraint.InteriorConstraint:
+                assert np.all(geom.is_inside(np.hstack((x, y))))
+            else:
+                assert np.all(geom.on_boundary(np.hstack((x, y))))
+            epochs.append(x)
+        assert not np.allclose(epochs[0], epochs[1])
+        assert not np.allclose(epochs[1], epochs[2])
+
+
+if __name__ == "__main__":
+    pytest.main()
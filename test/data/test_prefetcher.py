@@ -0,0 +1,74 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+from ppsci.data import dataloader
+from ppsci.utils import logger
+
+__all__ = []
+
+
+def _batches(num):
+    for i in range(num):
+        yield {"x": np.full([4, 1], i, "float32")}, {"u": paddle.zeros([4, 1])}, {}
+
+
+def test_prefetcher():
+    """Test for batches fetched by prefetcher are in the same order."""
+    prefetcher = dataloader.Prefetcher(_batches(5), 2)
+    for i in range(5):
+        input_dict, label_dict, weight_dict = next(prefetcher)
+        assert paddle.is_tensor(input_dict["x"])
+        assert not input_dict["x"].stop_gradient
+        assert np.all(input_dict["x"].numpy() == i)
+        assert "u" in label_dict and weight_dict == {}
+
+    # exhausted iterator is reported to every following call
+    for _ in range(2):
+        with pytest.raises(StopIteration):
+            next(prefetcher)
+
+    with pytest.raises(ValueError):
+        dataloader.Prefetcher(_batches(1), 0)
+
+
+@pytest.mark.parametrize("num_prefetch", [0, 2])
+def test_update_dataset(num_prefetch):
+    """Test for batches drawn after data of constraint is replaced."""
+    logger.init_logger()
+
+    def _data(num):
+        x = np.arange(num, dtype="float32").reshape([num, 1])
+        return {"x": x}, {"u": x}, {"u": np.ones_like(x)}
+
+    input, label, weight = _data(16)
+    constraint = ppsci.constraint.SupervisedConstraint(
+        {
+            "dataset": {
+                "name": "NamedArrayDataset",
+                "input": input,
+                "label": label,
+                "weight": weight,
+            },
+            "batch_size": 4,
+            "sampler": {"name": "BatchSampler", "shuffle": False, "drop_last": False},
+        },
+        ppsci.loss.MSELoss("mean"),
+        {"u": lambda out: out["x"]},
+    )
+    if num_prefetch > 0:
+        constraint.data_iter = dataloader.Prefetcher(constraint.data_iter, num_prefetch)
+    next(constraint.data_iter)
+
+    # indices of old pass are dropped, and a new pass covers all of new data
+    input, label, weight = _data(24)
+    constraint.update_dataset(input, label, weight)
+    x = np.concatenate(
+        [paddle.to_tensor(next(constraint.data_iter)[0]["x"]).numpy() for _ in range(6)]
+    )
+    np.testing.assert_array_equal(x, input["x"])
+
+
+if __name__ == "__main__":
+    pytest.main()
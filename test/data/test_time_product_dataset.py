@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from ppsci.data import dataset
+from ppsci.utils import misc
+
+__all__ = []
+
+
+def test_combine_array_with_time():
+    """Test for combining spatial points with time sequence."""
+    x = np.random.rand(5, 2)
+    t = np.linspace(0, 1, 3)
+    tx = misc.combine_array_with_time(x, t)
+    assert tx.shape == (15, 3)
+    expected = np.vstack([np.hstack((np.full([5, 1], ti), x)) for ti in t])
+    np.testing.assert_allclose(tx, expected, rtol=1e-6)
+    np.testing.assert_allclose(misc.combine_array_with_time(x, t[:, None]), tx)
+
+
+def test_time_x_product_dataset():
+    """Test for samples of virtual product, which should be identical to samples of
+    materialized product."""
+    t = np.linspace(0, 1, 4)
+    input = {"x": np.random.rand(6, 1), "y": np.random.rand(6, 1)}
+    label = {"u": np.random.rand(6, 1), "v": np.random.rand(24, 1)}
+    weight = {"u": np.random.rand(24, 1)}
+    _dataset = dataset.TimeXProductDataset(t, input, label, weight)
+    assert len(_dataset) == 24
+    assert _dataset.input_keys == ("t", "x", "y")
+
+    tx = misc.combine_array_with_time(np.hstack((input["x"], input["y"])), t)
+    for idx in (0, 5, 6, 23):
+        input_item, label_item, weight_item = _dataset[idx]
+        np.testing.assert_allclose(input_item["t"], tx[idx, 0:1])
+        np.testing.assert_allclose(input_item["x"], tx[idx, 1:2], rtol=1e-6)
+        np.testing.assert_allclose(input_item["y"], tx[idx, 2:3], rtol=1e-6)
+        np.testing.assert_array_equal(label_item["u"], label["u"][idx % 6])
+        np.testing.assert_array_equal(label_item["v"], label["v"][idx])
+        np.testing.assert_array_equal(weight_item["u"], weight["u"][idx])
+
+    # a batch of indices is supported as well
+    input_item, _, _ = _dataset[np.array([1, 7, 13])]
+    assert input_item["x"].shape == (3, 1)
+
+    with pytest.raises(ValueError):
+        dataset.TimeXProductDataset(t, input, {"u": np.random.rand(7, 1)})
+
+
+if __name__ == "__main__":
+    pytest.main()
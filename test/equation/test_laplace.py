@@ -60,6 +60,11 @@ def test_l1loss_mean(dim):
     # check result whether is equal
     assert paddle.allclose(expected_result, test_result)
 
+    # hutch++ is exact when number of sketch vectors reaches dimension
+    laplace_equation = equation.Laplace(dim=dim, method="hutch++", num_probes=3 * dim)
+    test_result = laplace_equation.equations["laplace"](data_dict)
+    assert paddle.allclose(expected_result, test_result, atol=1e-6)
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,146 @@
+import collections
+
+import numpy as np
+import pytest
+
+from ppsci import geometry
+from ppsci.geometry import csg
+
+__all__ = []
+
+
+@pytest.mark.parametrize(
+    "geom",
+    [
+        geometry.Interval(-1, 2),
+        geometry.Disk((0.5, 0.5), 0.5),
+        geometry.Rectangle((0, 0), (2, 1)),
+        geometry.Triangle((0, 0), (2, 0), (0, 1)),
+        geometry.Polygon(((0, 0), (1, 0), (2, 1), (2, 2), (0, 2))),
+    ],
+)
+def test_primitive_sdf(geom):
+    """Test for sign and value of sdf of primitives."""
+    np.random.seed(42)
+    x = geom.random_points(200)
+    sdf = geom.sdf_func(x)
+    assert sdf.shape == (200, 1)
+    # sdf is negative inside and 0 on boundary
+    assert np.all(sdf <= 0)
+    np.testing.assert_allclose(
+        geom.sdf_func(geom.random_boundary_points(200)), 0, atol=1e-5
+    )
+    # distance to nearest boundary point
+    boundary = geom.uniform_boundary_points(20000)
+    dist = np.linalg.norm(x[:, None] - boundary[None], axis=-1).min(1)
+    np.testing.assert_allclose(-sdf[:, 0], dist, atol=2e-3)
+
+
+def test_csg_sdf():
+    """Test for sdf of CSG geometries."""
+    np.random.seed(42)
+    rect = geometry.Rectangle((0, 0), (2, 1))
+    disk = geometry.Disk((2, 0.5), 0.5)
+    geoms = [rect | disk, rect - disk, rect & disk, (rect - disk) | (rect & disk)]
+    x = np.random.uniform((-0.5, -0.5), (3, 1.5), (5000, 2)).astype("float32")
+    d1, d2 = rect.sdf_func(x), disk.sdf_func(x)
+    expected = [
+        np.minimum(d1, d2),
+        np.maximum(d1, -d2),
+        np.maximum(d1, d2),
+        np.minimum(np.maximum(d1, -d2), np.maximum(d1, d2)),
+    ]
+    for geom, sdf in zip(geoms, expected):
+        np.testing.assert_allclose(geom.sdf_func(x), sdf)
+        # sign agrees with is_inside away from boundary
+        far = np.abs(sdf[:, 0]) > 1e-4
+        np.testing.assert_array_equal(geom.is_inside(x[far]), sdf[far, 0] < 0)
+        data = geom.sample_interior(100)
+        assert data["sdf"].shape == (100, 1)
+        assert np.all(data["sdf"] >= -1e-6)
+
+    # smooth blending only rounds off sdf near where geometries meet
+    smooth = rect.union(disk, smoothness=0.2)
+    sdf = smooth.sdf_func(x)
+    assert np.all(sdf <= expected[0] + 1e-6)
+    far = np.abs(d1 - d2)[:, 0] > 0.2
+    np.testing.assert_allclose(sdf[far], expected[0][far])
+    assert np.any(sdf[~far] < expected[0][~far] - 1e-3)
+    np.testing.assert_array_equal(smooth.is_inside(x), (rect | disk).is_inside(x))
+
+    # sdf is unavailable if any operand has no sdf
+    geom = rect | geometry.Hypersphere((2, 0.5), 0.5)
+    assert not hasattr(geom, "sdf_func")
+    assert "sdf" not in geom.sample_interior(10)
+
+
+def test_csg_evaluation_context():
+    """Test for predicates of each primitive evaluated once in CSG tree."""
+    np.random.seed(42)
+    calls = collections.Counter()
+    active = []
+
+    def count_calls(geom):
+        for name in ("is_inside", "on_boundary", "boundary_normal"):
+
+            def wrapper(x, func=getattr(geom, name), name=name):
+                # predicates called by primitive itself are not counted
+                if not active:
+                    calls[id(geom), name] += 1
+                active.append(name)
+                try:
+                    return func(x)
+                finally:
+                    active.pop()
+
+            setattr(geom, name, wrapper)
+        return geom
+
+    rect = count_calls(geometry.Rectangle((0, 0), (2, 1)))
+    disk1 = count_calls(geometry.Disk((0, 0.5), 0.5))
+    disk2 = count_calls(geometry.Disk((2, 0.5), 0.3))
+    # rect is shared by both branches
+    geom = ((rect | disk1) - disk2) | (rect & disk2)
+    x = np.vstack(
+        (geom.random_boundary_points(500), np.random.uniform(-1, 3, (500, 2)))
+    )
+
+    # compose predicates of primitives by hand
+    in_r, in_d1, in_d2 = rect.is_inside(x), disk1.is_inside(x), disk2.is_inside(x)
+    on_r, on_d1, on_d2 = rect.on_boundary(x), disk1.on_boundary(x), disk2.on_boundary(x)
+    n_r, n_d1, n_d2 = (
+        rect.boundary_normal(x),
+        disk1.boundary_normal(x),
+        disk2.boundary_normal(x),
+    )
+    in_u, in_a, in_b = in_r | in_d1, (in_r | in_d1) & ~in_d2, in_r & in_d2
+    on_u = on_r & ~in_d1 | on_d1 & ~in_r
+    on_a = on_u & ~in_d2 | in_u & on_d2
+    on_b = on_r & in_d2 | in_r & on_d2
+    n_u = (on_r & ~in_d1)[:, None] * n_r + (on_d1 & ~in_r)[:, None] * n_d1
+    n_a = (on_u & ~in_d2)[:, None] * n_u - (in_u & on_d2)[:, None] * n_d2
+    n_b = (on_r & in_d2)[:, None] * n_r + (in_r & on_d2)[:, None] * n_d2
+    expected_normal = (on_a & ~in_b)[:, None] * n_a + (on_b & ~in_a)[:, None] * n_b
+
+    calls.clear()
+    np.testing.assert_array_equal(geom.on_boundary(x), on_a & ~in_b | on_b & ~in_a)
+    assert max(calls.values()) == 1
+
+    calls.clear()
+    with csg.evaluation_context(x):
+        normal = geom.boundary_normal(x)
+        inside = geom.is_inside(x)
+        assert np.all(geom.on_boundary(x)[:500])
+    assert max(calls.values()) == 1
+    np.testing.assert_array_equal(inside, in_a | in_b)
+    np.testing.assert_allclose(normal, expected_normal)
+
+    # context is released after call
+    calls.clear()
+    geom.is_inside(x)
+    geom.is_inside(x)
+    assert calls[id(rect), "is_inside"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
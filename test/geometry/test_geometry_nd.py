@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from ppsci import geometry
+
+__all__ = []
+
+
+@pytest.mark.parametrize("ndim", [4, 8, 16])
+def test_high_dim_uniform_points(ndim):
+    """Test for evenly distributed points of high-dimensional geometries."""
+    n = 5000
+    cube = geometry.Hypercube([-1] * ndim, [2] * ndim)
+    sphere = geometry.Hypersphere([1] * ndim, 0.5)
+    for geom in (cube, sphere):
+        x = geom.uniform_points(n)
+        assert x.shape == (n, ndim)
+        assert np.all(geom.is_inside(x))
+        np.testing.assert_array_equal(x, geom.uniform_points(n))
+        data = geom.sample_interior(n, evenly=True)
+        assert data["x0"].shape == (n, 1)
+
+    # points fill the whole hypercube rather than a truncated grid
+    x = (cube.uniform_points(n) + 1) / 3
+    counts = np.stack([np.histogram(x[:, j], 5, (0, 1))[0] for j in range(ndim)])
+    assert np.all(np.abs(counts - n / 5) <= 20)
+
+    x = sphere.uniform_boundary_points(n)
+    assert np.all(sphere.on_boundary(x))
+    # mean of evenly distributed points is close to center
+    np.testing.assert_allclose(x.mean(0), sphere.center, atol=0.02)
+    np.testing.assert_allclose(
+        sphere.uniform_points(n).mean(0), sphere.center, atol=0.02
+    )
+
+
+def test_low_dim_uniform_points():
+    """Test for grid points of low-dimensional hypercube."""
+    x = geometry.Hypercube((0, 0), (1, 1)).uniform_points(100)
+    assert x.shape == (100, 2)
+    np.testing.assert_array_equal(
+        np.unique(x[:, 0]), np.linspace(0, 1, 10, dtype=x.dtype)
+    )
+
+
+if __name__ == "__main__":
+    pytest.main()
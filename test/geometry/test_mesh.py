@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from ppsci.geometry import mesh
+from ppsci.geometry import sampler
+
+__all__ = []
+
+
+def _unit_cube_triangles():
+    """Twelve triangles of unit cube surface."""
+    corners = np.array(
+        [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype="float64"
+    )
+    faces = np.array(
+        [
+            [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5],
+            [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+            [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+        ]
+    )  # fmt: skip
+    return corners[faces[:, 0]], corners[faces[:, 1]], corners[faces[:, 2]]
+
+
+@pytest.mark.parametrize("random", ["pseudo", "Halton", "LHS"])
+def test_sample_in_triangles(random):
+    """Test for points sampled on triangles in batch."""
+    v0, v1, v2 = _unit_cube_triangles()
+    n = 1000
+    points, index = mesh.sample_in_triangles(v0, v1, v2, n, random)
+    assert points.shape == (n, 3)
+    assert index.shape == (n,)
+    assert np.all(np.diff(index) >= 0)
+
+    # every point lies in its own triangle
+    e1, e2 = v1[index] - v0[index], v2[index] - v0[index]
+    d = points - v0[index]
+    normal = np.cross(e1, e2)
+    assert np.allclose(np.einsum("ij,ij->i", d, normal), 0, atol=1e-5)
+    u = np.einsum("ij,ij->i", np.cross(d, e2), normal) / np.sum(normal**2, 1)
+    v = np.einsum("ij,ij->i", np.cross(e1, d), normal) / np.sum(normal**2, 1)
+    assert np.all(u >= -1e-5) and np.all(v >= -1e-5) and np.all(u + v <= 1 + 1e-5)
+
+    # triangles of equal area are drawn evenly
+    counts = np.bincount(index, minlength=len(v0))
+    assert counts.min() > n / len(v0) * 0.5
+
+
+def test_build_occupancy_grid():
+    """Test for occupancy grid which covers unit ball."""
+    bounds = ((-1.0, 1.0),) * 3
+    corners, on_boundary, voxel_size = mesh.build_occupancy_grid(
+        bounds, lambda x: 1 - np.linalg.norm(x, axis=1), 16
+    )
+    assert voxel_size == pytest.approx(0.125)
+    assert 0 < on_boundary.sum() < len(corners) < 16**3
+
+    # every point inside ball falls in kept voxels
+    points = np.random.uniform(-1, 1, [20000, 3])
+    points = points[np.linalg.norm(points, axis=1) < 1]
+    kept = {tuple(index) for index in np.round((corners + 1) / voxel_size)}
+    assert all(tuple(index) in kept for index in (points + 1) // voxel_size)
+
+    # voxels not intersected by sphere lie inside entirely
+    far_corners = corners[~on_boundary][:, None] + voxel_size * np.array(
+        [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+    )
+    assert np.all(np.linalg.norm(far_corners, axis=-1) < 1)
+
+
+@pytest.mark.parametrize("method", ["Sobol", "Halton", "Hammersley", "Kronecker"])
+def test_sample_in_voxels(method):
+    """Test for quasi-random points spread evenly over voxels across calls."""
+    voxel_size = 0.25
+    # 13 voxels of a staircase
+    voxel_index = [[x, y] for x in range(4) for y in range(4) if x + y < 5]
+    voxel_corners = np.array(voxel_index, dtype="float64") * voxel_size
+    engine = sampler.QuasiRandomEngine(method, scramble=False)
+    n = 13 * 64
+    results = [
+        mesh.sample_in_voxels(voxel_corners, voxel_size, n, engine) for _ in range(2)
+    ]
+    for points, index in results:
+        offset = points - voxel_corners[index]
+        assert np.all((offset >= 0) & (offset <= voxel_size))
+        # stratified over voxels, far more even than pseudo random draws
+        counts = np.bincount(index, minlength=len(voxel_corners))
+        assert counts.max() - counts.min() <= 6
+    # candidates of successive calls are not repeated
+    assert len(np.unique(np.concatenate([results[0][0], results[1][0]]), axis=0)) == (
+        2 * n
+    )
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from ppsci import geometry
+from ppsci.geometry import sampler
+
+__all__ = []
+
+
+@pytest.fixture
+def num_workers():
+    sampler.set_num_workers(3)
+    yield 3
+    sampler.set_num_workers(1)
+
+
+def test_parallel_sample(num_workers, monkeypatch):
+    """Test for reproducibility of sampling points in parallel."""
+    monkeypatch.setattr(sampler, "MIN_POINTS_PER_WORKER", 100)
+    rect = geometry.Rectangle((0, 0), (2, 1))
+    geom = rect - geometry.Disk((1, 0.5), 0.2)
+    n = 1000
+
+    np.random.seed(42)
+    x1 = geom.sample_interior(n, criteria=lambda x, y: x > 0.5)
+    b1 = geom.sample_boundary(n)
+    np.random.seed(42)
+    x2 = geom.sample_interior(n, criteria=lambda x, y: x > 0.5)
+    b2 = geom.sample_boundary(n)
+    for key in x1:
+        np.testing.assert_array_equal(x1[key], x2[key])
+    for key in b1:
+        np.testing.assert_array_equal(b1[key], b2[key])
+    assert x1["x"].shape == (n, 1) and b1["normal_x"].shape == (n, 1)
+    assert np.all(x1["x"] > 0.5)
+    points = np.hstack((x1["x"], x1["y"]))
+    assert np.all(geom.is_inside(points))
+    # workers sample different points
+    assert len(np.unique(points, axis=0)) == n
+
+    # serial sampling is not affected
+    sampler.set_num_workers(1)
+    np.random.seed(42)
+    x3 = geom.sample_interior(n, criteria=lambda x, y: x > 0.5)
+    assert not np.allclose(x1["x"], x3["x"])
+
+    # evenly spaced points are never split across workers
+    sampler.set_num_workers(num_workers)
+    x4 = rect.sample_interior(n, evenly=True)
+    sampler.set_num_workers(1)
+    x5 = rect.sample_interior(n, evenly=True)
+    np.testing.assert_array_equal(x4["x"], x5["x"])
+
+
+def test_parallel_sample_lhs(num_workers, monkeypatch):
+    """Test for stratification of LHS points when parallel sampling is enabled."""
+    monkeypatch.setattr(sampler, "MIN_POINTS_PER_WORKER", 100)
+    n = 1000
+    assert sampler.is_parallel(n, "pseudo")
+    assert not sampler.is_parallel(n, "LHS")
+
+    rect = geometry.Rectangle((0, 0), (2, 1))
+    x = rect.sample_interior(n, random="LHS")
+    strata = np.arange(n + 1) / n
+    for key, length in (("x", 2), ("y", 1)):
+        # each of the n strata holds exactly one point
+        coord = np.sort(x[key][:, 0]) / length
+        assert np.all(coord >= strata[:-1] - 1e-6)
+        assert np.all(coord <= strata[1:] + 1e-6)
+
+
+def test_parallel_sample_area(monkeypatch):
+    """Test for merging chunks and rescaling area."""
+    monkeypatch.setattr(sampler, "MIN_POINTS_PER_WORKER", 10)
+
+    def sample_func(n, value):
+        return {
+            "x": np.random.rand(n, 2),
+            "area": np.full((n, 1), value / n),
+            "seed": np.full((n, 1), np.random.randint(2**31)),
+        }
+
+    data = sampler.parallel_sample(sample_func, 100, 4.0, num_workers=3)
+    assert data["x"].shape == (100, 2)
+    np.testing.assert_allclose(data["area"].sum(), 4.0)
+    # chunks are merged in order with independent streams
+    for chunk in np.split(data["seed"], [34, 67]):
+        assert len(np.unique(chunk)) == 1
+    assert len(np.unique(data["seed"])) == 3
+
+    def fail_func(n):
+        raise ValueError("sampling failed")
+
+    with pytest.raises(RuntimeError, match="sampling failed"):
+        sampler.parallel_sample(fail_func, 100, num_workers=2)
+
+
+if __name__ == "__main__":
+    pytest.main()
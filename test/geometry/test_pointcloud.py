@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from ppsci import geometry
+from ppsci.utils import cache
+
+__all__ = []
+
+
+def _brute_force_isin(x, points):
+    return np.isclose(x[:, None, :] - points[None], 0, atol=1e-6).all(2).any(1)
+
+
+def test_pointcloud_membership():
+    """Test for membership query of point cloud against brute force."""
+    np.random.seed(42)
+    interior = np.random.rand(1000, 2).astype("float32")
+    boundary = np.random.rand(200, 2).astype("float32")
+    geom = geometry.PointCloud(
+        {"x": interior[:, 0:1], "y": interior[:, 1:2]},
+        ("x", "y"),
+        {"x": boundary[:, 0:1], "y": boundary[:, 1:2]},
+    )
+    x = np.concatenate(
+        (interior[::3], interior[1::3] + 5e-7, boundary[::2], np.random.rand(300, 2))
+    )
+    np.testing.assert_array_equal(geom.is_inside(x), _brute_force_isin(x, interior))
+    np.testing.assert_array_equal(geom.on_boundary(x), _brute_force_isin(x, boundary))
+
+    # index is rebuilt after translate and scale
+    geom.translate((1.0, 2.0)).scale((2.0, 0.5))
+    x_new = (x + (1.0, 2.0)) * (2.0, 0.5)
+    np.testing.assert_array_equal(
+        geom.is_inside(x_new), _brute_force_isin(x_new, geom.interior)
+    )
+    np.testing.assert_array_equal(
+        geom.on_boundary(x_new), _brute_force_isin(x_new, geom.boundary)
+    )
+    assert geom.is_inside(x_new[: len(interior[::3])]).all()
+
+    with pytest.raises(ValueError):
+        geometry.PointCloud({"x": interior[:, 0:1]}, ("x",)).on_boundary(x[:, 0:1])
+
+
+def test_pointcloud_neighbors():
+    """Test for nearest-neighbor and radius queries of point cloud."""
+    np.random.seed(42)
+    interior = np.random.rand(500, 3)
+    geom = geometry.PointCloud(
+        {key: interior[:, i : i + 1] for i, key in enumerate("xyz")}, ("x", "y", "z")
+    )
+    x = np.random.rand(100, 3)
+    dist_matrix = np.linalg.norm(x[:, None] - interior[None], axis=-1)
+
+    dist, index = geom.query_nearest(x)
+    np.testing.assert_array_equal(index, dist_matrix.argmin(1))
+    np.testing.assert_allclose(dist, dist_matrix.min(1))
+    dist, index = geom.query_nearest(x, k=4)
+    np.testing.assert_allclose(dist, np.sort(dist_matrix, 1)[:, :4])
+
+    neighbors = geom.query_radius(x, 0.1)
+    for i in range(len(x)):
+        assert sorted(neighbors[i]) == np.nonzero(dist_matrix[i] <= 0.1)[0].tolist()
+
+
+def test_pointcloud_fingerprint():
+    """Test for fingerprint of point cloud determined by its points only."""
+    np.random.seed(42)
+    interior = np.random.rand(100, 2).astype("float32")
+    boundary = np.random.rand(20, 2).astype("float32")
+
+    def build(interior, boundary):
+        return geometry.PointCloud(
+            {"x": interior[:, 0:1], "y": interior[:, 1:2]},
+            ("x", "y"),
+            {"x": boundary[:, 0:1], "y": boundary[:, 1:2]},
+        )
+
+    geom = build(interior, boundary)
+    assert cache.fingerprint(geom) == cache.fingerprint(build(interior, boundary))
+    assert cache.fingerprint(geom) != cache.fingerprint(build(interior, boundary[1:]))
+    key = cache.fingerprint(geom)
+    geom.translate((1.0, 0.0))
+    assert cache.fingerprint(geom) != key
+
+
+if __name__ == "__main__":
+    pytest.main()
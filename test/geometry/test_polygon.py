@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ppsci import geometry
+
+__all__ = []
+
+
+def _star_polygon(num_vertices):
+    """Star-shaped polygon with random radii in clockwise order."""
+    theta = np.linspace(2 * np.pi, 0, num_vertices, endpoint=False)
+    r = 1 + 0.5 * np.random.rand(num_vertices)
+    return np.stack((r * np.cos(theta), r * np.sin(theta)), axis=1)
+
+
+def _brute_force_is_inside(x, vertices):
+    """Ray casting against each edge in loop."""
+    inside = np.zeros(len(x), dtype=bool)
+    for i in range(-1, len(vertices) - 1):
+        (x0, y0), (x1, y1) = vertices[i], vertices[i + 1]
+        if y0 == y1:
+            continue
+        cross = (y0 <= x[:, 1]) != (y1 <= x[:, 1])
+        x_int = x0 + (x[:, 1] - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= cross & (x[:, 0] < x_int)
+    return inside
+
+
+def _brute_force_on_boundary(x, vertices, diagonals):
+    """Test distance to vertices of each edge in loop."""
+    on = np.zeros(len(x), dtype=bool)
+    for i in range(-1, len(vertices) - 1):
+        l1 = np.linalg.norm(vertices[i] - x, axis=-1)
+        l2 = np.linalg.norm(vertices[i + 1] - x, axis=-1)
+        on |= np.isclose(l1 + l2, diagonals[i, i + 1])
+    return on
+
+
+@pytest.mark.parametrize("num_vertices", [8, 200])
+@pytest.mark.parametrize("edge_index", [False, True])
+def test_polygon_is_inside(num_vertices, edge_index):
+    """Test for point-in-polygon test with and without edge index."""
+    np.random.seed(42)
+    vertices = _star_polygon(num_vertices)
+    geom = geometry.Polygon(vertices, edge_index)
+    assert (geom._slab_edges is not None) == edge_index
+    # vertices are re-ordered in counterclockwise
+    np.testing.assert_allclose(geom.vertices, np.flipud(vertices).astype("float32"))
+
+    x = np.random.uniform(-2, 2, (20000, 2))
+    np.testing.assert_array_equal(
+        geom.is_inside(x), _brute_force_is_inside(x, geom.vertices)
+    )
+    # points at same height as vertices
+    x = np.stack((np.random.uniform(-2, 2, num_vertices), geom.vertices[:, 1]), 1)
+    np.testing.assert_array_equal(
+        geom.is_inside(x), _brute_force_is_inside(x, geom.vertices)
+    )
+
+
+def test_polygon_on_boundary():
+    """Test for on-boundary test of polygon."""
+    np.random.seed(42)
+    geom = geometry.Polygon(_star_polygon(100))
+    x = geom.random_boundary_points(1000)
+    np.testing.assert_array_equal(
+        geom.on_boundary(x), _brute_force_on_boundary(x, geom.vertices, geom.diagonals)
+    )
+    assert geom.on_boundary(x).mean() > 0.99
+    assert geom.on_boundary(geom.vertices).all()
+    assert not geom.on_boundary(x * 1.01).any()
+    assert not geom.on_boundary(np.zeros([1, 2])).any()
+
+    data = geom.sample_interior(1000)
+    assert geom.is_inside(np.hstack((data["x"], data["y"]))).all()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from ppsci import geometry
+from ppsci.geometry import sampler
+
+__all__ = []
+
+
+def test_rejection_sample():
+    """Test for rejection sampling with low acceptance ratio."""
+    num_draws = []
+
+    def sample_func(num_draw):
+        num_draws.append(num_draw)
+        x = np.random.rand(num_draw, 2)
+        return x[x[:, 0] < 0.01]
+
+    x = sampler.rejection_sample(sample_func, 1000)
+    assert x.shape == (1000, 2)
+    assert np.all(x[:, 0] < 0.01)
+    # over-draw according to acceptance ratio after first round
+    assert len(num_draws) <= 3
+    assert num_draws[1] > 50 * 1000
+
+    with pytest.raises(ValueError):
+        sampler.rejection_sample(lambda m: np.empty([0, 2]), 10, max_trials=5)
+
+
+def test_sample_with_criteria():
+    """Test for sampling geometry with tight criteria."""
+    rect = geometry.Rectangle((0, 0), (1, 1))
+    disk = geometry.Disk((0.5, 0.5), 0.2)
+    for geom in (rect, rect - disk, rect & disk):
+        data = geom.sample_interior(500, criteria=lambda x, y: x < 0.4)
+        assert data["x"].shape == (500, 1)
+        assert np.all(data["x"] < 0.4)
+        assert np.all(geom.is_inside(np.hstack((data["x"], data["y"]))))
+
+        data = geom.sample_boundary(500, criteria=lambda x, y: y > 0.6)
+        assert data["normal_x"].shape == (500, 1)
+        assert np.all(data["y"] > 0.6)
+
+
+@pytest.mark.parametrize("method", ["Sobol", "Halton", "Hammersley"])
+def test_quasirandom_known_values(method):
+    """Test for unscrambled sequences against known leading points."""
+    expected = {
+        "Sobol": [[0.5, 0.5], [0.75, 0.25], [0.25, 0.75], [0.375, 0.375]],
+        "Halton": [[1 / 2, 1 / 3], [1 / 4, 2 / 3], [3 / 4, 1 / 9], [1 / 8, 4 / 9]],
+        "Hammersley": [[1 / 2, 1 / 5], [1 / 4, 2 / 5], [3 / 4, 3 / 5], [1 / 8, 4 / 5]],
+    }[method]
+    x = sampler.quasirandom(4, 2, method)
+    np.testing.assert_allclose(x, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("method", ["Sobol", "Halton", "Kronecker"])
+def test_quasirandom_engine_stream(method):
+    """Test for streaming and fast forward of quasi-random engine."""
+    for scramble in (False, True):
+        engine = sampler.QuasiRandomEngine(method, scramble, seed=42)
+        x = engine.random(100, 3)
+        chunks = [engine.reset().random(37, 3), engine.random(63, 3)]
+        np.testing.assert_array_equal(np.concatenate(chunks), x)
+        np.testing.assert_array_equal(
+            engine.reset().fast_forward(37, 3).random(63, 3), x[37:]
+        )
+        # scrambled points are reproducible with seed and still in [0, 1)
+        x_ = sampler.QuasiRandomEngine(method, scramble, seed=42).random(100, 3)
+        np.testing.assert_array_equal(x_, x)
+        assert np.all((x >= 0) & (x < 1))
+
+
+def test_kronecker():
+    """Test for Kronecker sequence against golden ratio sequence in 1D."""
+    x = sampler.quasirandom(5, 1, "Kronecker")
+    golden = (1 + np.sqrt(5)) / 2
+    np.testing.assert_allclose(x[:, 0], np.mod(0.5 + np.arange(1, 6) / golden, 1))
+    # low discrepancy in high dimension, i.e. every slab of each coordinate holds
+    # nearly the expected number of points, which deviates by ~30 for pseudo random
+    x = sampler.quasirandom(10000, 10, "Kronecker")
+    counts = np.stack([np.histogram(x[:, j], 10, (0, 1))[0] for j in range(10)])
+    assert np.all(np.abs(counts - 1000) <= 20)
+
+
+def test_scrambled_sobol():
+    """Test for stratification of scrambled Sobol points."""
+    engine = sampler.QuasiRandomEngine("Sobol", seed=42)
+    x = engine.random(1024, 2).astype("float64")
+    # every elementary interval of size 1/32 x 1/32 contains exactly one point
+    cells = np.floor(x * 32).astype("int64")
+    assert len(np.unique(cells[:, 0] * 32 + cells[:, 1])) == 1024
+    assert not np.allclose(
+        x, sampler.QuasiRandomEngine("Sobol", seed=0).random(1024, 2)
+    )
+
+    with pytest.raises(ValueError):
+        engine.random(4, 41)
+
+
+def test_sample_with_engine():
+    """Test for sampling geometry with quasi-random engine."""
+    rect = geometry.Rectangle((0, 0), (2, 1))
+    engine = sampler.QuasiRandomEngine("Sobol", seed=42)
+    x1 = rect.random_points(128, engine)
+    x2 = rect.random_points(128, engine)
+    assert x1.shape == (128, 2)
+    assert not np.allclose(x1, x2)
+    np.testing.assert_allclose(
+        engine.reset().random(256, 2)[128:] * (2, 1), x2, rtol=1e-6
+    )
+    data = geometry.Disk((0, 0), 1).sample_interior(100, engine)
+    assert data["x"].shape == (100, 1)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,87 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+from ppsci.utils import expression
+from ppsci.utils import logger
+from ppsci.utils import misc
+
+__all__ = []
+
+
+def _train(compile_train_step, output_dir, epochs=3):
+    """Train a small Laplace problem and return parameters and losses of every epoch."""
+    logger.init_logger()
+    misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("x", "y"), ("u",), 2, 16)
+    geom = ppsci.geometry.Rectangle((0, 0), (1, 1))
+    constraint = {
+        "EQ": ppsci.constraint.InteriorConstraint(
+            ppsci.equation.Laplace(2).equations,
+            {"laplace": 0},
+            geom,
+            {
+                "dataset": "IterableNamedArrayDataset",
+                "iters_per_epoch": 2,
+                "batch_size": 32,
+            },
+            ppsci.loss.MSELoss("mean"),
+            name="EQ",
+        ),
+        "BC": ppsci.constraint.BoundaryConstraint(
+            {"u": lambda out: out["u"]},
+            {"u": 1},
+            geom,
+            {
+                "dataset": "IterableNamedArrayDataset",
+                "iters_per_epoch": 2,
+                "batch_size": 16,
+            },
+            ppsci.loss.MSELoss("sum"),
+            name="BC",
+        ),
+    }
+    solver = ppsci.solver.Solver(
+        model,
+        constraint,
+        str(output_dir),
+        ppsci.optimizer.Adam(1e-2)(model),
+        epochs=epochs,
+        iters_per_epoch=2,
+        device="cpu",
+        compile_train_step=compile_train_step,
+    )
+    losses = []
+    for epoch_id in range(1, epochs + 1):
+        solver.train_epoch_func(solver, epoch_id, solver.log_freq)
+        losses.append(
+            {key: meter.avg for key, meter in solver.train_output_info.items()}
+        )
+        solver.train_output_info.clear()
+    paddle.jit.enable_to_static(False)
+    return [param.numpy() for param in model.parameters()], losses
+
+
+def test_compile_train_step(tmp_path):
+    """Test for parameters and losses of compiled training step equal to dynamic mode."""
+    params, losses = _train(False, tmp_path / "dynamic")
+    compiled_params, compiled_losses = _train(True, tmp_path / "compiled")
+
+    for expected, actual in zip(losses, compiled_losses):
+        assert expected.keys() == actual.keys()
+        for key in expected:
+            np.testing.assert_allclose(actual[key], expected[key], rtol=1e-5)
+    for expected, actual in zip(params, compiled_params):
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_compile_train_step_unsupported(tmp_path, monkeypatch):
+    """Test for compiling training step on paddle versions which can not trace it."""
+    monkeypatch.setattr(expression, "SUPPORT_COMPILE_TRAIN_STEP", False)
+    with pytest.raises(ValueError, match="paddlepaddle>=2.6"):
+        _train(True, tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,39 @@
+import types
+
+import numpy as np
+import paddle
+import pytest
+
+from ppsci.solver import printer
+
+__all__ = []
+
+
+def test_train_loss_buffer():
+    """Test for averaged training losses merged from buffer on logging."""
+    trainer = types.SimpleNamespace(train_output_info={}, train_loss_buffer=[])
+    np.random.seed(42)
+    losses = np.random.rand(5, 2).astype("float32")
+    batch_sizes = [8, 8, 4, 8, 2]
+    for (eq_loss, total_loss), batch_size in zip(losses, batch_sizes):
+        printer.update_train_loss(
+            trainer,
+            {"loss": paddle.to_tensor(total_loss), "EQ": paddle.to_tensor([eq_loss])},
+            batch_size,
+        )
+        if len(trainer.train_loss_buffer) == 3:
+            printer.flush_train_loss(trainer)
+    assert len(trainer.train_loss_buffer) == 2 and "EQ" in trainer.train_output_info
+    printer.flush_train_loss(trainer)
+    assert not trainer.train_loss_buffer
+
+    expected = np.average(losses.astype("float64"), axis=0, weights=batch_sizes)
+    for key, value in zip(("EQ", "loss"), expected):
+        meter = trainer.train_output_info[key]
+        assert isinstance(meter.avg, float)
+        assert meter.count == sum(batch_sizes)
+        np.testing.assert_allclose(meter.avg, value, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,149 @@
+import time
+
+import numpy as np
+import pytest
+
+import ppsci
+from ppsci.solver import adaptive
+from ppsci.utils import logger
+
+__all__ = []
+
+
+def _make_constraint(dataloader_cfg, **kwargs):
+    return ppsci.constraint.InteriorConstraint(
+        # residual equals to x as model output is canceled
+        {"r": lambda out: out["u"] * 0 + out["x"]},
+        {"r": 0},
+        ppsci.geometry.Rectangle((0, 0), (1, 1)),
+        {**dataloader_cfg, "batch_size": 16, "iters_per_epoch": 2},
+        ppsci.loss.MSELoss("mean"),
+        name="EQ",
+        **kwargs,
+    )
+
+
+def _make_solver(constraint, output_dir, rar=None, num_prefetch=0):
+    logger.init_logger()
+    model = ppsci.arch.MLP(("x", "y"), ("u",), 2, 8)
+    return ppsci.solver.Solver(
+        model,
+        {constraint.name: constraint},
+        str(output_dir),
+        ppsci.optimizer.Adam(1e-3)(model),
+        epochs=2,
+        iters_per_epoch=2,
+        device="cpu",
+        num_prefetch=num_prefetch,
+        adaptive=None if rar is None else {constraint.name: rar},
+    )
+
+
+@pytest.mark.parametrize(
+    "dataloader_cfg",
+    [
+        {"dataset": "IterableNamedArrayDataset"},
+        {
+            "dataset": "NamedArrayDataset",
+            "sampler": {"name": "BatchSampler", "shuffle": True, "drop_last": True},
+        },
+    ],
+)
+def test_rar_greedy(dataloader_cfg, tmp_path):
+    """Test for appending candidates of highest residual."""
+    constraint = _make_constraint(dataloader_cfg)
+    solver = _make_solver(constraint, tmp_path)
+    dataset = constraint.data_loader.dataset
+
+    results = []
+    for batch_size in (1000, 64):
+        np.random.seed(42)
+        rar = adaptive.RAR(1000, 50, batch_size=batch_size)
+        info = rar.refine(solver, constraint)
+        x = np.asarray(dataset.input["x"])[-50:]
+        # top 5% of 1000 uniform candidates
+        assert x.min() > 0.9
+        assert info["selected_residual"] > info["candidate_residual"]
+        results.append(x)
+    # streamed selection is the same as selection of the whole pool
+    np.testing.assert_array_equal(np.sort(results[0]), np.sort(results[1]))
+    assert info["num_samples"] == 32 + 50 * 2
+    assert len(dataset.label["r"]) == len(dataset.weight["r"]) == 132
+    input_dict, label_dict, weight_dict = next(constraint.data_iter)
+    assert input_dict["x"].shape == label_dict["r"].shape == weight_dict["r"].shape
+
+
+def test_rar_replace_proportional(tmp_path):
+    """Test for replacing points of lowest residual by proportional sampling."""
+    constraint = _make_constraint({"dataset": "IterableNamedArrayDataset"})
+    solver = _make_solver(constraint, tmp_path)
+    dataset = constraint.data_loader.dataset
+    x_old = dataset.input["x"].numpy()
+
+    rar = adaptive.RAR(2000, 16, mode="replace", sampling="proportional", power=4)
+    rar.refine(solver, constraint)
+    x_new = dataset.input["x"].numpy()
+    assert x_new.shape == x_old.shape
+    # the half of lowest residual are replaced by candidates of high residual
+    assert np.isin(np.sort(x_old, axis=0)[16:], x_new).all()
+    assert np.median(x_new) > np.median(x_old)
+
+    with pytest.raises(ValueError):
+        adaptive.RAR(2000, 64, mode="replace").refine(solver, constraint)
+    with pytest.raises(ValueError):
+        adaptive.RAR(10, 20)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"evenly": True}, {"random": "Sobol"}, {"random": "Hammersley"}]
+)
+def test_rar_distinct_candidates(kwargs, tmp_path):
+    """Test for candidates drawn differently for evenly and quasi-random sampling."""
+    constraint = _make_constraint({"dataset": "IterableNamedArrayDataset"}, **kwargs)
+    solver = _make_solver(constraint, tmp_path)
+    dataset = constraint.data_loader.dataset
+
+    # duplicated candidates would be selected again by proportional sampling
+    rar = adaptive.RAR(200, 8, sampling="proportional", batch_size=50)
+    for _ in range(3):
+        rar.refine(solver, constraint)
+    x = np.hstack((dataset.input["x"].numpy(), dataset.input["y"].numpy()))
+    assert len(x) == 32 + 8 * 3
+    assert len(np.unique(x, axis=0)) == len(x)
+
+
+def test_solver_with_rar(tmp_path):
+    """Test for refinement attached to solver."""
+    constraint = _make_constraint({"dataset": "IterableNamedArrayDataset"})
+    solver = _make_solver(constraint, tmp_path, adaptive.RAR(256, 8, freq=1))
+    solver.train()
+    assert constraint.data_loader.dataset.num_samples == 32 + 8 * 2
+
+    with pytest.raises(ValueError):
+        ppsci.solver.Solver(
+            solver.model, {"EQ": constraint}, adaptive={"BC": adaptive.RAR(256, 8)}
+        )
+
+
+def test_rar_with_prefetch(tmp_path):
+    """Test for batches prefetched from old data dropped after refinement."""
+    constraint = _make_constraint({"dataset": "IterableNamedArrayDataset"})
+    solver = _make_solver(constraint, tmp_path, adaptive.RAR(256, 8), num_prefetch=2)
+    prefetcher = constraint.data_iter
+    assert isinstance(prefetcher, ppsci.data.dataloader.Prefetcher)
+    # wait until batches of old data are ready
+    while not prefetcher._queue.full():
+        time.sleep(0.01)
+
+    solver.adaptive["EQ"].refine(solver, constraint)
+    for _ in range(3):
+        input_dict, label_dict, weight_dict = next(constraint.data_iter)
+        assert len(input_dict["x"]) == len(label_dict["r"]) == 32 + 8
+        assert len(weight_dict["r"]) == 32 + 8
+
+    solver.train()
+    assert constraint.data_loader.dataset.num_samples == 32 + 8 * 3
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,163 @@
+import functools
+
+import numpy as np
+import pytest
+from scipy import spatial
+
+from ppsci import geometry
+from ppsci.utils import cache
+from ppsci.utils import logger
+
+__all__ = []
+
+
+def test_hash_content():
+    """Test for hash key of arrays and parameters."""
+    x = np.arange(6, dtype="float32").reshape([2, 3])
+    key = cache.hash_content(x, operation="inflate", distance=0.1)
+    assert key == cache.hash_content(x.copy(), distance=0.1, operation="inflate")
+    assert key != cache.hash_content(x, operation="inflate", distance=0.2)
+    assert key != cache.hash_content(
+        x.reshape([3, 2]), operation="inflate", distance=0.1
+    )
+    assert key != cache.hash_content(
+        x.astype("float64"), operation="inflate", distance=0.1
+    )
+
+
+def test_save_load_arrays(tmp_path):
+    """Test for saving arrays into cache and loading them as memory-mapped arrays."""
+    logger.init_logger()
+    cache_dir = str(tmp_path)
+    arrays = {
+        "vertices": np.random.rand(10, 3),
+        "faces": np.random.randint(0, 10, [5, 3]),
+    }
+    key = cache.hash_content(*arrays.values())
+    assert cache.load_arrays(key, cache_dir) is None
+
+    cache.save_arrays(key, arrays, cache_dir)
+    # saving existing entry is skipped
+    cache.save_arrays(key, {"vertices": np.zeros([1])}, cache_dir)
+    loaded = cache.load_arrays(key, cache_dir)
+    assert sorted(loaded) == ["faces", "vertices"]
+    for name, array in arrays.items():
+        assert isinstance(loaded[name], np.memmap)
+        np.testing.assert_array_equal(loaded[name], array)
+
+    # cache is disabled
+    cache.set_cache_dir(None)
+    assert cache.save_arrays(key, arrays) is None
+    assert cache.load_arrays(key) is None
+    cache.set_cache_dir(cache.CACHE_HOME)
+
+
+def test_cached_sample(tmp_path):
+    """Test for points reloaded from cache with identical random state."""
+    logger.init_logger()
+    cache.set_cache_dir(str(tmp_path))
+    cache.enable_point_cache()
+    rect = geometry.Rectangle((0, 0), (1, 1))
+
+    def num_entries():
+        return len(list((tmp_path / "points").iterdir()))
+
+    def sample(criteria):
+        np.random.seed(42)
+        points = cache.cached_sample(rect.sample_interior, 100, "pseudo", criteria)
+        return points, np.random.rand()
+
+    points, next_random = sample(lambda x, y: x > 0.5)
+    assert num_entries() == 1
+    cached_points, cached_next_random = sample(lambda x, y: x > 0.5)
+    assert num_entries() == 1
+    assert next_random == cached_next_random
+    for key in points:
+        np.testing.assert_array_equal(points[key], cached_points[key])
+
+    # different criteria, geometry or seed should miss
+    sample(lambda x, y: x > 0.6)
+    assert num_entries() == 2
+    rect = geometry.Rectangle((0, 0), (1, 2))
+    sample(lambda x, y: x > 0.5)
+    assert num_entries() == 3
+    cache.cached_sample(rect.sample_interior, 100, "pseudo", lambda x, y: x > 0.5)
+    assert num_entries() == 4
+
+    cache.enable_point_cache(False)
+    cache.set_cache_dir(cache.CACHE_HOME)
+
+
+def _build_pointcloud():
+    points = np.linspace(0, 1, 20, dtype="float32").reshape([10, 2])
+    return geometry.PointCloud({"x": points[:, 0:1], "y": points[:, 1:2]}, ("x", "y"))
+
+
+@pytest.mark.parametrize(
+    "build_geom",
+    [
+        lambda: geometry.Interval(0, 1),
+        lambda: geometry.Disk((0, 0), 1),
+        lambda: geometry.Rectangle((0, 0), (1, 2)),
+        lambda: geometry.Triangle((0, 0), (1, 0), (0, 1)),
+        lambda: geometry.Polygon(np.array([[0, 0], [1, 0], [2, 1], [0, 1]])),
+        lambda: geometry.Cuboid((0, 0, 0), (1, 2, 3)),
+        lambda: geometry.Sphere((0, 0, 0), 1),
+        lambda: geometry.Hypercube((0, 0, 0, 0), (1, 2, 3, 4)),
+        lambda: geometry.Hypersphere((0, 0, 0, 0), 1),
+        _build_pointcloud,
+        lambda: geometry.TimeDomain(0, 1, timestamps=(0, 0.5, 1)),
+        lambda: geometry.TimeXGeometry(
+            geometry.TimeDomain(0, 1), geometry.Rectangle((0, 0), (1, 1))
+        ),
+        lambda: geometry.Rectangle((0, 0), (1, 1)) - geometry.Disk((0.5, 0.5), 0.2),
+        lambda: geometry.Rectangle((0, 0), (1, 1)).union(
+            geometry.Disk((1, 0.5), 0.5), smoothness=0.1
+        ),
+    ],
+)
+def test_fingerprint_geometry(build_geom):
+    """Test for identical geometries sharing the same fingerprint."""
+    geom = build_geom()
+    assert cache.fingerprint(geom) == cache.fingerprint(build_geom())
+    assert cache.fingerprint(geom.sample_interior) == cache.fingerprint(
+        build_geom().sample_interior
+    )
+
+
+def test_fingerprint_objects():
+    """Test for fingerprint of sets, partial functions and unsupported objects."""
+    assert cache.fingerprint({"a", "b", 1}) == cache.fingerprint({1, "b", "a"})
+    assert cache.fingerprint(functools.partial(np.add, 1)) == cache.fingerprint(
+        functools.partial(np.add, 1)
+    )
+    assert cache.fingerprint(functools.partial(np.add, 1)) != cache.fingerprint(
+        functools.partial(np.add, 2)
+    )
+    with pytest.raises(TypeError):
+        cache.fingerprint(spatial.cKDTree(np.zeros([3, 2])))
+
+
+def test_cached_sample_unsupported(tmp_path):
+    """Test for points sampled without cache when arguments can't be fingerprinted."""
+    logger.init_logger()
+    cache.set_cache_dir(str(tmp_path))
+    cache.enable_point_cache()
+    rect = geometry.Rectangle((0, 0), (1, 1))
+    tree = spatial.cKDTree(np.full([1, 2], 0.5))
+
+    points = cache.cached_sample(
+        rect.sample_interior,
+        100,
+        "pseudo",
+        lambda x, y: tree.query(np.hstack((x, y)))[0] > 0,
+    )
+    assert points["x"].shape == (100, 1)
+    assert not (tmp_path / "points").exists()
+
+    cache.enable_point_cache(False)
+    cache.set_cache_dir(cache.CACHE_HOME)
+
+
+if __name__ == "__main__":
+    pytest.main()
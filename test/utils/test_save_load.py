@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+import ppsci
+from ppsci.utils import logger
+from ppsci.utils import save_load
+
+__all__ = []
+
+
+@pytest.mark.parametrize("async_save", [False, True])
+def test_checkpoint_writer(tmp_path, async_save):
+    """Test for checkpoints written by CheckpointWriter."""
+    logger.init_logger()
+    model = ppsci.arch.MLP(("x",), ("u",), 2, 8)
+    opt = ppsci.optimizer.Adam(1e-3)((model,))
+    writer = save_load.CheckpointWriter(async_save, keep_checkpoint_max=2)
+    expected = {}
+    for epoch in range(1, 5):
+        writer.save(
+            model,
+            opt,
+            None,
+            {"epoch": epoch},
+            str(tmp_path),
+            (f"epoch_{epoch}", "latest"),
+        )
+        expected[epoch] = {k: v.numpy() for k, v in model.state_dict().items()}
+        # modify parameters in place after snapshot
+        for param in model.parameters():
+            param.set_value(param + 1.0)
+    writer.wait()
+
+    ckpt_dir = tmp_path / "checkpoints"
+    files = sorted(os.listdir(ckpt_dir))
+    assert files == sorted(
+        f"{prefix}{suffix}"
+        for prefix in ("epoch_3", "epoch_4", "latest")
+        for suffix in (".pdparams", ".pdopt", ".pdstates")
+    )
+    for prefix, epoch in (("epoch_3", 3), ("epoch_4", 4), ("latest", 4)):
+        metric = save_load.load_checkpoint(str(ckpt_dir / prefix), model, opt)
+        assert metric["epoch"] == epoch
+        for key, value in model.state_dict().items():
+            assert np.allclose(value.numpy(), expected[epoch][key])
+
+
+def test_interrupted_checkpoint(tmp_path, monkeypatch):
+    """Test for checkpoint interrupted while swapping files never regarded as complete."""
+    logger.init_logger()
+    model = ppsci.arch.MLP(("x",), ("u",), 2, 8)
+    opt = ppsci.optimizer.Adam(1e-3)((model,))
+    save_load.save_checkpoint(model, opt, None, {"epoch": 1}, str(tmp_path), "latest")
+
+    replace = os.replace
+
+    def fail_on_pdopt(src, dst):
+        if str(dst).endswith(".pdopt"):
+            raise OSError("disk failure")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", fail_on_pdopt)
+    with pytest.raises(OSError, match="disk failure"):
+        save_load.save_checkpoint(
+            model, opt, None, {"epoch": 2}, str(tmp_path), "latest"
+        )
+    monkeypatch.undo()
+
+    # new parameters sit next to old optimizer states, but there is no marker
+    ckpt_path = tmp_path / "checkpoints" / "latest"
+    assert os.path.exists(f"{ckpt_path}.pdparams")
+    assert not os.path.exists(f"{ckpt_path}.pdstates")
+    with pytest.raises(FileNotFoundError, match="incomplete"):
+        save_load.load_checkpoint(str(ckpt_path), model, opt)
+
+    # next save completes the checkpoint again
+    save_load.save_checkpoint(model, opt, None, {"epoch": 3}, str(tmp_path), "latest")
+    assert save_load.load_checkpoint(str(ckpt_path), model, opt)["epoch"] == 3
+
+
+if __name__ == "__main__":
+    pytest.main()
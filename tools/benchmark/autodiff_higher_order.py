@@ -0,0 +1,109 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark k-th order directional derivative computed by nested jacobian against
+`ppsci.autodiff.directional_derivative`, including the training backward pass.
+
+Usage:
+    python tools/benchmark/autodiff_higher_order.py --dim 2 --batch_size 1024
+"""
+
+import argparse
+import itertools
+import time
+
+import paddle
+
+import ppsci
+from ppsci import autodiff
+
+
+def nested_derivative(u, xs, order, direction):
+    """Contract all nested partial derivatives of given order with direction."""
+    result = 0
+    for indices in itertools.product(range(len(xs)), repeat=order):
+        derivative = u
+        coef = 1.0
+        for k in indices:
+            derivative = autodiff.jacobian(derivative, xs[k])
+            coef *= direction[k]
+        result += coef * derivative
+    return result
+
+
+class GradCounter:
+    """Count number of backward passes made by `paddle.grad`."""
+
+    def __init__(self):
+        self.count = 0
+        self._grad = paddle.grad
+        paddle.grad = self
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self._grad(*args, **kwargs)
+
+
+def benchmark(func, model, xs, order, direction, repeat, counter):
+    for i in range(repeat + 1):
+        if i == 1:
+            # skip warmup
+            tic = time.perf_counter()
+        u = model({f"x{k}": x for k, x in enumerate(xs)})["u"]
+        counter.count = 0
+        derivative = func(u, xs, order, direction)
+        passes = counter.count
+        (derivative**2).mean().backward()
+        model.clear_gradients()
+        autodiff.clear()
+    return (time.perf_counter() - tic) / repeat, passes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dim", type=int, default=2)
+    parser.add_argument("--batch_size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    paddle.set_device(args.device)
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(
+        tuple(f"x{k}" for k in range(args.dim)), ("u",), 4, 64, "tanh"
+    )
+    xs = []
+    for _ in range(args.dim):
+        x = paddle.randn([args.batch_size, 1])
+        x.stop_gradient = False
+        xs.append(x)
+    direction = tuple(1.0 / args.dim**0.5 for _ in range(args.dim))
+    counter = GradCounter()
+
+    print(f"dim={args.dim}, batch_size={args.batch_size}, device={args.device}")
+    print(f"{'order':>5} | {'method':>11} | {'passes':>6} | {'time(ms)':>9}")
+    for order in (2, 3, 4):
+        for name, func in (
+            ("nested", nested_derivative),
+            ("directional", autodiff.directional_derivative),
+        ):
+            cost, passes = benchmark(
+                func, model, xs, order, direction, args.repeat, counter
+            )
+            print(f"{order:>5} | {name:>11} | {passes:>6} | {cost * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark predicates of deep CSG trees, i.e. `is_inside`, `on_boundary` and
+`boundary_normal`, and count calls of predicates of primitive geometries.
+
+Usage:
+    python tools/benchmark/csg_predicates.py --depth 5 --num 100000
+"""
+
+import argparse
+import collections
+import time
+
+import numpy as np
+
+import ppsci
+
+CALLS = collections.Counter()
+
+
+def count_calls(geom):
+    """Count calls of predicates of primitive geometry."""
+    for name in ("is_inside", "on_boundary", "boundary_normal"):
+        func = getattr(geom, name)
+
+        def wrapper(x, func=func, name=name):
+            CALLS[name] += 1
+            return func(x)
+
+        setattr(geom, name, wrapper)
+    return geom
+
+
+def build_tree(depth, center=(0.0, 0.0), size=1.0):
+    """Build balanced CSG tree with given levels of union, difference and
+    intersection of rectangles and disks."""
+    if depth == 0:
+        return count_calls(ppsci.geometry.Disk(center, size / 2))
+    offset = size / 4
+    left = build_tree(depth - 1, (center[0] - offset, center[1]), size / 2)
+    right = build_tree(depth - 1, (center[0] + offset, center[1]), size / 2)
+    rect = count_calls(
+        ppsci.geometry.Rectangle(
+            (center[0] - size / 2, center[1] - size / 2),
+            (center[0] + size / 2, center[1] + size / 2),
+        )
+    )
+    op = ("union", "difference", "intersection")[depth % 3]
+    if op == "union":
+        return left | right
+    elif op == "difference":
+        return rect - (left | right)
+    return rect & (left | right)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--num", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    geom = build_tree(args.depth)
+    x = np.random.uniform(-0.6, 0.6, (args.num, 2)).astype("float32")
+    print(f"depth={args.depth}, num={args.num}")
+    print(f"{'predicate':>15} | {'time(s)':>8} | primitive calls")
+    for name in ("is_inside", "on_boundary", "boundary_normal"):
+        func = getattr(geom, name)
+        func(x)  # warmup
+        CALLS.clear()
+        tic = time.perf_counter()
+        for _ in range(args.repeat):
+            func(x)
+        cost = (time.perf_counter() - tic) / args.repeat
+        calls = {k: v // args.repeat for k, v in CALLS.items()}
+        print(f"{name:>15} | {cost:>8.4f} | {calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark throughput of quasi-random sampling by `ppsci.geometry.sampler`, against
+scikit-optimize if it is installed.
+
+Usage:
+    python tools/benchmark/qmc_sampler.py --dim 3 --num 100000
+"""
+
+import argparse
+import time
+import warnings
+
+from ppsci.geometry import sampler
+
+
+def benchmark(func, repeat):
+    func()  # warmup
+    tic = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - tic) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dim", type=int, default=3)
+    parser.add_argument("--num", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        import skopt
+    except ModuleNotFoundError:
+        skopt = None
+    space = [(0.0, 1.0)] * args.dim
+    warnings.filterwarnings("ignore")
+
+    print(f"dim={args.dim}, num={args.num}")
+    print(f"{'method':>10} | {'ppsci(Mpts/s)':>13} | {'skopt(Mpts/s)':>13}")
+    for method in ("Sobol", "Halton", "Hammersley", "LHS"):
+        cost = benchmark(
+            lambda: sampler.quasirandom(args.num, args.dim, method), args.repeat
+        )
+        line = f"{method:>10} | {args.num / cost / 1e6:>13.3f} | "
+        if skopt is not None:
+            skopt_sampler = {
+                "Sobol": lambda: skopt.sampler.Sobol(randomize=False),
+                "Halton": skopt.sampler.Halton,
+                "Hammersley": skopt.sampler.Hammersly,
+                # default maximin criterion is O(num^2) in memory
+                "LHS": lambda: skopt.sampler.Lhs(criterion=None),
+            }[method]
+            cost = benchmark(
+                lambda: skopt_sampler().generate(space, args.num), args.repeat
+            )
+            line += f"{args.num / cost / 1e6:>13.3f}"
+        else:
+            line += f"{'-':>13}"
+        print(line)
+
+    # scrambled sequence streamed by chunks
+    engine = sampler.QuasiRandomEngine("Sobol", seed=42)
+    cost = benchmark(lambda: engine.random(args.num, args.dim), args.repeat)
+    print(f"{'Sobol+Owen':>10} | {args.num / cost / 1e6:>13.3f} | {'-':>13}")
+
+
+if __name__ == "__main__":
+    main()